@@ -1,11 +1,28 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
 from ashi_os.agents.execution_agent import ExecutionAgent
 from ashi_os.agents.memory_agent import MemoryAgent
 from ashi_os.agents.research_agent import ResearchAgent
 from ashi_os.agents.supervisor_agent import SupervisorAgent
 from ashi_os.agents.validation_agent import ValidationAgent
 from ashi_os.brain.confirmation import ConfirmationManager
-from ashi_os.brain.planning import RiskEvaluator, StrategicPlanner
+from ashi_os.brain.planning import ExecutionPlan, RiskAssessment, RiskEvaluator, StrategicPlanner
+from ashi_os.brain.session_locks import SessionLocks
+from ashi_os.core.write_behind import WriteBehindQueue
 from ashi_os.logging.audit_log import AuditLogger
+from ashi_os.logging.metrics import StageTimer
+
+
+@dataclass
+class _Mission:
+    session_id: str
+    objective: str
+    plan: ExecutionPlan
+    risk: RiskAssessment
+    confirmed: bool
+    auto_execute: bool
 
 
 class AgentCoordinator:
@@ -19,7 +36,8 @@ class AgentCoordinator:
         planner: StrategicPlanner,
         risk_evaluator: RiskEvaluator,
         confirmation: ConfirmationManager,
-        audit: AuditLogger,
+        audit: AuditLogger | WriteBehindQueue,
+        locks: SessionLocks | None = None,
     ) -> None:
         self.research = research
         self.execution = execution
@@ -30,6 +48,9 @@ class AgentCoordinator:
         self.risk_evaluator = risk_evaluator
         self.confirmation = confirmation
         self.audit = audit
+        self._research_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="agent-research")
+        # Shared with the Orchestrator, so a session's missions and chat turns never interleave.
+        self.locks = locks or SessionLocks()
 
     def run(
         self,
@@ -38,10 +59,99 @@ class AgentCoordinator:
         auto_execute: bool,
         confirm_token: str | None = None,
     ) -> dict:
+        # Missions of one session run one at a time, so a token is checked and issued once.
+        with self.locks.hold(session_id):
+            return self._run(session_id, objective, auto_execute, confirm_token)
+
+    async def arun(
+        self,
+        session_id: str,
+        objective: str,
+        auto_execute: bool,
+        confirm_token: str | None = None,
+    ) -> dict:
+        async with self.locks.ahold(session_id):
+            return await self._arun(session_id, objective, auto_execute, confirm_token)
+
+    def _run(self, session_id: str, objective: str, auto_execute: bool, confirm_token: str | None) -> dict:
+        timer = StageTimer("agents")
+        # Research only reads memory, so it runs alongside gating and tool execution. A gated
+        # mission cancels it; with a confirm token the objective is not known until the gate.
+        research = None if confirm_token else self._start_research(timer, session_id, objective)
+        with timer.stage("gate"):
+            mission = self._gate(session_id, objective, auto_execute, confirm_token)
+        if isinstance(mission, dict):
+            if research is not None:
+                research.cancel()
+            return mission
+        if research is None:
+            research = self._start_research(timer, session_id, mission.objective)
+
+        proposed_actions = self.execution.propose_actions(mission.plan.as_dict().get("steps", []))
+        with timer.stage("execute"):
+            execution_results = self._execute(mission, proposed_actions)
+        validation_out = self.validation.run(execution_results=execution_results, auto_execute=auto_execute)
+        # The reflection is written only after research has read memory, so a mission never
+        # recalls its own reflection.
+        with timer.stage("research_wait"):
+            research_out = research.result()
+        with timer.stage("reflect"):
+            memory_out = self.memory_agent.store_reflection(
+                session_id=session_id,
+                objective=mission.objective,
+                validation=validation_out,
+            )
+        return self._report(
+            mission, research_out, proposed_actions, execution_results, validation_out, memory_out, timer
+        )
+
+    async def _arun(self, session_id: str, objective: str, auto_execute: bool, confirm_token: str | None) -> dict:
+        # Memory search, tool subprocesses and audit/Chroma writes all block, so each
+        # stage is offloaded to a worker thread instead of holding the event loop.
+        timer = StageTimer("agents")
+        research = None if confirm_token else asyncio.wrap_future(self._start_research(timer, session_id, objective))
+        with timer.stage("gate"):
+            mission = await asyncio.to_thread(self._gate, session_id, objective, auto_execute, confirm_token)
+        if isinstance(mission, dict):
+            if research is not None:
+                research.cancel()
+            return mission
+        if research is None:
+            research = asyncio.wrap_future(self._start_research(timer, session_id, mission.objective))
+
+        proposed_actions = self.execution.propose_actions(mission.plan.as_dict().get("steps", []))
+        with timer.stage("execute"):
+            execution_results = await asyncio.to_thread(self._execute, mission, proposed_actions)
+        validation_out = self.validation.run(execution_results=execution_results, auto_execute=auto_execute)
+        with timer.stage("research_wait"):
+            research_out = await research
+        with timer.stage("reflect"):
+            memory_out = await asyncio.to_thread(
+                self.memory_agent.store_reflection,
+                session_id=session_id,
+                objective=mission.objective,
+                validation=validation_out,
+            )
+        return await asyncio.to_thread(
+            self._report, mission, research_out, proposed_actions, execution_results, validation_out, memory_out, timer
+        )
+
+    def _start_research(self, timer: StageTimer, session_id: str, objective: str) -> Future:
+        return self._research_pool.submit(
+            timer.run, "research", self.research.run, session_id=session_id, objective=objective
+        )
+
+    def _gate(
+        self,
+        session_id: str,
+        objective: str,
+        auto_execute: bool,
+        confirm_token: str | None,
+    ) -> dict | _Mission:
         confirmed = False
         restored_objective = ""
         if confirm_token:
-            confirmed, restored_objective = self.confirmation.consume_token(session_id, confirm_token)
+            confirmed, restored_objective = self.confirmation.consume_token(session_id, confirm_token, scope="agents")
             if confirmed:
                 objective = restored_objective
 
@@ -49,8 +159,8 @@ class AgentCoordinator:
         risk = self.risk_evaluator.evaluate(objective, plan)
 
         if risk.confirmation_required and not confirmed:
-            existing_token = self.confirmation.pending_token(session_id)
-            token = existing_token or self.confirmation.create(session_id, objective)
+            existing_token = self.confirmation.pending_token(session_id, scope="agents")
+            token = existing_token or self.confirmation.create(session_id, objective, scope="agents")
             summary = self.supervisor.summarize(
                 objective=objective,
                 plan=plan.as_dict(),
@@ -81,28 +191,38 @@ class AgentCoordinator:
                 "confirmation_token": token,
             }
 
-        research_out = self.research.run(session_id=session_id, objective=objective)
-        proposed_actions = self.execution.propose_actions(plan.as_dict().get("steps", []))
-
-        execution_results = []
-        if auto_execute and proposed_actions:
-            execution_results = self.execution.execute(
-                session_id=session_id,
-                actions=proposed_actions,
-                confirm=confirmed,
-            )
-
-        validation_out = self.validation.run(execution_results=execution_results, auto_execute=auto_execute)
-        memory_out = self.memory_agent.store_reflection(
+        return _Mission(
             session_id=session_id,
             objective=objective,
-            validation=validation_out,
+            plan=plan,
+            risk=risk,
+            confirmed=confirmed,
+            auto_execute=auto_execute,
+        )
+
+    def _execute(self, mission: _Mission, proposed_actions: list[dict]) -> list[dict]:
+        if not mission.auto_execute or not proposed_actions:
+            return []
+        return self.execution.execute(
+            session_id=mission.session_id,
+            actions=proposed_actions,
+            confirm=mission.confirmed,
         )
 
+    def _report(
+        self,
+        mission: _Mission,
+        research_out: dict,
+        proposed_actions: list[dict],
+        execution_results: list[dict],
+        validation_out: dict,
+        memory_out: dict,
+        timer: StageTimer | None = None,
+    ) -> dict:
         summary = self.supervisor.summarize(
-            objective=objective,
-            plan=plan.as_dict(),
-            risk=risk.as_dict(),
+            objective=mission.objective,
+            plan=mission.plan.as_dict(),
+            risk=mission.risk.as_dict(),
             validation=validation_out,
             confirmation_required=False,
         )
@@ -110,21 +230,22 @@ class AgentCoordinator:
         self.audit.write(
             "agents.completed",
             {
-                "session_id": session_id,
-                "objective": objective,
-                "risk_level": risk.level,
-                "auto_execute": auto_execute,
+                "session_id": mission.session_id,
+                "objective": mission.objective,
+                "risk_level": mission.risk.level,
+                "auto_execute": mission.auto_execute,
                 "actions": len(proposed_actions),
                 "success": validation_out.get("success_count", 0),
                 "failure": validation_out.get("failure_count", 0),
+                "stages": timer.as_dict() if timer is not None else {},
             },
         )
 
         return {
             "ok": True,
-            "objective": objective,
-            "plan": plan.as_dict(),
-            "risk": risk.as_dict(),
+            "objective": mission.objective,
+            "plan": mission.plan.as_dict(),
+            "risk": mission.risk.as_dict(),
             "research": research_out,
             "proposed_actions": proposed_actions,
             "execution_results": execution_results,
@@ -135,6 +256,9 @@ class AgentCoordinator:
             "confirmation_token": None,
         }
 
+    def close(self) -> None:
+        self._research_pool.shutdown(wait=False, cancel_futures=True)
+
     def status(self) -> dict:
         return {
             "agents": ["research", "execution", "validation", "memory", "supervisor"],
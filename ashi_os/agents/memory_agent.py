@@ -1,8 +1,9 @@
+from ashi_os.core.write_behind import WriteBehindQueue
 from ashi_os.memory.memory_service import MemoryService
 
 
 class MemoryAgent:
-    def __init__(self, memory: MemoryService) -> None:
+    def __init__(self, memory: MemoryService | WriteBehindQueue) -> None:
         self.memory = memory
 
     def store_reflection(self, session_id: str, objective: str, validation: dict) -> dict:
@@ -13,12 +13,19 @@ from ashi_os.agents.memory_agent import MemoryAgent
 from ashi_os.agents.research_agent import ResearchAgent
 from ashi_os.agents.supervisor_agent import SupervisorAgent
 from ashi_os.agents.validation_agent import ValidationAgent
-from ashi_os.brain.confirmation import ConfirmationManager
+from ashi_os.brain.confirmation import build_confirmation_manager
 from ashi_os.brain.context_manager import ContextManager
+from ashi_os.brain.fast_path import FastPathResponder
+from ashi_os.brain.llm_clients import LLMClientPool
 from ashi_os.brain.llm_router import LLMRouter
 from ashi_os.brain.orchestrator import Orchestrator
 from ashi_os.brain.planning import RiskEvaluator, StrategicPlanner
+from ashi_os.brain.session_locks import SessionLocks
+from ashi_os.brain.session_store import build_session_store
+from ashi_os.brain.summarizer import SessionSummarizer
 from ashi_os.core.config import get_settings
+from ashi_os.core.policy import default_policy
+from ashi_os.core.write_behind import build_write_behind
 from ashi_os.logging.audit_log import AuditLogger
 from ashi_os.logging.logger import configure_logging
 from ashi_os.memory.memory_service import MemoryService
@@ -35,17 +42,50 @@ def create_app() -> FastAPI:
     settings = get_settings()
     memory = MemoryService(settings)
     audit = AuditLogger(settings.log_dir)
-    router = LLMRouter(settings)
+    # Request-path audit events and memory inserts go through the write-behind queue.
+    write_behind = build_write_behind(settings, audit, memory)
+    deferred_audit = write_behind or audit
+    deferred_memory = write_behind or memory
+    llm_clients = LLMClientPool(settings)
+    router = LLMRouter(settings, clients=llm_clients)
     context = ContextManager(settings, memory)
+    # One compiled policy for the chat gate, agent risk scoring and tool checks.
+    policy = default_policy()
+    # Chat and agents share one confirmation store, scoped so tokens do not cross over.
+    confirmation = build_confirmation_manager(settings)
+    session_locks = SessionLocks()
+    tool_executor = ToolExecutor(
+        workspace_root=Path.cwd(),
+        sqlite_path=settings.sqlite_path,
+        audit=deferred_audit,
+        policy=policy,
+    )
     orchestrator = Orchestrator(
         router=router,
         context_manager=context,
-        memory=memory,
-        audit=audit,
+        memory=deferred_memory,
+        audit=deferred_audit,
         memory_on_chat=settings.memory_on_chat,
+        policy=policy,
+        confirmation=confirmation,
+        fast_path=FastPathResponder(tool_executor) if settings.chat_fast_path else None,
+        summarizer=(
+            SessionSummarizer(
+                router=router,
+                audit=deferred_audit,
+                keep_turns=settings.chat_summary_keep_turns,
+                trigger_turns=settings.chat_summary_trigger_turns,
+                max_tokens=settings.chat_summary_max_tokens,
+                counter=context.counter,
+            )
+            if settings.chat_summarize
+            else None
+        ),
+        sessions=build_session_store(settings),
+        locks=session_locks,
     )
 
-    stt = SpeechToTextService(settings.openai_api_key)
+    stt = SpeechToTextService(settings.openai_api_key, clients=llm_clients)
     tts = TextToSpeechService()
     voice_pipeline = VoiceCommandPipeline(
         stt=stt,
@@ -67,27 +107,27 @@ def create_app() -> FastAPI:
         channels=settings.mic_channels,
         device=settings.mic_device_index,
     )
-    tool_executor = ToolExecutor(
-        workspace_root=Path.cwd(),
-        sqlite_path=settings.sqlite_path,
-        audit=audit,
-    )
     agent_coordinator = AgentCoordinator(
         research=ResearchAgent(memory=memory, top_k=settings.memory_top_k),
         execution=ExecutionAgent(tool_executor=tool_executor),
         validation=ValidationAgent(),
-        memory_agent=MemoryAgent(memory=memory),
+        memory_agent=MemoryAgent(memory=deferred_memory),
         supervisor=SupervisorAgent(),
         planner=StrategicPlanner(),
-        risk_evaluator=RiskEvaluator(),
-        confirmation=ConfirmationManager(),
-        audit=audit,
+        risk_evaluator=RiskEvaluator(policy),
+        confirmation=confirmation,
+        audit=deferred_audit,
+        locks=session_locks,
     )
 
     app = FastAPI(title="ASHI OS", version="0.1.0")
     app.state.settings = settings
     app.state.memory = memory
     app.state.audit = audit
+    app.state.write_behind = write_behind
+    app.state.confirmation = confirmation
+    app.state.llm_clients = llm_clients
+    app.state.router = router
     app.state.orchestrator = orchestrator
     app.state.voice_pipeline = voice_pipeline
     app.state.voice_runtime = voice_runtime
@@ -101,12 +141,31 @@ def create_app() -> FastAPI:
     app.include_router(voice_router)
     app.include_router(tools_router)
 
+    @app.on_event("startup")
+    def _warm_models() -> None:
+        app.state.router.start_warmup()
+
     @app.on_event("shutdown")
-    def _shutdown_runtimes() -> None:
+    async def _shutdown_runtimes() -> None:
         app.state.voice_runtime.stop()
         app.state.mic_runtime.stop()
+        app.state.orchestrator.close()
+        app.state.agent_coordinator.close()
+        if app.state.write_behind is not None:
+            app.state.write_behind.close()
+        # After the write-behind queue, whose last inserts land in the memory buffer.
+        app.state.memory.close()
+        app.state.router.close()
+        app.state.llm_clients.close()
+        await app.state.llm_clients.aclose()
 
     return app
 
 
-app = create_app()
+def __getattr__(name: str) -> FastAPI:
+    # The ASGI app is built on first access (uvicorn's "ashi_os.api.app:app"), so importing
+    # create_app does not start a second app.
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,44 @@
 from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from ashi_os.brain.planning import StrategicPlanner
+from ashi_os.logging.metrics import REGISTRY
 
 router = APIRouter(tags=["admin"])
 
 
 @router.get("/health")
-def health() -> dict:
-    return {"status": "ok"}
+def health(request: Request) -> dict:
+    warmup = request.app.state.router.warmup_status()
+    return {"status": "ok", "ready": warmup["ready"], "degraded": warmup["degraded"], "warmup": warmup}
+
+
+@router.get("/status")
+def status(request: Request) -> dict:
+    write_behind = getattr(request.app.state, "write_behind", None)
+    confirmation = getattr(request.app.state, "confirmation", None)
+    return {
+        "write_behind": write_behind.stats() if write_behind is not None else {"enabled": False},
+        "plan_cache": StrategicPlanner.cache_stats(),
+        "confirmations": confirmation.stats() if confirmation is not None else {},
+        "memory": request.app.state.memory.stats(),
+    }
 
 
 @router.get("/status/providers")
 def provider_status(request: Request) -> dict:
     settings = request.app.state.settings
+    router = request.app.state.router
     return {
         "default_llm": settings.default_llm,
         "fallback_llm": settings.fallback_llm,
         "openai_key_present": bool(settings.openai_api_key),
         "ollama_model": settings.ollama_model,
         "openai_model": settings.openai_model,
+        **router.status(),
     }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
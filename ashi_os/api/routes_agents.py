@@ -12,9 +12,9 @@ def agents_status(request: Request) -> dict:
 
 
 @router.post("/agents/run", response_model=AgentRunResponse)
-def agents_run(payload: AgentRunRequest, request: Request) -> AgentRunResponse:
+async def agents_run(payload: AgentRunRequest, request: Request) -> AgentRunResponse:
     coordinator = request.app.state.agent_coordinator
-    result = coordinator.run(
+    result = await coordinator.arun(
         session_id=payload.session_id,
         objective=payload.objective,
         auto_execute=payload.auto_execute,
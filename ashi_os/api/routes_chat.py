@@ -1,26 +1,74 @@
+import asyncio
+import json
+
 from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 
-from ashi_os.core.models import ChatRequest, ChatResponse, MemoryAddRequest, MemorySearchRequest
+from ashi_os.core.models import (
+    ChatBatchRequest,
+    ChatRequest,
+    ChatResponse,
+    MemoryAddBatchRequest,
+    MemoryAddRequest,
+    MemorySearchRequest,
+)
 
 router = APIRouter(tags=["chat"])
 
 
 @router.post("/chat", response_model=ChatResponse)
-def chat(payload: ChatRequest, request: Request) -> ChatResponse:
+async def chat(payload: ChatRequest, request: Request) -> ChatResponse:
     orchestrator = request.app.state.orchestrator
-    result = orchestrator.chat(session_id=payload.session_id, user_message=payload.user_message)
+    result = await orchestrator.achat(session_id=payload.session_id, user_message=payload.user_message)
     return ChatResponse(session_id=payload.session_id, **result)
 
 
+@router.post("/chat/stream")
+def chat_stream(payload: ChatRequest, request: Request) -> StreamingResponse:
+    orchestrator = request.app.state.orchestrator
+
+    def _events():
+        for item in orchestrator.chat_stream(session_id=payload.session_id, user_message=payload.user_message):
+            data = item["data"]
+            if item["event"] == "done":
+                data = ChatResponse(session_id=payload.session_id, **data).model_dump()
+            yield f"event: {item['event']}\ndata: {json.dumps(data, ensure_ascii=True)}\n\n"
+
+    return StreamingResponse(_events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.post("/chat/batch")
+async def chat_batch(payload: ChatBatchRequest, request: Request) -> StreamingResponse:
+    orchestrator = request.app.state.orchestrator
+    concurrency = payload.concurrency or request.app.state.settings.chat_batch_concurrency
+    items = [(item.session_id, item.user_message) for item in payload.items]
+
+    async def _lines():
+        async for item in orchestrator.achat_batch(items, concurrency):
+            if item["ok"]:
+                item["result"] = ChatResponse(session_id=item["session_id"], **item["result"]).model_dump()
+            yield json.dumps(item, ensure_ascii=True) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
 @router.post("/memory/add")
-def memory_add(payload: MemoryAddRequest, request: Request) -> dict:
+async def memory_add(payload: MemoryAddRequest, request: Request) -> dict:
     memory = request.app.state.memory
-    memory_id = memory.add_memory(payload.session_id, payload.text, payload.metadata)
+    memory_id = await asyncio.to_thread(memory.add_memory, payload.session_id, payload.text, payload.metadata)
     return {"id": memory_id}
 
 
+@router.post("/memory/add-batch")
+async def memory_add_batch(payload: MemoryAddBatchRequest, request: Request) -> dict:
+    memory = request.app.state.memory
+    items = [item.model_dump() for item in payload.items]
+    ids = await asyncio.to_thread(memory.add_many, items)
+    return {"ids": ids}
+
+
 @router.post("/memory/search")
-def memory_search(payload: MemorySearchRequest, request: Request) -> dict:
+async def memory_search(payload: MemorySearchRequest, request: Request) -> dict:
     memory = request.app.state.memory
-    hits = memory.search(payload.session_id, payload.query, payload.top_k)
+    hits = await asyncio.to_thread(memory.search, payload.session_id, payload.query, payload.top_k)
     return {"hits": hits}
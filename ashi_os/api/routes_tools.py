@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, Request
 
 from ashi_os.core.models import SchedulerCreateRequest, ToolExecuteRequest
@@ -12,9 +14,10 @@ def tools_catalog(request: Request) -> dict:
 
 
 @router.post("/tools/execute")
-def tools_execute(payload: ToolExecuteRequest, request: Request) -> dict:
+async def tools_execute(payload: ToolExecuteRequest, request: Request) -> dict:
     executor = request.app.state.tool_executor
-    result = executor.execute(
+    result = await asyncio.to_thread(
+        executor.execute,
         session_id=payload.session_id,
         tool=payload.tool,
         action=payload.action,
@@ -25,9 +28,10 @@ def tools_execute(payload: ToolExecuteRequest, request: Request) -> dict:
 
 
 @router.post("/scheduler/jobs")
-def scheduler_create(payload: SchedulerCreateRequest, request: Request) -> dict:
+async def scheduler_create(payload: SchedulerCreateRequest, request: Request) -> dict:
     executor = request.app.state.tool_executor
-    result = executor.execute(
+    result = await asyncio.to_thread(
+        executor.execute,
         session_id=payload.session_id,
         tool="scheduler",
         action="create",
@@ -44,9 +48,10 @@ def scheduler_create(payload: SchedulerCreateRequest, request: Request) -> dict:
 
 
 @router.get("/scheduler/jobs")
-def scheduler_list(request: Request, status: str | None = None) -> dict:
+async def scheduler_list(request: Request, status: str | None = None) -> dict:
     executor = request.app.state.tool_executor
-    return executor.execute(
+    return await asyncio.to_thread(
+        executor.execute,
         session_id="scheduler",
         tool="scheduler",
         action="list",
@@ -56,9 +61,10 @@ def scheduler_list(request: Request, status: str | None = None) -> dict:
 
 
 @router.post("/scheduler/run-due")
-def scheduler_run_due(request: Request) -> dict:
+async def scheduler_run_due(request: Request) -> dict:
     executor = request.app.state.tool_executor
-    return executor.execute(
+    return await asyncio.to_thread(
+        executor.execute,
         session_id="scheduler",
         tool="scheduler",
         action="run_due",
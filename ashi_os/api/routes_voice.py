@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 
 from fastapi import APIRouter, Request
@@ -8,11 +9,13 @@ router = APIRouter(tags=["voice"])
 
 
 @router.post("/voice/command-file")
-def voice_command_file(payload: VoiceCommandFileRequest, request: Request) -> dict:
+async def voice_command_file(payload: VoiceCommandFileRequest, request: Request) -> dict:
     pipeline = request.app.state.voice_pipeline
     orchestrator = request.app.state.orchestrator
 
-    return pipeline.run_file(
+    # STT, the chat turn and `say` are blocking calls.
+    return await asyncio.to_thread(
+        pipeline.run_file,
         session_id=payload.session_id,
         file_path=Path(payload.file_path),
         orchestrator=orchestrator,
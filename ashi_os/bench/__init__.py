@@ -0,0 +1 @@
+"""Benchmark tooling: mock LLM server and load harness."""
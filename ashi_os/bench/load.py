@@ -0,0 +1,187 @@
+import argparse
+import asyncio
+from collections.abc import Callable
+import json
+import math
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from ashi_os.bench.mock_llm import MockLLMConfig, MockLLMServer
+
+Scenario = tuple[str, str, Callable[[int], dict]]
+
+SCENARIOS: dict[str, Scenario] = {
+    "chat": (
+        "POST",
+        "/chat",
+        lambda i: {"session_id": f"bench-{i % 16}", "user_message": f"summarize benchmark item {i}"},
+    ),
+    "memory_search": (
+        "POST",
+        "/memory/search",
+        lambda i: {"session_id": f"bench-{i % 16}", "query": f"benchmark item {i}", "top_k": 5},
+    ),
+    "tool_execute": (
+        "POST",
+        "/tools/execute",
+        lambda i: {"session_id": f"bench-{i % 16}", "tool": "filesystem", "action": "list", "params": {"path": "."}},
+    ),
+    "agents_run": (
+        "POST",
+        "/agents/run",
+        lambda i: {"session_id": f"bench-{i % 16}", "objective": f"research benchmark topic {i}", "auto_execute": False},
+    ),
+}
+
+
+def percentile(samples: list[float], q: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, math.ceil(q * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def summarize(latencies: list[float], errors: int, wall_sec: float) -> dict:
+    total = len(latencies) + errors
+    return {
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / wall_sec, 2) if wall_sec > 0 else 0.0,
+        "p50_ms": _ms(percentile(latencies, 0.50)),
+        "p95_ms": _ms(percentile(latencies, 0.95)),
+        "p99_ms": _ms(percentile(latencies, 0.99)),
+    }
+
+
+async def run_level(client, scenario: Scenario, concurrency: int, requests: int) -> dict:
+    method, path, payload = scenario
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def _one(i: int) -> None:
+        nonlocal errors
+        async with gate:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=payload(i))
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_one(i) for i in range(requests)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_benchmark(
+    scenarios: list[str],
+    levels: list[int],
+    requests: int,
+    mock: MockLLMConfig | None = None,
+    workdir: Path | None = None,
+) -> dict:
+    import httpx
+
+    mock = mock or MockLLMConfig()
+    with MockLLMServer(mock) as server, tempfile.TemporaryDirectory(prefix="ashi-bench-") as scratch:
+        root = workdir or Path(scratch)
+        overrides = {
+            "OLLAMA_HOST": server.url,
+            "OLLAMA_MODEL": mock.model,
+            "OPENAI_BASE_URL": f"{server.url}/v1",
+            "OPENAI_API_KEY": "mock-key",
+            "OPENAI_MODEL": mock.model,
+            "CHROMA_DIR": str(root / "chroma"),
+            "SQLITE_PATH": str(root / "state.db"),
+            "LOG_DIR": str(root / "logs"),
+            "VOICE_INBOX_DIR": str(root / "voice" / "inbox"),
+            "VOICE_PROCESSED_DIR": str(root / "voice" / "processed"),
+            # Every request should reach the mock backend, not the response cache.
+            "LLM_CACHE_ENABLED": "false",
+            "OLLAMA_WARMUP": "false",
+        }
+        previous = {key: os.environ.get(key) for key in overrides}
+        os.environ.update(overrides)
+        try:
+            from ashi_os.api.app import create_app
+
+            app = create_app()
+            results: dict = {"mock": mock.__dict__, "scenarios": {}}
+            transport = httpx.ASGITransport(app=app)
+            # The lifespan runs the app's startup and shutdown hooks, so buffered writes are flushed.
+            async with app.router.lifespan_context(app):
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+                    for name in scenarios:
+                        results["scenarios"][name] = {
+                            str(level): await run_level(client, SCENARIOS[name], level, requests) for level in levels
+                        }
+            return results
+        finally:
+            for key, value in previous.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+def render_table(results: dict) -> str:
+    header = f"{'scenario':<14}{'conc':>6}{'reqs':>7}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    lines = [header, "-" * len(header)]
+    for name, levels in results["scenarios"].items():
+        for level, row in levels.items():
+            lines.append(
+                f"{name:<14}{level:>6}{row['requests']:>7}{row['errors']:>8}{row['throughput_rps']:>10}"
+                f"{_cell(row['p50_ms']):>10}{_cell(row['p95_ms']):>10}{_cell(row['p99_ms']):>10}"
+            )
+    return "\n".join(lines)
+
+
+def _ms(value: float | None) -> float | None:
+    return round(value * 1000, 2) if value is not None else None
+
+
+def _cell(value: float | None) -> str:
+    return "-" if value is None else str(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test ASHI OS in-process against the mock LLM server.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--levels", default="1,8,32")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=MockLLMConfig.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=MockLLMConfig.jitter_ms)
+    parser.add_argument("--tokens-per-sec", type=float, default=MockLLMConfig.tokens_per_sec)
+    parser.add_argument("--reply-tokens", type=int, default=MockLLMConfig.reply_tokens)
+    parser.add_argument("--failure-rate", type=float, default=MockLLMConfig.failure_rate)
+    parser.add_argument("--seed", type=int, default=MockLLMConfig.seed)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a table.")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    mock = MockLLMConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_sec=args.tokens_per_sec,
+        reply_tokens=args.reply_tokens,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    levels = [int(level) for level in args.levels.split(",") if level.strip()]
+    results = asyncio.run(run_benchmark(scenarios, levels, args.requests, mock))
+    print(json.dumps(results, indent=2) if args.json else render_table(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass(frozen=True)
+class MockLLMConfig:
+    model: str = "mock-model"
+    latency_ms: float = 50.0
+    jitter_ms: float = 0.0
+    tokens_per_sec: float = 200.0
+    reply_tokens: int = 32
+    failure_rate: float = 0.0
+    seed: int = 7
+
+
+class _MockBackend:
+    def __init__(self, config: MockLLMConfig) -> None:
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "failures": 0}
+
+    def admit(self) -> tuple[bool, float]:
+        # One seeded draw sequence per server, so a run with the same request order
+        # sees the same failures and latencies.
+        with self._lock:
+            self.stats["requests"] += 1
+            failed = self._rng.random() < self.config.failure_rate
+            jitter = self._rng.uniform(0, self.config.jitter_ms) if self.config.jitter_ms else 0.0
+            if failed:
+                self.stats["failures"] += 1
+        return failed, (self.config.latency_ms + jitter) / 1000
+
+    def reply_tokens(self, prompt: str) -> list[str]:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        words = [f"mock-{digest[:8]}"]
+        words.extend(digest[(i * 2) % 60 : (i * 2) % 60 + 4] for i in range(max(0, self.config.reply_tokens - 1)))
+        return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+    def token_delay(self) -> float:
+        return 1 / self.config.tokens_per_sec if self.config.tokens_per_sec > 0 else 0.0
+
+
+def create_mock_app(config: MockLLMConfig | None = None) -> FastAPI:
+    config = config or MockLLMConfig()
+    backend = _MockBackend(config)
+    app = FastAPI(title="ASHI mock LLM")
+    app.state.backend = backend
+
+    @app.get("/api/tags")
+    def ollama_tags() -> dict:
+        return {"models": [{"name": config.model, "model": config.model, "size": 0, "digest": "mock"}]}
+
+    @app.post("/api/generate")
+    async def ollama_generate(request: Request):
+        body = await request.json()
+        failed, latency = backend.admit()
+        await asyncio.sleep(latency)
+        if failed:
+            return _failure()
+        model = body.get("model", config.model)
+        tokens = backend.reply_tokens(str(body.get("prompt", ""))) if body.get("prompt") else []
+        # Stand-in for Ollama's KV state: one id per prompt and reply token, appended to the caller's.
+        prompt_tokens = len(str(body.get("prompt", "")).split())
+        context = list(body.get("context") or []) + list(range(prompt_tokens + len(tokens)))
+        if not body.get("stream", True):
+            await asyncio.sleep(len(tokens) * backend.token_delay())
+            final = {"model": model, "created_at": _now(), "response": "".join(tokens), "done": True}
+            return {**final, "context": context}
+
+        async def _stream() -> AsyncIterator[str]:
+            for token in tokens:
+                await asyncio.sleep(backend.token_delay())
+                yield json.dumps({"model": model, "created_at": _now(), "response": token, "done": False}) + "\n"
+            final = {"model": model, "created_at": _now(), "response": "", "done": True, "context": context}
+            yield json.dumps(final) + "\n"
+
+        return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+    @app.post("/api/chat")
+    async def ollama_chat(request: Request):
+        body = await request.json()
+        failed, latency = backend.admit()
+        await asyncio.sleep(latency)
+        if failed:
+            return _failure()
+        model = body.get("model", config.model)
+        tokens = backend.reply_tokens(_last_user_message(body.get("messages", [])))
+        if not body.get("stream", True):
+            await asyncio.sleep(len(tokens) * backend.token_delay())
+            return {
+                "model": model,
+                "created_at": _now(),
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "done": True,
+                "done_reason": "stop",
+                "eval_count": len(tokens),
+            }
+
+        async def _stream() -> AsyncIterator[str]:
+            for token in tokens:
+                await asyncio.sleep(backend.token_delay())
+                message = {"role": "assistant", "content": token}
+                yield json.dumps({"model": model, "created_at": _now(), "message": message, "done": False}) + "\n"
+            final = {"model": model, "created_at": _now(), "message": {"role": "assistant", "content": ""}, "done": True}
+            yield json.dumps({**final, "done_reason": "stop", "eval_count": len(tokens)}) + "\n"
+
+        return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+    @app.get("/v1/models")
+    def openai_models() -> dict:
+        return {"object": "list", "data": [{"id": config.model, "object": "model", "created": 0, "owned_by": "mock"}]}
+
+    @app.post("/v1/responses")
+    async def openai_responses(request: Request):
+        body = await request.json()
+        failed, latency = backend.admit()
+        await asyncio.sleep(latency)
+        if failed:
+            return _failure()
+        model = body.get("model", config.model)
+        messages = body.get("input", [])
+        tokens = backend.reply_tokens(_last_user_message(messages) if isinstance(messages, list) else str(messages))
+        if not body.get("stream"):
+            await asyncio.sleep(len(tokens) * backend.token_delay())
+            return _openai_response(model, "".join(tokens))
+
+        async def _stream() -> AsyncIterator[str]:
+            sequence = 0
+            for token in tokens:
+                await asyncio.sleep(backend.token_delay())
+                event = {
+                    "type": "response.output_text.delta",
+                    "item_id": "msg_mock",
+                    "output_index": 0,
+                    "content_index": 0,
+                    "delta": token,
+                    "sequence_number": sequence,
+                }
+                sequence += 1
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            completed = _openai_response(model, "".join(tokens))
+            done = {"type": "response.completed", "response": completed, "sequence_number": sequence}
+            yield f"event: response.completed\ndata: {json.dumps(done)}\n\n"
+
+        return StreamingResponse(_stream(), media_type="text/event-stream")
+
+    @app.get("/mock/stats")
+    def mock_stats() -> dict:
+        return dict(backend.stats)
+
+    return app
+
+
+class MockLLMServer:
+    def __init__(self, config: MockLLMConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or MockLLMConfig()
+        self.host = host
+        self.port = port or _free_port(host)
+        self._server = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        import uvicorn
+
+        config = uvicorn.Config(create_mock_app(self.config), host=self.host, port=self.port, log_level="warning")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, name="mock-llm", daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Mock LLM server failed to start.")
+            time.sleep(0.01)
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "MockLLMServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def _openai_response(model: str, text: str) -> dict:
+    return {
+        "id": "resp_mock",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": "completed",
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_mock",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+def _last_user_message(messages: list) -> str:
+    for message in reversed(messages):
+        if isinstance(message, dict) and message.get("role") == "user":
+            return str(message.get("content", ""))
+    return ""
+
+
+def _failure() -> JSONResponse:
+    return JSONResponse({"error": "injected failure"}, status_code=503)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a deterministic Ollama/OpenAI stand-in for benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--model", default=MockLLMConfig.model)
+    parser.add_argument("--latency-ms", type=float, default=MockLLMConfig.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=MockLLMConfig.jitter_ms)
+    parser.add_argument("--tokens-per-sec", type=float, default=MockLLMConfig.tokens_per_sec)
+    parser.add_argument("--reply-tokens", type=int, default=MockLLMConfig.reply_tokens)
+    parser.add_argument("--failure-rate", type=float, default=MockLLMConfig.failure_rate)
+    parser.add_argument("--seed", type=int, default=MockLLMConfig.seed)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = MockLLMConfig(
+        model=args.model,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_sec=args.tokens_per_sec,
+        reply_tokens=args.reply_tokens,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_mock_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import argparse
+import json
+import random
+import re
+import timeit
+
+from ashi_os.core.policy import DESTRUCTIVE_TERMS, HIGH_RISK_TERMS, MEDIUM_RISK_TERMS, PolicyEngine, default_policy
+
+_WORDS = (
+    "please summarize the weekly status report for project notes then draft a reply about the meeting "
+    "schedule and review open tasks with the team before friday using files in the workspace folder"
+).split()
+
+
+def make_text(chars: int, seed: int, planted: tuple[str, ...] = ()) -> str:
+    # Ordinary chat words, with any planted policy terms at the end so a scan has to cover
+    # the whole input before it finds them.
+    rng = random.Random(seed)
+    words: list[str] = []
+    size = 0
+    while size < chars:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join([*words, *planted])
+
+
+def legacy_scan(text: str) -> list[str]:
+    # What a chat turn did before the shared engine: the destructive check, then a sorted
+    # pass over each risk table with one substring test per term.
+    lower = text.lower()
+    terms = [token for token in ["rm -rf", "shutdown", "reboot", "mkfs", "dd if="] if token in lower]
+    terms += [token for token in sorted(HIGH_RISK_TERMS) if token in lower]
+    terms += [token for token in sorted(MEDIUM_RISK_TERMS) if token in lower]
+    return terms
+
+
+def _policy_terms() -> list[str]:
+    return sorted(HIGH_RISK_TERMS | MEDIUM_RISK_TERMS | DESTRUCTIVE_TERMS)
+
+
+def _trie_pattern(terms: list[str]) -> str:
+    # Terms sharing a prefix share a branch, so each position tries at most one path per character.
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _trie_branch(trie)
+
+
+def _trie_branch(node: dict) -> str:
+    branches = [re.escape(char) + _trie_branch(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 and "" not in node else f"(?:{'|'.join(branches)})"
+    return body + ("?" if "" in node else "")
+
+
+def single_pass_scanner():
+    # One finditer over a trie-shaped alternation, never rescanning. Terms inside a match or
+    # overlapping its end are resolved afterwards from tables built once.
+    terms = _policy_terms()
+    pattern = re.compile(_trie_pattern(terms))
+    inner = {term: [other for other in terms if other != term and other in term] for term in terms}
+    # term -> (other, size) where other starts with the last size characters of term.
+    tails = {
+        term: [
+            (other, size)
+            for other in terms
+            for size in range(1, min(len(term), len(other)))
+            if term[-size:] == other[:size]
+        ]
+        for term in terms
+    }
+
+    def scan(text: str) -> list[str]:
+        lower = text.lower()
+        pending = [(match.group(), match.end()) for match in pattern.finditer(lower)]
+        seen: set[tuple[str, int]] = set()
+        while pending:
+            term, end = pending.pop()
+            if (term, end) in seen:
+                continue
+            seen.add((term, end))
+            pending += [
+                (other, end - size + len(other)) for other, size in tails[term] if lower.startswith(other, end - size)
+            ]
+        found = {term for term, _ in seen}
+        return list(found.union(*(inner[term] for term in found)))
+
+    return scan
+
+
+def automaton_scanner():
+    # Aho-Corasick: one state transition per character, reporting every term ending there.
+    goto: list[dict[str, int]] = [{}]
+    output: list[frozenset[str]] = [frozenset()]
+    for term in _policy_terms():
+        state = 0
+        for char in term:
+            if char not in goto[state]:
+                goto.append({})
+                output.append(frozenset())
+                goto[state][char] = len(goto) - 1
+            state = goto[state][char]
+        output[state] |= {term}
+    fail = [0] * len(goto)
+    queue = list(goto[0].values())
+    for state in queue:
+        for char, child in goto[state].items():
+            queue.append(child)
+            back = fail[state]
+            while back and char not in goto[back]:
+                back = fail[back]
+            fail[child] = goto[back].get(char, 0) if state else 0
+            output[child] |= output[fail[child]]
+
+    def scan(text: str) -> list[str]:
+        state = 0
+        found: set[str] = set()
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return list(found)
+
+    return scan
+
+
+def run_benchmark(sizes: list[int], repeat: int, seed: int, engine: PolicyEngine | None = None) -> dict:
+    engine = engine or default_policy()
+    variants = {
+        "legacy": legacy_scan,
+        "single_pass": single_pass_scanner(),
+        "automaton": automaton_scanner(),
+        "engine": lambda text: [hit.term for hit in engine.scan(text)],
+    }
+    planted = ("rm -rf", "send mail", "deletexecute")
+    results: dict = {"sizes": {}}
+    for size in sizes:
+        text = make_text(size, seed, planted)
+        # Every strategy must report the same terms, or the timings are not comparable.
+        found = {frozenset(scan(text)) for scan in variants.values()}
+        number = max(5, 2_000_000 // max(size, 1))
+        row = {"agree": len(found) == 1}
+        for name, scan in variants.items():
+            best = min(timeit.repeat(lambda: scan(text), number=number, repeat=repeat)) / number
+            row[name] = {"us_per_call": round(best * 1e6, 2), "mb_per_sec": round(len(text) / best / 1e6, 1)}
+        results["sizes"][len(text)] = row
+    return results
+
+
+def render_table(results: dict) -> str:
+    header = (
+        f"{'chars':>9}{'legacy us':>12}{'regex us':>12}{'automaton us':>14}"
+        f"{'engine us':>12}{'engine MB/s':>13}{'agree':>7}"
+    )
+    lines = [header, "-" * len(header)]
+    for size, row in results["sizes"].items():
+        lines.append(
+            f"{size:>9}{row['legacy']['us_per_call']:>12}{row['single_pass']['us_per_call']:>12}"
+            f"{row['automaton']['us_per_call']:>14}"
+            f"{row['engine']['us_per_call']:>12}{row['engine']['mb_per_sec']:>13}{str(row['agree']):>7}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare policy scan strategies on growing inputs.")
+    parser.add_argument("--sizes", default="64,1024,16384,131072")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a table.")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = run_benchmark(sizes, args.repeat, args.seed)
+    print(json.dumps(results, indent=2) if args.json else render_table(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timezone
+import heapq
+from pathlib import Path
 import secrets
+import sqlite3
+import threading
+import time
+
+from ashi_os.core.config import Settings
 
 
 @dataclass
@@ -8,49 +16,258 @@ class PendingConfirmation:
     token: str
     original_message: str
     created_at_iso: str
+    expires_at: float
 
 
 class ConfirmationManager:
-    def __init__(self) -> None:
-        self._pending: dict[str, PendingConfirmation] = {}
+    # One pending confirmation per (scope, session), expiring after ttl_sec.
+    def __init__(
+        self,
+        sqlite_path: Path | None = None,
+        ttl_sec: float = 600.0,
+        max_pending: int = 10000,
+    ) -> None:
+        self.sqlite_path = sqlite_path
+        self.ttl_sec = ttl_sec
+        self.max_pending = max(1, max_pending)
+        # In memory, check-and-consume must be atomic: a token is redeemed by exactly one request.
+        self._lock = threading.Lock()
+        # Guards the heap, the stats and the row count; never held across I/O.
+        self._heap_lock = threading.Lock()
+        self._pending: dict[tuple[str, str], PendingConfirmation] = {}
+        # (expires_at, scope, session_id, token); entries replaced or consumed since are skipped.
+        self._expiry: list[tuple[float, str, str, str]] = []
+        self._stats = {"created": 0, "consumed": 0, "expired": 0, "evicted": 0}
+        # SQLite rows pending as far as this process knows. Replacements count twice, so it may
+        # run high but never low for rows this process wrote; it is resynced when it trips the cap.
+        self._rows = 0
+        self._local = threading.local()
+        if self.sqlite_path is not None:
+            self.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+            self._init_table()
 
-    def create(self, session_id: str, original_message: str) -> str:
+    def create(self, session_id: str, original_message: str, scope: str = "chat") -> str:
         token = secrets.token_hex(4)
-        self._pending[session_id] = PendingConfirmation(
+        now = time.time()
+        pending = PendingConfirmation(
             token=token,
             original_message=original_message,
             created_at_iso=datetime.now(timezone.utc).isoformat(),
+            expires_at=now + self.ttl_sec,
         )
+        with self._held():
+            self._expire(now)
+            self._put((scope, session_id), pending)
         return token
 
-    def consume_if_valid(self, session_id: str, user_message: str) -> tuple[bool, str]:
-        pending = self._pending.get(session_id)
-        if pending is None:
-            return False, ""
-
+    def consume_if_valid(self, session_id: str, user_message: str, scope: str = "chat") -> tuple[bool, str]:
         normalized = user_message.strip().lower()
-        expected = f"confirm {pending.token}"
-        if normalized == expected:
-            del self._pending[session_id]
-            return True, pending.original_message
+        with self._held():
+            pending = self._get((scope, session_id))
+            if pending is None:
+                return False, ""
 
-        if normalized.startswith("confirm "):
-            return True, ""
+            expected = f"confirm {pending.token}"
+            if normalized == expected:
+                return self._consume((scope, session_id), pending)
 
-        return False, ""
+            if normalized.startswith("confirm "):
+                return True, ""
+
+            return False, ""
 
-    def has_pending(self, session_id: str) -> bool:
-        return session_id in self._pending
+    def has_pending(self, session_id: str, scope: str = "chat") -> bool:
+        with self._held():
+            return self._get((scope, session_id)) is not None
 
-    def pending_token(self, session_id: str) -> str | None:
-        pending = self._pending.get(session_id)
-        return pending.token if pending else None
+    def pending_token(self, session_id: str, scope: str = "chat") -> str | None:
+        with self._held():
+            pending = self._get((scope, session_id))
+            return pending.token if pending else None
 
-    def consume_token(self, session_id: str, token: str) -> tuple[bool, str]:
-        pending = self._pending.get(session_id)
-        if pending is None:
+    def consume_token(self, session_id: str, token: str, scope: str = "chat") -> tuple[bool, str]:
+        with self._held():
+            pending = self._get((scope, session_id))
+            if pending is None:
+                return False, ""
+            if token.strip() == pending.token:
+                return self._consume((scope, session_id), pending)
             return False, ""
-        if token.strip() == pending.token:
-            del self._pending[session_id]
-            return True, pending.original_message
-        return False, ""
+
+    def stats(self) -> dict:
+        with self._held():
+            self._expire(time.time())
+            pending = self._count()
+        with self._heap_lock:
+            return {
+                "pending": pending,
+                "ttl_sec": self.ttl_sec,
+                "persistent": self.sqlite_path is not None,
+                **self._stats,
+            }
+
+    def _held(self):
+        return self._lock if self.sqlite_path is None else nullcontext()
+
+    def _get(self, key: tuple[str, str]) -> PendingConfirmation | None:
+        # In memory the caller holds the lock.
+        now = time.time()
+        self._expire(now)
+        if self.sqlite_path is None:
+            return self._pending.get(key)
+        rows = self._connect().execute(
+            "SELECT token, original_message, created_at, expires_at FROM confirmations"
+            " WHERE scope=? AND session_id=? AND expires_at > ?",
+            (*key, now),
+        ).fetchall()
+        return PendingConfirmation(*rows[0]) if rows else None
+
+    def _consume(self, key: tuple[str, str], pending: PendingConfirmation) -> tuple[bool, str]:
+        # In SQLite the delete is conditional on the token, so when two requests or workers
+        # race for the same token only the one whose delete lands redeems it.
+        if self.sqlite_path is None:
+            del self._pending[key]
+        else:
+            with self._connect() as conn:
+                deleted = conn.execute(
+                    "DELETE FROM confirmations WHERE scope=? AND session_id=? AND token=? AND expires_at > ?",
+                    (*key, pending.token, time.time()),
+                ).rowcount
+            if not deleted:
+                return False, ""
+        with self._heap_lock:
+            self._stats["consumed"] += 1
+            self._rows = max(0, self._rows - 1)
+        return True, pending.original_message
+
+    def _put(self, key: tuple[str, str], pending: PendingConfirmation) -> None:
+        if self.sqlite_path is None:
+            self._pending[key] = pending
+        else:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO confirmations"
+                    " (scope, session_id, token, original_message, created_at, expires_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, pending.token, pending.original_message, pending.created_at_iso, pending.expires_at),
+                )
+        with self._heap_lock:
+            heapq.heappush(self._expiry, (pending.expires_at, *key, pending.token))
+            self._stats["created"] += 1
+            if self.sqlite_path is None:
+                due = len(self._pending) > self.max_pending
+            else:
+                self._rows += 1
+                due = self._rows > self.max_pending
+        if due:
+            self._bound()
+        if self.sqlite_path is None:
+            self._compact()
+
+    def _expire(self, now: float) -> None:
+        # Only the heap top is looked at until something is due.
+        with self._heap_lock:
+            if not self._expiry or self._expiry[0][0] > now:
+                return
+            due = []
+            while self._expiry and self._expiry[0][0] <= now:
+                due.append(heapq.heappop(self._expiry))
+        if self.sqlite_path is not None:
+            with self._connect() as conn:
+                expired = conn.execute("DELETE FROM confirmations WHERE expires_at <= ?", (now,)).rowcount
+        else:
+            # In memory the caller holds the lock.
+            expired = sum(self._drop((scope, session_id), token) for _, scope, session_id, token in due)
+        with self._heap_lock:
+            self._stats["expired"] += expired
+            self._rows = max(0, self._rows - expired)
+
+    def _bound(self) -> None:
+        # Runs only once max_pending is exceeded. Evicts the entries closest to expiry; in
+        # SQLite the tracked count is checked against the table first, since replacements and
+        # other workers make it approximate.
+        if self.sqlite_path is not None:
+            with self._connect() as conn:
+                rows = conn.execute("SELECT COUNT(*) FROM confirmations").fetchall()[0][0]
+                excess = max(0, rows - self.max_pending)
+                evicted = 0
+                if excess:
+                    evicted = conn.execute(
+                        "DELETE FROM confirmations WHERE rowid IN"
+                        " (SELECT rowid FROM confirmations ORDER BY expires_at LIMIT ?)",
+                        (excess,),
+                    ).rowcount
+            with self._heap_lock:
+                self._stats["evicted"] += evicted
+                self._rows = rows - evicted
+            return
+        # In memory the caller holds the lock.
+        with self._heap_lock:
+            while len(self._pending) > self.max_pending and self._expiry:
+                _, scope, session_id, token = heapq.heappop(self._expiry)
+                if self._drop((scope, session_id), token):
+                    self._stats["evicted"] += 1
+
+    def _compact(self) -> None:
+        # Caller holds the lock. Replaced and consumed entries leave stale heap items behind;
+        # rebuild before they dominate.
+        with self._heap_lock:
+            if len(self._expiry) <= 2 * len(self._pending) + 64:
+                return
+            self._expiry = [
+                (pending.expires_at, scope, session_id, pending.token)
+                for (scope, session_id), pending in self._pending.items()
+            ]
+            heapq.heapify(self._expiry)
+
+    def _drop(self, key: tuple[str, str], token: str) -> bool:
+        pending = self._pending.get(key)
+        if pending is None or pending.token != token:
+            return False
+        del self._pending[key]
+        return True
+
+    def _count(self) -> int:
+        if self.sqlite_path is None:
+            return len(self._pending)
+        rows = self._connect().execute(
+            "SELECT COUNT(*) FROM confirmations WHERE expires_at > ?", (time.time(),)
+        ).fetchall()
+        return rows[0][0]
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, reused across operations. Used as a context manager it
+        # commits, or rolls back on error, without closing.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.sqlite_path))
+            self._local.conn = conn
+        return conn
+
+    def _init_table(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS confirmations (
+                    scope TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    token TEXT NOT NULL,
+                    original_message TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (scope, session_id)
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_confirmations_expires ON confirmations (expires_at)")
+            # Rows left by a previous run or another worker are purged on start, not tracked.
+            conn.execute("DELETE FROM confirmations WHERE expires_at <= ?", (time.time(),))
+            self._rows = conn.execute("SELECT COUNT(*) FROM confirmations").fetchall()[0][0]
+
+
+def build_confirmation_manager(settings: Settings) -> ConfirmationManager:
+    return ConfirmationManager(
+        sqlite_path=settings.sqlite_path if settings.confirmation_persist else None,
+        ttl_sec=settings.confirmation_ttl_sec,
+        max_pending=settings.confirmation_max_pending,
+    )
@@ -1,32 +1,152 @@
-from typing import Any
+from dataclasses import dataclass, field
+import hashlib
 
+from ashi_os.brain.system_prompt import SYSTEM_PROMPT
+from ashi_os.brain.token_budget import TokenCounter
 from ashi_os.core.config import Settings
 from ashi_os.memory.memory_service import MemoryService
 
+_MIN_PROMPT_BUDGET = 64
+_EXECUTION_PLAN = "- generated by planner at runtime"
+_RISK_POLICY = "- evaluate risk before execution; request confirmation for high-risk actions"
+
+
+@dataclass
+class PromptPack:
+    text: str
+    tokens: int
+    budget: int
+    truncated: list[str] = field(default_factory=list)
+    # The request block alone, for backends that already hold the earlier turns.
+    continuation: str = ""
+    memory_fingerprint: str = ""
+
 
 class ContextManager:
-    def __init__(self, settings: Settings, memory: MemoryService) -> None:
+    def __init__(self, settings: Settings, memory: MemoryService, counter: TokenCounter | None = None) -> None:
         self.settings = settings
         self.memory = memory
+        self.counter = counter or TokenCounter(settings.context_tokenizer)
+
+    def prompt_budget(self) -> int:
+        budget = (
+            self.settings.max_context_tokens
+            - self.counter.count(SYSTEM_PROMPT)
+            - self.settings.context_reply_reserve_tokens
+        )
+        return max(_MIN_PROMPT_BUDGET, budget)
+
+    def recall(self, session_id: str, query: str) -> list[dict]:
+        if not self.settings.memory_on_chat:
+            return []
+        return self.memory.search(session_id=session_id, query=query, top_k=self.settings.memory_top_k)
 
     def build(self, session_id: str, user_message: str, history: list[dict[str, str]]) -> str:
-        recalled = []
-        if self.settings.memory_on_chat:
-            recalled = self.memory.search(session_id=session_id, query=user_message, top_k=self.settings.memory_top_k)
+        return self.pack(session_id, user_message, history).text
+
+    def pack(
+        self,
+        session_id: str,
+        user_message: str,
+        history: list[dict[str, str]],
+        summary: str | None = None,
+        recalled: list[dict] | None = None,
+    ) -> PromptPack:
+        # Callers that started the recall early pass its result in.
+        if recalled is None:
+            recalled = self.recall(session_id, user_message)
         memory_lines = [f"- {item['text']}" for item in recalled]
-        recent = history[-8:]
-        convo_lines = [f"{item['role']}: {item['content']}" for item in recent]
+        # With a summarizer (summary is not None) the history is already bounded and everything
+        # older lives in the summary; without one, only the last eight turns are shown.
+        window = history if summary is not None else history[-8:]
+        convo_lines = [f"{item['role']}: {item['content']}" for item in window]
+
+        budget = self.prompt_budget()
+        truncated: list[str] = []
+        # Every line costs one extra token for its joining newline.
+        remaining = budget - self._cost(self._render([], [], "", ""))
+
+        # Priority: request, then risk policy (fixed scaffolding, already costed), then recent
+        # chat newest-first, then the conversation summary, then memory in recall order.
+        request = user_message
+        if self.counter.count(request) > remaining:
+            request = self.counter.truncate(request, max(0, remaining))
+            truncated.append("request")
+        remaining -= self.counter.count(request)
+
+        kept_convo: list[str] = []
+        for line in reversed(convo_lines):
+            if self._cost(line) > remaining:
+                break
+            kept_convo.insert(0, line)
+            remaining -= self._cost(line)
+        if len(kept_convo) < len(convo_lines):
+            truncated.append("recent_chat")
+
+        kept_summary = summary or ""
+        if kept_summary and self._cost(kept_summary) > remaining:
+            kept_summary = self.counter.truncate(kept_summary, max(0, remaining - 1)) if remaining > 1 else ""
+            truncated.append("summary")
+        if kept_summary:
+            remaining -= self._cost(kept_summary)
+
+        kept_memory: list[str] = []
+        for line in memory_lines:
+            if self._cost(line) > remaining:
+                break
+            kept_memory.append(line)
+            remaining -= self._cost(line)
+        if len(kept_memory) < len(memory_lines):
+            truncated.append("memory")
 
+        # BPE merges across line boundaries can shift the total slightly; drop from the
+        # lowest-priority block until the assembled prompt verifiably fits.
+        text = self._render(kept_memory, kept_convo, kept_summary, request)
+        tokens = self.counter.count(text)
+        while tokens > budget and (kept_memory or kept_summary or kept_convo or request):
+            if kept_memory:
+                kept_memory.pop()
+                truncated.append("memory")
+            elif kept_summary:
+                kept_summary = ""
+                truncated.append("summary")
+            elif kept_convo:
+                kept_convo.pop(0)
+                truncated.append("recent_chat")
+            else:
+                request = self.counter.truncate(request, max(0, self.counter.count(request) - (tokens - budget)))
+                truncated.append("request")
+            text = self._render(kept_memory, kept_convo, kept_summary, request)
+            tokens = self.counter.count(text)
+
+        return PromptPack(
+            text=text,
+            tokens=tokens,
+            budget=budget,
+            truncated=list(dict.fromkeys(truncated)),
+            continuation=f"[USER_REQUEST]\n{request}",
+            memory_fingerprint=hashlib.sha256("\n".join(kept_memory).encode("utf-8")).hexdigest()[:16],
+        )
+
+    def _cost(self, line: str) -> int:
+        return self.counter.count(line) + 1
+
+    @staticmethod
+    def _render(memory_lines: list[str], convo_lines: list[str], summary: str, request: str) -> str:
+        # Ordered from most to least stable so consecutive turns share the longest
+        # possible prefix, which is what model-side prompt caches can reuse.
         blocks = [
-            "[MEMORY]",
-            "\n".join(memory_lines) if memory_lines else "- none",
-            "[RECENT_CHAT]",
-            "\n".join(convo_lines) if convo_lines else "- none",
             "[EXECUTION_PLAN]",
-            "- generated by planner at runtime",
+            _EXECUTION_PLAN,
             "[RISK_POLICY]",
-            "- evaluate risk before execution; request confirmation for high-risk actions",
+            _RISK_POLICY,
+            "[CONVERSATION_SUMMARY]",
+            summary or "- none",
+            "[RECENT_CHAT]",
+            "\n".join(convo_lines) if convo_lines else "- none",
+            "[MEMORY]",
+            "\n".join(memory_lines) if memory_lines else "- none",
             "[USER_REQUEST]",
-            user_message,
+            request,
         ]
         return "\n".join(blocks)
@@ -0,0 +1,128 @@
+from dataclasses import dataclass, field
+import datetime as dt
+import re
+
+from ashi_os.logging.metrics import FAST_PATH_REPLIES
+from ashi_os.tools.executor import ToolExecutor
+
+_PUNCTUATION = re.compile(r"[?!.]+$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _anchored(*alternatives: str) -> re.Pattern[str]:
+    return re.compile("^(?:" + "|".join(alternatives) + ")$", re.IGNORECASE)
+
+
+# Anchored patterns only: a fast-path reply must never swallow a request that merely
+# mentions the time or files ("remind me at what time ...", "list files then delete them").
+_PATTERNS: tuple[tuple[str, re.Pattern[str]], ...] = (
+    (
+        "time",
+        _anchored(
+            "time",
+            "current time",
+            "tell me the time",
+            r"what time is it(?: now)?",
+            r"(?:what|whats|what's) (?:is )?the (?:current )?time(?: now)?",
+        ),
+    ),
+    (
+        "date",
+        _anchored(
+            "date",
+            "today",
+            r"today'?s date",
+            r"what day is (?:it|today)",
+            r"(?:what|whats|what's) (?:is )?(?:the date|today'?s date)(?: today)?",
+        ),
+    ),
+    (
+        "tool_catalog",
+        _anchored(
+            "tools",
+            r"(?:list|show) tools",
+            "tool catalog",
+            r"(?:what|which) tools (?:do you have|are available|can you use)",
+        ),
+    ),
+    (
+        "scheduler_status",
+        _anchored(
+            "scheduler",
+            "scheduler status",
+            r"(?:list|show) (?:scheduled )?jobs",
+            "scheduled jobs",
+            r"(?:what|which) jobs are scheduled",
+        ),
+    ),
+    (
+        "list_files",
+        _anchored(
+            "ls",
+            r"(?:list|show) (?:the )?files",
+            r"(?:list|show) (?:the )?files in (?P<path>[\w./-]+)",
+        ),
+    ),
+)
+
+
+@dataclass(frozen=True)
+class FastPathIntent:
+    name: str
+    params: dict = field(default_factory=dict)
+
+
+class FastPathResponder:
+    def __init__(self, tools: ToolExecutor | None = None) -> None:
+        self.tools = tools
+
+    def match(self, user_message: str) -> FastPathIntent | None:
+        text = _WHITESPACE.sub(" ", _PUNCTUATION.sub("", user_message.strip()))
+        for name, pattern in _PATTERNS:
+            found = pattern.match(text)
+            if found is None:
+                continue
+            if name in {"tool_catalog", "scheduler_status", "list_files"} and self.tools is None:
+                return None
+            if name == "list_files":
+                path = found.group("path") or "."
+                return FastPathIntent(name, {"path": path})
+            return FastPathIntent(name)
+        return None
+
+    def respond(self, session_id: str, intent: FastPathIntent) -> str:
+        FAST_PATH_REPLIES.inc(intent=intent.name)
+        if intent.name == "time":
+            return f"Current time is {dt.datetime.now().strftime('%I:%M:%S %p')}."
+        if intent.name == "date":
+            return f"Today's date is {dt.date.today().strftime('%A, %B %d, %Y')}."
+        if intent.name == "tool_catalog":
+            catalog = self.tools.catalog()
+            lines = [f"- {tool}: {', '.join(actions)}" for tool, actions in catalog.items()]
+            return "Available tools:\n" + "\n".join(lines)
+        if intent.name == "scheduler_status":
+            return self._scheduler_status(session_id)
+        if intent.name == "list_files":
+            return self._list_files(session_id, intent.params["path"])
+        return ""
+
+    def _scheduler_status(self, session_id: str) -> str:
+        result = self.tools.execute(session_id, "scheduler", "list", {})
+        jobs = result.get("jobs", [])
+        if not jobs:
+            return "No scheduled jobs."
+        counts: dict[str, int] = {}
+        for job in jobs:
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+        return f"Scheduler has {len(jobs)} job(s): {summary}."
+
+    def _list_files(self, session_id: str, path: str) -> str:
+        result = self.tools.execute(session_id, "filesystem", "list", {"path": path})
+        if not result.get("ok"):
+            return str(result.get("message", "Could not list files."))
+        entries = result.get("entries", [])
+        if not entries:
+            return f"{path} is empty."
+        lines = [f"- {entry['name']}{'/' if entry['kind'] == 'dir' else ''}" for entry in entries]
+        return f"Files in {path}:\n" + "\n".join(lines)
@@ -0,0 +1,122 @@
+import threading
+from typing import Any
+
+from ashi_os.core.config import Settings
+
+
+class LLMClientPool:
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._ollama: Any = None
+        self._openai: Any = None
+        self._async_ollama: Any = None
+        self._async_openai: Any = None
+
+    def ollama(self) -> Any:
+        if self._ollama is None:
+            with self._lock:
+                if self._ollama is None:
+                    import ollama
+
+                    self._ollama = ollama.Client(
+                        host=self.settings.ollama_host or None,
+                        timeout=self.settings.llm_timeout_sec,
+                        limits=self._limits(),
+                    )
+        return self._ollama
+
+    def openai(self) -> Any:
+        if not self.settings.openai_api_key:
+            return None
+        if self._openai is None:
+            with self._lock:
+                if self._openai is None:
+                    import httpx
+                    from openai import OpenAI
+
+                    self._openai = OpenAI(
+                        api_key=self.settings.openai_api_key,
+                        base_url=self.settings.openai_base_url or None,
+                        http_client=httpx.Client(limits=self._limits(), timeout=self.settings.llm_timeout_sec),
+                    )
+        return self._openai
+
+    def async_ollama(self) -> Any:
+        if self._async_ollama is None:
+            with self._lock:
+                if self._async_ollama is None:
+                    import ollama
+
+                    self._async_ollama = ollama.AsyncClient(
+                        host=self.settings.ollama_host or None,
+                        timeout=self.settings.llm_timeout_sec,
+                        limits=self._limits(),
+                    )
+        return self._async_ollama
+
+    def async_openai(self) -> Any:
+        if not self.settings.openai_api_key:
+            return None
+        if self._async_openai is None:
+            with self._lock:
+                if self._async_openai is None:
+                    import httpx
+                    from openai import AsyncOpenAI
+
+                    self._async_openai = AsyncOpenAI(
+                        api_key=self.settings.openai_api_key,
+                        base_url=self.settings.openai_base_url or None,
+                        http_client=httpx.AsyncClient(limits=self._limits(), timeout=self.settings.llm_timeout_sec),
+                    )
+        return self._async_openai
+
+    async def aclose(self) -> None:
+        with self._lock:
+            clients = [self._async_ollama, self._async_openai]
+            self._async_ollama = None
+            self._async_openai = None
+        for client in clients:
+            if client is not None:
+                await _aclose_client(client)
+
+    def close(self) -> None:
+        with self._lock:
+            clients = [self._ollama, self._openai]
+            self._ollama = None
+            self._openai = None
+        for client in clients:
+            if client is not None:
+                _close_client(client)
+
+    def _limits(self) -> Any:
+        import httpx
+
+        size = max(1, self.settings.llm_pool_size)
+        return httpx.Limits(
+            max_connections=size,
+            max_keepalive_connections=size,
+            keepalive_expiry=self.settings.llm_keepalive_sec,
+        )
+
+
+def _close_client(client: Any) -> None:
+    # Older ollama clients have no close(); fall back to their private httpx client.
+    close = getattr(client, "close", None) or getattr(getattr(client, "_client", None), "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except Exception:
+        pass
+
+
+async def _aclose_client(client: Any) -> None:
+    # Older ollama clients have no close(); fall back to their private httpx client.
+    close = getattr(client, "close", None) or getattr(getattr(client, "_client", None), "aclose", None)
+    if close is None:
+        return
+    try:
+        await close()
+    except Exception:
+        pass
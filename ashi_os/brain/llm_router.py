@@ -1,71 +1,632 @@
+import asyncio
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError, wait
+from dataclasses import dataclass
+import hashlib
+import threading
+import time
 from typing import Literal
 
+from ashi_os.brain.llm_clients import LLMClientPool
+from ashi_os.brain.provider_health import ProviderHealth
+from ashi_os.brain.response_cache import ResponseCache, build_response_cache
+from ashi_os.brain.session_context import OllamaContextStore, SessionPrompt
+from ashi_os.brain.single_flight import AsyncSingleFlight, SingleFlight
 from ashi_os.brain.system_prompt import SYSTEM_PROMPT
 from ashi_os.core.config import Settings
+from ashi_os.core.security import redact_secrets
+from ashi_os.logging.metrics import LLM_LATENCY, LLM_REQUESTS, LLM_TIER_LATENCY
 
 
 Provider = Literal["ollama", "openai", "fallback"]
 
+NO_BACKEND_REPLY = "No LLM backend available. Start Ollama or set OPENAI_API_KEY."
+
+# Latency samples needed before the hedge delay switches from LLM_HEDGE_DELAY_MS to the observed p95.
+_HEDGE_MIN_SAMPLES = 20
+
+
+@dataclass(frozen=True)
+class RouteSignals:
+    plan_steps: int
+    risk_level: str
+    prompt_tokens: int
+
 
 class LLMRouter:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        clients: LLMClientPool | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
         self.settings = settings
+        self.clients = clients or LLMClientPool(settings)
+        self.cache = cache if cache is not None else build_response_cache(settings)
+        self.health = ProviderHealth(
+            failure_threshold=settings.llm_breaker_failures,
+            cooldown_sec=settings.llm_breaker_cooldown_sec,
+            probe=self._probe,
+        )
+        self._lock = threading.Lock()
+        self._hedge_pool: ThreadPoolExecutor | None = None
+        self._hedge_stats = {"requests": 0, "fired": 0, "won": 0}
+        self._inflight = SingleFlight() if settings.llm_coalesce_enabled else None
+        self._async_inflight = AsyncSingleFlight() if settings.llm_coalesce_enabled else None
+        self._warmup: dict = {"state": "pending", "duration_sec": None, "error": None}
+        self._tier_stats = {tier: {"requests": 0, "latency_sec_total": 0.0} for tier in ("fast", "large")}
+        self.contexts = (
+            OllamaContextStore(
+                max_sessions=settings.ollama_context_sessions,
+                max_tokens=settings.max_context_tokens,
+                reply_reserve_tokens=settings.context_reply_reserve_tokens,
+            )
+            if settings.ollama_context_reuse
+            else None
+        )
+
+    def generate(
+        self,
+        prompt: str,
+        hedge: bool = False,
+        cache: bool = False,
+        session: SessionPrompt | None = None,
+        signals: RouteSignals | None = None,
+    ) -> tuple[str, str, str]:
+        # Callers opt in to caching per request; only they know whether a prompt is
+        # low-risk and independent of recalled memory.
+        tier = self.select_tier(signals)
+        candidates = self._candidates(tier)
+        started = time.perf_counter()
+        use_cache = cache and self.cache is not None
+        if use_cache:
+            cached = self._cache_lookup(candidates, prompt)
+            if cached is not None:
+                self._record_tier(tier, started)
+                return cached
+
+        def _upstream() -> tuple[str, str, str]:
+            backend, reply, provider, model = self._generate(prompt, candidates, hedge, session)
+            if use_cache and backend is not None:
+                self.cache.put(backend, model, prompt, reply)
+            return reply, provider, model
+
+        try:
+            if self._inflight is None:
+                return _upstream()
+            # Identical concurrent prompts share one upstream call.
+            return self._inflight.do(_flight_key(candidates, prompt), _upstream)
+        finally:
+            self._record_tier(tier, started)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        hedge: bool = False,
+        cache: bool = False,
+        session: SessionPrompt | None = None,
+        signals: RouteSignals | None = None,
+    ) -> tuple[str, str, str]:
+        tier = self.select_tier(signals)
+        candidates = self._candidates(tier)
+        started = time.perf_counter()
+        use_cache = cache and self.cache is not None
+        if use_cache:
+            if self.cache.blocking:
+                cached = await asyncio.to_thread(self._cache_lookup, candidates, prompt)
+            else:
+                cached = self._cache_lookup(candidates, prompt)
+            if cached is not None:
+                self._record_tier(tier, started)
+                return cached
+
+        async def _upstream() -> tuple[str, str, str]:
+            backend, reply, provider, model = await self._agenerate(prompt, candidates, hedge, session)
+            if use_cache and backend is not None:
+                if self.cache.blocking:
+                    await asyncio.to_thread(self.cache.put, backend, model, prompt, reply)
+                else:
+                    self.cache.put(backend, model, prompt, reply)
+            return reply, provider, model
+
+        try:
+            if self._async_inflight is None:
+                return await _upstream()
+            return await self._async_inflight.do(_flight_key(candidates, prompt), _upstream)
+        finally:
+            self._record_tier(tier, started)
+
+    def generate_stream(
+        self,
+        prompt: str,
+        session: SessionPrompt | None = None,
+        signals: RouteSignals | None = None,
+    ) -> Iterator[tuple[str, str, str]]:
+        tier = self.select_tier(signals)
+        stream_started = time.perf_counter()
+        try:
+            yield from self._generate_stream(prompt, self._candidates(tier), session)
+        finally:
+            self._record_tier(tier, stream_started)
+
+    def _generate_stream(
+        self,
+        prompt: str,
+        candidates: list[tuple[str, str, str]],
+        session: SessionPrompt | None,
+    ) -> Iterator[tuple[str, str, str]]:
+        # Fallback is only possible before the first token; a backend that fails
+        # mid-stream ends the stream with whatever was already emitted.
+        for backend, provider, model in candidates:
+            if not self._available(backend):
+                continue
+            emitted = False
+            started = time.perf_counter()
+            try:
+                for chunk in self._stream(backend, model, prompt, session):
+                    if chunk:
+                        emitted = True
+                        yield chunk, provider, model
+            except Exception as exc:
+                self._record_failure(backend, model, started, exc)
+                if emitted:
+                    return
+                continue
+            self._record_success(backend, model, started)
+            if emitted:
+                return
+
+        yield NO_BACKEND_REPLY, "none", "none"
+
+    def select_tier(self, signals: RouteSignals | None) -> str:
+        # Only short, single-purpose, low-risk turns go to the fast tier; anything the
+        # planner or risk evaluator flags as non-trivial keeps the large model.
+        if signals is None or not self._fast_tier_configured():
+            return "large"
+        if signals.risk_level != "low":
+            return "large"
+        if signals.plan_steps > self.settings.llm_fast_max_steps:
+            return "large"
+        if signals.prompt_tokens > self.settings.llm_fast_max_prompt_tokens:
+            return "large"
+        return "fast"
 
-    def generate(self, prompt: str) -> tuple[str, str, str]:
+    def _record_tier(self, tier: str, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = self._tier_stats[tier]
+            stats["requests"] += 1
+            stats["latency_sec_total"] += elapsed
+        LLM_TIER_LATENCY.observe(elapsed, tier=tier)
+
+    def _tier_status(self) -> dict:
+        with self._lock:
+            stats = {tier: dict(values) for tier, values in self._tier_stats.items()}
+        status: dict = {"enabled": self._fast_tier_configured()}
+        for tier, values in stats.items():
+            requests = values["requests"]
+            status[tier] = {
+                "models": self._tier_models(tier),
+                "requests": requests,
+                "avg_latency_sec": round(values["latency_sec_total"] / requests, 4) if requests else None,
+            }
+        return status
+
+    def _fast_tier_configured(self) -> bool:
+        return bool(self.settings.ollama_fast_model or self.settings.openai_fast_model)
+
+    def _tier_models(self, tier: str) -> dict[str, str]:
+        if tier == "fast":
+            return {
+                "ollama": self.settings.ollama_fast_model or self.settings.ollama_model,
+                "openai": self.settings.openai_fast_model or self.settings.openai_model,
+            }
+        return {"ollama": self.settings.ollama_model, "openai": self.settings.openai_model}
+
+    def _candidates(self, tier: str = "large") -> list[tuple[str, str, str]]:
+        models = self._tier_models(tier)
         if self.settings.default_llm == "ollama":
-            reply = self._call_ollama(prompt)
-            if reply is not None:
-                return reply, "ollama", self.settings.ollama_model
+            return [
+                ("ollama", "ollama", models["ollama"]),
+                ("openai", "fallback", models["openai"]),
+            ]
+        if self.settings.default_llm == "openai":
+            return [
+                ("openai", "openai", models["openai"]),
+                ("ollama", "fallback", models["ollama"]),
+            ]
+        return []
+
+    def start_warmup(self) -> threading.Thread | None:
+        # Loads the Ollama model in the background so the server accepts requests (and
+        # reports ready=false on /health) while the weights come off disk.
+        uses_ollama = "ollama" in (self.settings.default_llm, self.settings.fallback_llm)
+        if not self.settings.ollama_warmup or not uses_ollama:
+            with self._lock:
+                self._warmup = {"state": "skipped", "duration_sec": None, "error": None}
+            return None
+        with self._lock:
+            self._warmup = {"state": "running", "duration_sec": None, "error": None}
+        thread = threading.Thread(target=self.warmup, name="llm-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def warmup(self) -> dict:
+        started = time.perf_counter()
+        models = dict.fromkeys([self.settings.ollama_model, self.settings.ollama_fast_model])
+        try:
+            # An empty prompt makes Ollama load the model and return without generating.
+            for model in filter(None, models):
+                self.clients.ollama().generate(model=model, prompt="", keep_alive=self._keep_alive())
+        except Exception as exc:
+            outcome = {"state": "failed", "duration_sec": time.perf_counter() - started, "error": redact_secrets(str(exc))[:200]}
+        else:
+            outcome = {"state": "ready", "duration_sec": time.perf_counter() - started, "error": None}
+        with self._lock:
+            self._warmup = outcome
+        return dict(outcome)
 
-            reply = self._call_openai(prompt)
+    def warmup_status(self) -> dict:
+        with self._lock:
+            warmup = dict(self._warmup)
+        # Failed is not ready; degraded means chat still falls back to the secondary provider.
+        return {"ready": warmup["state"] in {"ready", "skipped"}, "degraded": warmup["state"] == "failed", **warmup}
+
+    def status(self) -> dict:
+        with self._lock:
+            hedging = {"mode": self.settings.llm_hedge_mode, **self._hedge_stats}
+        return {
+            "warmup": self.warmup_status(),
+            "health": self.health.snapshot(),
+            "hedging": hedging,
+            "cache": self.cache.stats() if self.cache is not None else {"enabled": False},
+            "coalescing": self._coalescing_stats(),
+            "session_context": self.contexts.stats() if self.contexts is not None else {"enabled": False},
+            "tiers": self._tier_status(),
+        }
+
+    def close(self) -> None:
+        self.health.stop()
+        with self._lock:
+            pool = self._hedge_pool
+            self._hedge_pool = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _coalescing_stats(self) -> dict:
+        if self._inflight is None or self._async_inflight is None:
+            return {"enabled": False}
+        sync_stats = self._inflight.stats()
+        async_stats = self._async_inflight.stats()
+        return {key: sync_stats[key] + async_stats[key] for key in sync_stats}
+
+    def _cache_lookup(self, candidates: list[tuple[str, str, str]], prompt: str) -> tuple[str, str, str] | None:
+        hit = self.cache.get([(backend, model) for backend, _, model in candidates], prompt)
+        if hit is None:
+            return None
+        reply, model = hit
+        return reply, "cache", model
+
+    def _generate(
+        self,
+        prompt: str,
+        candidates: list[tuple[str, str, str]],
+        hedge: bool,
+        session: SessionPrompt | None = None,
+    ) -> tuple[str | None, str, str, str]:
+        if len(candidates) > 1 and self._hedging(hedge):
+            return self._generate_hedged(prompt, candidates[0], candidates[1], session)
+
+        for backend, provider, model in candidates:
+            reply = self._call(backend, model, prompt, session)
             if reply is not None:
-                return reply, "fallback", self.settings.openai_model
+                return backend, reply, provider, model
 
-        if self.settings.default_llm == "openai":
-            reply = self._call_openai(prompt)
+        return None, NO_BACKEND_REPLY, "none", "none"
+
+    def _hedging(self, requested: bool) -> bool:
+        mode = self.settings.llm_hedge_mode
+        return mode == "all" or (mode == "voice" and requested)
+
+    def _hedge_delay(self, backend: str) -> float:
+        snapshot = self.health.snapshot().get(backend, {})
+        if snapshot.get("successes", 0) + snapshot.get("failures", 0) >= _HEDGE_MIN_SAMPLES:
+            p95 = self.health.latency_quantile(backend, 0.95)
+            if p95 is not None:
+                return max(0.05, p95)
+        return max(0.05, self.settings.llm_hedge_delay_ms / 1000)
+
+    def _generate_hedged(
+        self,
+        prompt: str,
+        primary: tuple[str, str, str],
+        secondary: tuple[str, str, str],
+        session: SessionPrompt | None = None,
+    ) -> tuple[str | None, str, str, str]:
+        pool = self._executor()
+        self._bump("requests")
+        first = pool.submit(self._call, primary[0], primary[2], prompt, session)
+        hedged = False
+        try:
+            reply = first.result(timeout=self._hedge_delay(primary[0]))
+        except TimeoutError:
+            hedged = True
+        else:
             if reply is not None:
-                return reply, "openai", self.settings.openai_model
+                return primary[0], reply, primary[1], primary[2]
+
+        # Primary is either slow (hedge) or already failed (plain fallback).
+        pending = {pool.submit(self._call, secondary[0], secondary[2], prompt, session): secondary}
+        if hedged:
+            self._bump("fired")
+            pending[first] = primary
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                candidate = pending.pop(future)
+                reply = future.result()
+                if reply is None:
+                    continue
+                # Threads cannot be interrupted mid-request: the loser is cancelled if it
+                # has not started yet, otherwise it finishes in the background and is discarded.
+                for loser in pending:
+                    loser.cancel()
+                if hedged and candidate is secondary:
+                    self._bump("won")
+                return candidate[0], reply, candidate[1], candidate[2]
+
+        return None, NO_BACKEND_REPLY, "none", "none"
 
-            reply = self._call_ollama(prompt)
+    async def _agenerate(
+        self,
+        prompt: str,
+        candidates: list[tuple[str, str, str]],
+        hedge: bool,
+        session: SessionPrompt | None = None,
+    ) -> tuple[str | None, str, str, str]:
+        if len(candidates) > 1 and self._hedging(hedge):
+            return await self._agenerate_hedged(prompt, candidates[0], candidates[1], session)
+
+        for backend, provider, model in candidates:
+            reply = await self._acall(backend, model, prompt, session)
             if reply is not None:
-                return reply, "fallback", self.settings.ollama_model
+                return backend, reply, provider, model
 
-        return (
-            "No LLM backend available. Start Ollama or set OPENAI_API_KEY.",
-            "none",
-            "none",
-        )
+        return None, NO_BACKEND_REPLY, "none", "none"
+
+    async def _agenerate_hedged(
+        self,
+        prompt: str,
+        primary: tuple[str, str, str],
+        secondary: tuple[str, str, str],
+        session: SessionPrompt | None = None,
+    ) -> tuple[str | None, str, str, str]:
+        self._bump("requests")
+        first = asyncio.create_task(self._acall(primary[0], primary[2], prompt, session))
+        done, _ = await asyncio.wait({first}, timeout=self._hedge_delay(primary[0]))
+        hedged = not done
+        if done and first.result() is not None:
+            return primary[0], first.result(), primary[1], primary[2]
+
+        pending = {asyncio.create_task(self._acall(secondary[0], secondary[2], prompt, session)): secondary}
+        if hedged:
+            self._bump("fired")
+            pending[first] = primary
 
-    def _call_ollama(self, user_prompt: str) -> str | None:
         try:
-            import ollama
-
-            client = ollama.Client()
-            response = client.chat(
-                model=self.settings.ollama_model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
-            )
-            return response["message"]["content"].strip()
-        except Exception:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    candidate = pending.pop(task)
+                    reply = task.result()
+                    if reply is None:
+                        continue
+                    if hedged and candidate is secondary:
+                        self._bump("won")
+                    return candidate[0], reply, candidate[1], candidate[2]
+        finally:
+            # Unlike the threaded path, the losing request is actually aborted here.
+            for task in pending:
+                task.cancel()
+
+        return None, NO_BACKEND_REPLY, "none", "none"
+
+    async def _acall(
+        self,
+        backend: str,
+        model: str,
+        prompt: str,
+        session: SessionPrompt | None = None,
+    ) -> str | None:
+        if not self._available(backend):
             return None
+        started = time.perf_counter()
+        try:
+            if backend == "ollama":
+                reply = await self._acall_ollama(prompt, model, session)
+            else:
+                reply = await self._acall_openai(prompt, model)
+        except asyncio.CancelledError:
+            self._observe(backend, model, "cancelled", time.perf_counter() - started)
+            raise
+        except Exception as exc:
+            self._record_failure(backend, model, started, exc)
+            return None
+        self._record_success(backend, model, started)
+        return reply
+
+    def _record_success(self, backend: str, model: str, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        self.health.record_success(backend, elapsed)
+        self._observe(backend, model, "success", elapsed)
+
+    def _record_failure(self, backend: str, model: str, started: float, exc: Exception) -> None:
+        elapsed = time.perf_counter() - started
+        self.health.record_failure(backend, elapsed, str(exc))
+        self._observe(backend, model, "failure", elapsed)
+
+    def _observe(self, backend: str, model: str, outcome: str, elapsed: float) -> None:
+        LLM_REQUESTS.inc(provider=backend, model=model, outcome=outcome)
+        LLM_LATENCY.observe(elapsed, provider=backend, model=model, outcome=outcome)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=max(2, 2 * self.settings.llm_pool_size),
+                    thread_name_prefix="llm-hedge",
+                )
+            return self._hedge_pool
+
+    def _bump(self, counter: str) -> None:
+        with self._lock:
+            self._hedge_stats[counter] += 1
+
+    def _available(self, backend: str) -> bool:
+        if backend == "openai" and not self.settings.openai_api_key:
+            return False
+        return self.health.allow(backend)
 
-    def _call_openai(self, user_prompt: str) -> str | None:
-        if not self.settings.openai_api_key:
+    def _call(self, backend: str, model: str, prompt: str, session: SessionPrompt | None = None) -> str | None:
+        if not self._available(backend):
             return None
+        started = time.perf_counter()
         try:
-            from openai import OpenAI
-
-            client = OpenAI(api_key=self.settings.openai_api_key)
-            response = client.responses.create(
-                model=self.settings.openai_model,
-                input=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
-            )
-            return response.output_text.strip()
-        except Exception:
+            if backend == "ollama":
+                reply = self._call_ollama(prompt, model, session)
+            else:
+                reply = self._call_openai(prompt, model)
+        except Exception as exc:
+            self._record_failure(backend, model, started, exc)
             return None
+        self._record_success(backend, model, started)
+        return reply
+
+    def _probe(self, backend: str) -> bool:
+        if backend == "ollama":
+            self.clients.ollama().list()
+            return True
+        client = self.clients.openai()
+        if client is None:
+            return False
+        client.models.list()
+        return True
+
+    def _stream(self, backend: str, model: str, prompt: str, session: SessionPrompt | None = None) -> Iterator[str]:
+        if backend == "ollama":
+            return self._stream_ollama(prompt, model, session)
+        return self._stream_openai(prompt, model)
+
+    def _keep_alive(self) -> float | str:
+        # Ollama reads bare numbers as seconds and strings as Go durations ("30m").
+        value = self.settings.ollama_keep_alive.strip()
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+    def _messages(self, user_prompt: str) -> list[dict[str, str]]:
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _session_request(self, user_prompt: str, model: str, session: SessionPrompt) -> dict:
+        # Continuing a session sends only the new request on top of Ollama's returned context
+        # tokens; a fresh session gets the full packed prompt and the system prompt.
+        context = self.contexts.lookup(session, model)
+        request = {"model": model, "keep_alive": self._keep_alive()}
+        if context is None:
+            return {**request, "system": SYSTEM_PROMPT, "prompt": user_prompt}
+        return {**request, "prompt": session.continuation, "context": context}
+
+    def _call_ollama(self, user_prompt: str, model: str, session: SessionPrompt | None = None) -> str:
+        client = self.clients.ollama()
+        if session is not None and self.contexts is not None:
+            try:
+                response = client.generate(**self._session_request(user_prompt, model, session))
+            except Exception:
+                self.contexts.forget(session.session_id)
+                raise
+            reply = response["response"].strip()
+            self.contexts.store(session, model, response.get("context"), reply)
+            return reply
+        response = client.chat(
+            model=model,
+            messages=self._messages(user_prompt),
+            keep_alive=self._keep_alive(),
+        )
+        return response["message"]["content"].strip()
+
+    def _call_openai(self, user_prompt: str, model: str) -> str:
+        client = self.clients.openai()
+        response = client.responses.create(
+            model=model,
+            input=self._messages(user_prompt),
+        )
+        return response.output_text.strip()
+
+    async def _acall_ollama(self, user_prompt: str, model: str, session: SessionPrompt | None = None) -> str:
+        client = self.clients.async_ollama()
+        if session is not None and self.contexts is not None:
+            try:
+                response = await client.generate(**self._session_request(user_prompt, model, session))
+            except BaseException:
+                # Includes cancellation of a hedge loser: the stored context may be half-used.
+                self.contexts.forget(session.session_id)
+                raise
+            reply = response["response"].strip()
+            self.contexts.store(session, model, response.get("context"), reply)
+            return reply
+        response = await client.chat(
+            model=model,
+            messages=self._messages(user_prompt),
+            keep_alive=self._keep_alive(),
+        )
+        return response["message"]["content"].strip()
+
+    async def _acall_openai(self, user_prompt: str, model: str) -> str:
+        client = self.clients.async_openai()
+        response = await client.responses.create(
+            model=model,
+            input=self._messages(user_prompt),
+        )
+        return response.output_text.strip()
+
+    def _stream_ollama(self, user_prompt: str, model: str, session: SessionPrompt | None = None) -> Iterator[str]:
+        client = self.clients.ollama()
+        if session is not None and self.contexts is not None:
+            parts: list[str] = []
+            context = None
+            try:
+                for part in client.generate(**self._session_request(user_prompt, model, session), stream=True):
+                    parts.append(part["response"])
+                    context = part.get("context") or context
+                    yield part["response"]
+            except BaseException:
+                self.contexts.forget(session.session_id)
+                raise
+            self.contexts.store(session, model, context, "".join(parts).strip())
+            return
+        for part in client.chat(
+            model=model,
+            messages=self._messages(user_prompt),
+            keep_alive=self._keep_alive(),
+            stream=True,
+        ):
+            yield part["message"]["content"]
+
+    def _stream_openai(self, user_prompt: str, model: str) -> Iterator[str]:
+        client = self.clients.openai()
+        for event in client.responses.create(
+            model=model,
+            input=self._messages(user_prompt),
+            stream=True,
+        ):
+            if getattr(event, "type", "") == "response.output_text.delta":
+                yield event.delta
+
+
+def _flight_key(candidates: list[tuple[str, str, str]], prompt: str) -> str:
+    return hashlib.sha256(f"{candidates!r}\n{prompt}".encode("utf-8")).hexdigest()
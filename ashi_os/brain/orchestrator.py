@@ -1,33 +1,227 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+import queue
+import threading
+
 from ashi_os.brain.confirmation import ConfirmationManager
 from ashi_os.brain.context_manager import ContextManager
-from ashi_os.brain.llm_router import LLMRouter
-from ashi_os.brain.planning import RiskEvaluator, StrategicPlanner
-from ashi_os.core.security import is_destructive_command
+from ashi_os.brain.fast_path import FastPathIntent, FastPathResponder
+from ashi_os.brain.llm_router import LLMRouter, RouteSignals
+from ashi_os.brain.planning import ExecutionPlan, RiskAssessment, RiskEvaluator, StrategicPlanner
+from ashi_os.brain.session_context import SessionPrompt, reply_digest
+from ashi_os.brain.session_locks import SessionLocks
+from ashi_os.brain.session_store import SessionStore
+from ashi_os.brain.summarizer import SessionSummarizer
+from ashi_os.core.policy import PolicyEngine, default_policy, destructive
+from ashi_os.core.write_behind import WriteBehindQueue
 from ashi_os.logging.audit_log import AuditLogger
+from ashi_os.logging.metrics import StageTimer
 from ashi_os.memory.memory_service import MemoryService
 
 
+@dataclass
+class _PreparedTurn:
+    session_id: str
+    user_message: str
+    plan: ExecutionPlan
+    risk: RiskAssessment
+    prompt: str
+    history: list[dict[str, str]]
+    cacheable: bool = False
+    prompt_tokens: int = 0
+    truncated: tuple[str, ...] = ()
+    session: SessionPrompt | None = None
+    signals: RouteSignals | None = None
+    timer: StageTimer | None = None
+
+
 class Orchestrator:
     def __init__(
         self,
         router: LLMRouter,
         context_manager: ContextManager,
-        memory: MemoryService,
-        audit: AuditLogger,
+        memory: MemoryService | WriteBehindQueue,
+        audit: AuditLogger | WriteBehindQueue,
         memory_on_chat: bool,
+        fast_path: FastPathResponder | None = None,
+        summarizer: SessionSummarizer | None = None,
+        sessions: SessionStore | None = None,
+        policy: PolicyEngine | None = None,
+        confirmation: ConfirmationManager | None = None,
+        locks: SessionLocks | None = None,
     ) -> None:
         self.router = router
+        self.fast_path = fast_path
+        self.summarizer = summarizer
         self.context_manager = context_manager
         self.memory = memory
         self.audit = audit
         self.memory_on_chat = memory_on_chat
-        self._sessions: dict[str, list[dict[str, str]]] = {}
+        self.sessions = sessions or SessionStore()
+        # Shared with AgentCoordinator, so chat turns and missions of a session never interleave.
+        self.locks = locks or SessionLocks()
+        self._recall_pool = ThreadPoolExecutor(
+            max_workers=max(1, context_manager.settings.llm_pool_size), thread_name_prefix="memory-recall"
+        )
 
         self.planner = StrategicPlanner()
-        self.risk = RiskEvaluator()
-        self.confirmation = ConfirmationManager()
+        self.policy = policy or default_policy()
+        self.risk = RiskEvaluator(self.policy)
+        self.confirmation = confirmation or ConfirmationManager()
+
+    def chat(self, session_id: str, user_message: str, hedge: bool = False) -> dict:
+        # Turns of one session are serialized end to end (gate, history, model call,
+        # persistence); other sessions proceed in parallel.
+        with self.locks.hold(session_id):
+            return self._chat(session_id, user_message, hedge)
+
+    async def achat(self, session_id: str, user_message: str, hedge: bool = False) -> dict:
+        async with self.locks.ahold(session_id):
+            return await self._achat(session_id, user_message, hedge)
+
+    def chat_stream(self, session_id: str, user_message: str) -> Iterator[dict]:
+        # A producer thread runs the turn, so an unread stream never holds the session lock.
+        events: queue.SimpleQueue = queue.SimpleQueue()
+        stop = threading.Event()
+
+        def _produce() -> None:
+            try:
+                with self.locks.hold(session_id), closing(self._chat_stream(session_id, user_message)) as stream:
+                    for item in stream:
+                        if stop.is_set():
+                            return
+                        events.put(item)
+            except BaseException as exc:
+                events.put(exc)
+            finally:
+                events.put(None)
+
+        threading.Thread(target=_produce, name="chat-stream", daemon=True).start()
+        try:
+            while (item := events.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def _chat(self, session_id: str, user_message: str, hedge: bool) -> dict:
+        intent = self._fast_intent(user_message)
+        if intent is not None:
+            return self._answer_fast(session_id, user_message, intent)
+        turn = self._prepare(session_id, user_message)
+        if isinstance(turn, dict):
+            return turn
+        with turn.timer.stage("llm"):
+            reply, provider, model = self.router.generate(
+                turn.prompt,
+                hedge=hedge,
+                cache=turn.cacheable,
+                session=turn.session,
+                signals=turn.signals,
+            )
+        return self._complete(turn, reply, provider, model)
+
+    async def _achat(self, session_id: str, user_message: str, hedge: bool) -> dict:
+        # Gating, memory recall and persistence block on disk/Chroma, so they run in worker
+        # threads; only the model round trip is awaited on the event loop.
+        intent = self._fast_intent(user_message)
+        if intent is not None:
+            return await asyncio.to_thread(self._answer_fast, session_id, user_message, intent)
+        turn = await asyncio.to_thread(self._prepare, session_id, user_message)
+        if isinstance(turn, dict):
+            return turn
+        with turn.timer.stage("llm"):
+            reply, provider, model = await self.router.agenerate(
+                turn.prompt,
+                hedge=hedge,
+                cache=turn.cacheable,
+                session=turn.session,
+                signals=turn.signals,
+            )
+        return await asyncio.to_thread(self._complete, turn, reply, provider, model)
+
+    async def achat_batch(self, items: list[tuple[str, str]], concurrency: int) -> AsyncIterator[dict]:
+        # One worker per session keeps its turns in submission order; the semaphore caps
+        # how many turns run at once across all sessions. Results stream out as they finish.
+        by_session: dict[str, list[tuple[int, str]]] = {}
+        for index, (session_id, user_message) in enumerate(items):
+            by_session.setdefault(session_id, []).append((index, user_message))
+
+        limit = asyncio.Semaphore(max(1, concurrency))
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def _run_session(session_id: str, turns: list[tuple[int, str]]) -> None:
+            for index, user_message in turns:
+                async with limit:
+                    try:
+                        result = await self.achat(session_id, user_message)
+                        item = {"index": index, "session_id": session_id, "ok": True, "result": result}
+                    except Exception as exc:
+                        item = {"index": index, "session_id": session_id, "ok": False, "error": str(exc)}
+                await results.put(item)
+
+        workers = [asyncio.create_task(_run_session(sid, turns)) for sid, turns in by_session.items()]
+        try:
+            for _ in range(len(items)):
+                yield await results.get()
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    def _chat_stream(self, session_id: str, user_message: str) -> Iterator[dict]:
+        intent = self._fast_intent(user_message)
+        if intent is not None:
+            result = self._answer_fast(session_id, user_message, intent)
+            yield {"event": "token", "data": {"text": result["reply"]}}
+            yield {"event": "done", "data": result}
+            return
+        turn = self._prepare(session_id, user_message)
+        if isinstance(turn, dict):
+            yield {"event": "done", "data": turn}
+            return
+
+        parts: list[str] = []
+        provider, model = "none", "none"
+        stream = self.router.generate_stream(turn.prompt, session=turn.session, signals=turn.signals)
+        with turn.timer.stage("llm"):
+            for chunk, provider, model in stream:
+                parts.append(chunk)
+                yield {"event": "token", "data": {"text": chunk}}
+        yield {"event": "done", "data": self._complete(turn, "".join(parts).strip(), provider, model)}
 
-    def chat(self, session_id: str, user_message: str) -> dict:
+    def _fast_intent(self, user_message: str) -> FastPathIntent | None:
+        if self.fast_path is None:
+            return None
+        return self.fast_path.match(user_message)
+
+    def _answer_fast(self, session_id: str, user_message: str, intent: FastPathIntent) -> dict:
+        # Answered locally: no planning, memory recall or model call.
+        reply = self.fast_path.respond(session_id, intent)
+        turns = self.sessions.extend(
+            session_id,
+            [{"role": "user", "content": user_message}, {"role": "assistant", "content": reply}],
+        )
+        self.audit.write(
+            "chat.fast_path",
+            {"session_id": session_id, "intent": intent.name, "user_message": user_message},
+        )
+        self._summarize_later(session_id, turns)
+        return {
+            "reply": reply,
+            "provider": "fast_path",
+            "model": intent.name,
+            "plan": {},
+            "risk": {"level": "low", "score": 0, "reasons": [], "confirmation_required": False},
+            "confirmation_required": False,
+            "confirmation_token": None,
+        }
+
+    def _prepare(self, session_id: str, user_message: str) -> dict | _PreparedTurn:
+        timer = StageTimer("chat")
         confirmed, restored_message = self.confirmation.consume_if_valid(session_id, user_message)
         if confirmed and not restored_message:
             return {
@@ -42,7 +236,16 @@ class Orchestrator:
         if confirmed and restored_message:
             user_message = restored_message
 
-        if is_destructive_command(user_message):
+        # Memory recall only needs the message, so the vector search runs while the turn is
+        # gated and planned. A gated turn cancels it (or discards it if already running).
+        recall = self._start_recall(timer, session_id, user_message)
+
+        # One policy scan serves both the destructive gate and risk scoring.
+        with timer.stage("policy"):
+            hits = self.policy.scan(user_message)
+        if destructive(hits):
+            if recall is not None:
+                recall.cancel()
             token = self.confirmation.create(session_id=session_id, original_message=user_message)
             confirmation = (
                 "Risk level elevated. Confirmation required before destructive operations. "
@@ -64,10 +267,14 @@ class Orchestrator:
                 "confirmation_token": token,
             }
 
-        plan = self.planner.build_plan(user_message)
-        risk = self.risk.evaluate(user_message, plan)
+        with timer.stage("plan"):
+            plan = self.planner.build_plan(user_message)
+        with timer.stage("risk"):
+            risk = self.risk.evaluate(user_message, plan, hits)
 
         if risk.confirmation_required and not confirmed:
+            if recall is not None:
+                recall.cancel()
             token = self.confirmation.create(session_id=session_id, original_message=user_message)
             reply = (
                 f"Risk level {risk.level}. Confirmation required. "
@@ -92,50 +299,96 @@ class Orchestrator:
                 "confirmation_token": token,
             }
 
-        history = self._sessions.setdefault(session_id, [])
-        prompt = self.context_manager.build(
-            session_id,
-            (
-                f"[OBJECTIVE]\n{plan.objective}\n"
-                f"[PLAN_STEPS]\n"
-                + "\n".join([f"{step.id}. {step.task}" for step in plan.steps])
-                + "\n[RISK]\n"
-                + f"level={risk.level}; score={risk.score}; reasons={'; '.join(risk.reasons) if risk.reasons else 'none'}\n"
-                + "[REQUEST]\n"
-                + user_message
+        history = self.sessions.history(session_id)
+        with timer.stage("recall_wait"):
+            recalled = recall.result() if recall is not None else []
+        with timer.stage("pack"):
+            pack = self.context_manager.pack(
+                session_id,
+                (
+                    f"[OBJECTIVE]\n{plan.objective}\n"
+                    f"[PLAN_STEPS]\n"
+                    + "\n".join([f"{step.id}. {step.task}" for step in plan.steps])
+                    + "\n[RISK]\n"
+                    + f"level={risk.level}; score={risk.score}; reasons={'; '.join(risk.reasons) if risk.reasons else 'none'}\n"
+                    + "[REQUEST]\n"
+                    + user_message
+                ),
+                history,
+                summary=self.sessions.summary(session_id) if self.summarizer is not None else None,
+                recalled=recalled,
+            )
+        return _PreparedTurn(
+            session_id=session_id,
+            user_message=user_message,
+            plan=plan,
+            risk=risk,
+            prompt=pack.text,
+            history=history,
+            cacheable=risk.level == "low" and not self.memory_on_chat,
+            prompt_tokens=pack.tokens,
+            truncated=tuple(pack.truncated),
+            session=SessionPrompt(
+                session_id=session_id,
+                continuation=pack.continuation,
+                memory_fingerprint=pack.memory_fingerprint,
+                turns=len(history),
+                last_reply_digest=reply_digest(history[-1]["content"]) if history else "",
             ),
-            history,
+            signals=RouteSignals(plan_steps=len(plan.steps), risk_level=risk.level, prompt_tokens=pack.tokens),
+            timer=timer,
         )
-        reply, provider, model = self.router.generate(prompt)
 
-        history.append({"role": "user", "content": user_message})
-        history.append({"role": "assistant", "content": reply})
+    def _start_recall(self, timer: StageTimer, session_id: str, user_message: str) -> Future | None:
+        if not self.memory_on_chat:
+            return None
+        return self._recall_pool.submit(timer.run, "memory", self.context_manager.recall, session_id, user_message)
 
-        if self.memory_on_chat and len(user_message.strip()) > 8:
-            self.memory.add_memory(session_id, user_message, {"kind": "user_fact"})
+    def _complete(self, turn: _PreparedTurn, reply: str, provider: str, model: str) -> dict:
+        turns = self.sessions.extend(
+            turn.session_id,
+            [{"role": "user", "content": turn.user_message}, {"role": "assistant", "content": reply}],
+        )
+
+        if self.memory_on_chat and len(turn.user_message.strip()) > 8:
+            self.memory.add_memory(turn.session_id, turn.user_message, {"kind": "user_fact"})
 
         self.audit.write(
             "chat.completed",
             {
-                "session_id": session_id,
+                "session_id": turn.session_id,
                 "provider": provider,
                 "model": model,
-                "user_message": user_message,
+                "user_message": turn.user_message,
                 "reply": reply,
-                "risk_level": risk.level,
-                "plan_steps": len(plan.steps),
+                "risk_level": turn.risk.level,
+                "plan_steps": len(turn.plan.steps),
+                "prompt_tokens": turn.prompt_tokens,
+                "truncated": list(turn.truncated),
+                "stages": turn.timer.as_dict() if turn.timer is not None else {},
             },
         )
+        self._summarize_later(turn.session_id, turns)
 
         return {
             "reply": reply,
             "provider": provider,
             "model": model,
-            "plan": plan.as_dict(),
-            "risk": risk.as_dict(),
+            "plan": turn.plan.as_dict(),
+            "risk": turn.risk.as_dict(),
             "confirmation_required": False,
             "confirmation_token": None,
         }
 
+    def _summarize_later(self, session_id: str, turns: int) -> None:
+        # Runs on the summarizer's own worker; the caller's reply is not held up.
+        if self.summarizer is not None:
+            self.summarizer.maybe_schedule(session_id, self.sessions, turns)
+
     def session_history(self, session_id: str) -> list[dict[str, str]]:
-        return list(self._sessions.get(session_id, []))
+        return self.sessions.history(session_id)
+
+    def close(self) -> None:
+        self._recall_pool.shutdown(wait=False, cancel_futures=True)
+        if self.summarizer is not None:
+            self.summarizer.close()
@@ -1,31 +1,49 @@
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 import re
 
+from ashi_os.core.policy import (
+    HIGH_RISK_TERMS,
+    MEDIUM_RISK_TERMS,
+    RISK_HIGH,
+    RISK_MEDIUM,
+    PolicyEngine,
+    PolicyHit,
+    default_policy,
+)
 
-@dataclass
+PLAN_CACHE_SIZE = 1024
+PLAN_CACHE_MAX_CHARS = 4096
+_STEP_SPLITTER = re.compile(r"\b(?:then|and then|after that|next|finally|and)\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
 class PlanStep:
     id: int
     task: str
     rationale: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class ExecutionPlan:
     objective: str
-    steps: list[PlanStep]
+    steps: tuple[PlanStep, ...]
 
     def as_dict(self) -> dict:
-        return {
-            "objective": self.objective,
-            "steps": [
-                {
-                    "id": step.id,
-                    "task": step.task,
-                    "rationale": step.rationale,
-                }
-                for step in self.steps
-            ],
-        }
+        # Plans are cached and shared, so each caller gets its own copy to keep or mutate.
+        # The step payloads are built once per plan; only the copy is made per call.
+        return {"objective": self.objective, "steps": [dict(step) for step in self._steps_payload]}
+
+    @cached_property
+    def _steps_payload(self) -> tuple[dict, ...]:
+        return tuple(
+            {
+                "id": step.id,
+                "task": step.task,
+                "rationale": step.rationale,
+            }
+            for step in self.steps
+        )
 
 
 @dataclass
@@ -46,88 +64,88 @@ class RiskAssessment:
 
 class StrategicPlanner:
     def build_plan(self, user_message: str) -> ExecutionPlan:
+        # Plans depend only on the objective, so a confirmation replay, or the same objective
+        # from chat and agents, reuses the plan built the first time. Very long objectives are
+        # planned without the cache so it cannot pin large strings.
         objective = user_message.strip() or "Handle request"
-        parts = self._split_steps(objective)
-        steps: list[PlanStep] = []
+        if len(objective) > PLAN_CACHE_MAX_CHARS:
+            return _build_plan.__wrapped__(objective)
+        return _build_plan(objective)
 
-        for idx, part in enumerate(parts, start=1):
-            task = part.strip().strip(".")
-            if not task:
-                continue
-            rationale = "Required to progress toward the objective."
-            if idx == 1:
-                rationale = "Establish initial execution direction."
-            elif idx == len(parts):
-                rationale = "Finalize and validate outcome."
-            steps.append(PlanStep(id=idx, task=task, rationale=rationale))
+    @staticmethod
+    def cache_stats() -> dict:
+        info = _build_plan.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
 
-        if not steps:
-            steps = [PlanStep(id=1, task="Clarify intent", rationale="No clear task segments detected.")]
 
-        return ExecutionPlan(objective=objective, steps=steps)
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _build_plan(objective: str) -> ExecutionPlan:
+    parts = _split_steps(objective)
+    steps: list[PlanStep] = []
 
-    def _split_steps(self, text: str) -> list[str]:
-        chunks = re.split(r"\b(?:then|and then|after that|next|finally|and)\b", text, flags=re.IGNORECASE)
-        cleaned = [chunk.strip(" ,") for chunk in chunks if chunk.strip(" ,")]
-        if len(cleaned) <= 1 and "," in text:
-            cleaned = [x.strip() for x in text.split(",") if x.strip()]
-        return cleaned[:8]
+    for idx, part in enumerate(parts, start=1):
+        task = part.strip().strip(".")
+        if not task:
+            continue
+        rationale = "Required to progress toward the objective."
+        if idx == 1:
+            rationale = "Establish initial execution direction."
+        elif idx == len(parts):
+            rationale = "Finalize and validate outcome."
+        steps.append(PlanStep(id=idx, task=task, rationale=rationale))
+
+    if not steps:
+        steps = [PlanStep(id=1, task="Clarify intent", rationale="No clear task segments detected.")]
+
+    return ExecutionPlan(objective=objective, steps=tuple(steps))
+
+
+def _split_steps(text: str) -> list[str]:
+    chunks = _STEP_SPLITTER.split(text)
+    cleaned = [chunk.strip(" ,") for chunk in chunks if chunk.strip(" ,")]
+    if len(cleaned) <= 1 and "," in text:
+        cleaned = [x.strip() for x in text.split(",") if x.strip()]
+    return cleaned[:8]
 
 
 class RiskEvaluator:
-    HIGH_RISK_TERMS = {
-        "delete",
-        "rm -rf",
-        "shutdown",
-        "reboot",
-        "drop table",
-        "format disk",
-        "erase",
-        "credentials",
-        "password",
-        "api key",
-        "bank",
-        "transfer",
-        "payment",
-    }
-    MEDIUM_RISK_TERMS = {
-        "install",
-        "sudo",
-        "email",
-        "send mail",
-        "automation",
-        "schedule",
-        "run command",
-        "execute",
-        "open site",
-        "signup",
-        "create key",
-    }
-
-    def evaluate(self, user_message: str, plan: ExecutionPlan) -> RiskAssessment:
-        lower = user_message.lower()
+    HIGH_RISK_TERMS = HIGH_RISK_TERMS
+    MEDIUM_RISK_TERMS = MEDIUM_RISK_TERMS
+
+    def __init__(self, policy: PolicyEngine | None = None, high_score: int = 4, medium_score: int = 2) -> None:
+        self.policy = policy or default_policy()
+        self.high_score = high_score
+        self.medium_score = medium_score
+
+    def evaluate(
+        self,
+        user_message: str,
+        plan: ExecutionPlan,
+        hits: list[PolicyHit] | None = None,
+    ) -> RiskAssessment:
+        # Callers that already scanned the message pass the hits in to skip a second scan.
+        if hits is None:
+            hits = self.policy.scan(user_message)
         score = 0
         reasons: list[str] = []
         high_hit = False
 
-        for token in sorted(self.HIGH_RISK_TERMS):
-            if token in lower:
-                score += 3
-                reasons.append(f"High-risk indicator: '{token}'")
+        for hit in hits:
+            if hit.category == RISK_HIGH:
+                score += hit.weight
+                reasons.append(f"High-risk indicator: '{hit.term}'")
                 high_hit = True
-
-        for token in sorted(self.MEDIUM_RISK_TERMS):
-            if token in lower:
-                score += 1
-                reasons.append(f"Medium-risk indicator: '{token}'")
+            elif hit.category == RISK_MEDIUM:
+                score += hit.weight
+                reasons.append(f"Medium-risk indicator: '{hit.term}'")
 
         if len(plan.steps) >= 4:
             score += 1
             reasons.append("Multi-step request complexity")
 
-        if high_hit or score >= 4:
+        if high_hit or score >= self.high_score:
             level = "high"
-        elif score >= 2:
+        elif score >= self.medium_score:
             level = "medium"
         else:
             level = "low"
@@ -0,0 +1,146 @@
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import threading
+import time
+
+from ashi_os.core.security import redact_secrets
+
+
+@dataclass
+class _ProviderState:
+    state: str = "closed"
+    consecutive_failures: int = 0
+    successes: int = 0
+    failures: int = 0
+    opened_at: float = 0.0
+    last_error: str = ""
+    latencies: deque = field(default_factory=lambda: deque(maxlen=256))
+
+
+class ProviderHealth:
+    def __init__(
+        self,
+        failure_threshold: int,
+        cooldown_sec: float,
+        probe: Callable[[str], bool] | None = None,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_sec = max(0.0, cooldown_sec)
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._states: dict[str, _ProviderState] = {}
+        self._stop = threading.Event()
+        self._probe_thread: threading.Thread | None = None
+
+    def allow(self, provider: str) -> bool:
+        with self._lock:
+            state = self._state(provider)
+            if state.state == "closed":
+                return True
+            if state.state == "half_open":
+                return False
+            if self._probe is None and time.monotonic() - state.opened_at >= self.cooldown_sec:
+                # Without a probe, the next real request is the trial call.
+                state.state = "half_open"
+                return True
+            return False
+
+    def record_success(self, provider: str, latency_sec: float) -> None:
+        with self._lock:
+            state = self._state(provider)
+            state.state = "closed"
+            state.consecutive_failures = 0
+            state.successes += 1
+            state.latencies.append(latency_sec)
+
+    def record_failure(self, provider: str, latency_sec: float, error: str = "") -> None:
+        with self._lock:
+            state = self._state(provider)
+            state.consecutive_failures += 1
+            state.failures += 1
+            state.latencies.append(latency_sec)
+            state.last_error = redact_secrets(error)[:200]
+            if state.state == "half_open" or state.consecutive_failures >= self.failure_threshold:
+                state.state = "open"
+                state.opened_at = time.monotonic()
+                self._ensure_probe_thread()
+
+    def latency_quantile(self, provider: str, quantile: float) -> float | None:
+        with self._lock:
+            samples = list(self._state(provider).latencies)
+        return _quantile(samples, quantile)
+
+    def snapshot(self) -> dict[str, dict]:
+        now = time.monotonic()
+        out = {}
+        with self._lock:
+            for provider, state in self._states.items():
+                samples = list(state.latencies)
+                p95 = _quantile(samples, 0.95)
+                out[provider] = {
+                    "state": state.state,
+                    "consecutive_failures": state.consecutive_failures,
+                    "successes": state.successes,
+                    "failures": state.failures,
+                    "open_for_sec": round(now - state.opened_at, 3) if state.state != "closed" else 0.0,
+                    "avg_latency_ms": round(1000 * sum(samples) / len(samples), 2) if samples else None,
+                    "p95_latency_ms": round(1000 * p95, 2) if p95 is not None else None,
+                    "last_error": state.last_error,
+                }
+        return out
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._probe_thread
+        if thread and thread.is_alive():
+            thread.join(timeout=1.5)
+
+    def _state(self, provider: str) -> _ProviderState:
+        state = self._states.get(provider)
+        if state is None:
+            state = _ProviderState()
+            self._states[provider] = state
+        return state
+
+    def _ensure_probe_thread(self) -> None:
+        if self._probe is None or self._stop.is_set():
+            return
+        if self._probe_thread is not None:
+            return
+        self._probe_thread = threading.Thread(target=self._probe_loop, daemon=True)
+        self._probe_thread.start()
+
+    def _probe_loop(self) -> None:
+        tick = min(1.0, max(0.01, self.cooldown_sec / 4))
+        while not self._stop.wait(tick):
+            # Exits (and clears _probe_thread under the lock) once every circuit has closed.
+            now = time.monotonic()
+            with self._lock:
+                open_states = {p: s for p, s in self._states.items() if s.state == "open"}
+                due = [p for p, s in open_states.items() if now - s.opened_at >= self.cooldown_sec]
+                if not open_states:
+                    self._probe_thread = None
+                    return
+
+            for provider in due:
+                try:
+                    healthy = bool(self._probe(provider))
+                except Exception:
+                    healthy = False
+                with self._lock:
+                    state = self._state(provider)
+                    if state.state != "open":
+                        continue
+                    if healthy:
+                        state.state = "closed"
+                        state.consecutive_failures = 0
+                    else:
+                        state.opened_at = time.monotonic()
+
+
+def _quantile(samples: list[float], quantile: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
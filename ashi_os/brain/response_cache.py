@@ -0,0 +1,245 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import math
+from pathlib import Path
+import re
+import sqlite3
+import threading
+import time
+
+from ashi_os.brain.system_prompt import SYSTEM_PROMPT
+from ashi_os.core.config import Settings
+from ashi_os.memory.embeddings import DefaultEmbeddingProvider, EmbeddingProvider
+
+
+_WHITESPACE = re.compile(r"\s+")
+# Prompts from ContextManager end with this block (lowercased by normalize_prompt).
+_REQUEST_MARKER = "[user_request]"
+# Part of every key, so a system prompt change invalidates all cached replies.
+_SYSTEM_PROMPT_HASH = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class _CacheEntry:
+    namespace: str
+    reply: str
+    model: str
+    expires_at: float
+    vector: list[float] | None = None
+    # Namespace plus everything before the user request; near-duplicates only match inside it.
+    bucket: str | None = None
+
+
+class ResponseCache:
+    # Near-duplicate lookups embed only the user request and compare within identical context.
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_sec: float,
+        sqlite_path: Path | None = None,
+        embedder: EmbeddingProvider | None = None,
+        similarity: float = 0.97,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_sec = ttl_sec
+        self.sqlite_path = sqlite_path
+        self.embedder = embedder
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._buckets: dict[str, set[str]] = {}
+        self._stats = {"exact_hits": 0, "near_hits": 0, "misses": 0, "stores": 0}
+        if self.sqlite_path is not None:
+            self._init_table()
+
+    @property
+    def blocking(self) -> bool:
+        return self.sqlite_path is not None or self.embedder is not None
+
+    def get(self, targets: list[tuple[str, str]], prompt: str) -> tuple[str, str] | None:
+        # targets are (backend, model) pairs in preference order; one lookup counts as one hit or miss.
+        normalized = normalize_prompt(prompt)
+        now = time.time()
+        for backend, model in targets:
+            namespace = _namespace(backend, model)
+            key = _key(namespace, normalized)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires_at <= now:
+                    self._discard(key)
+                    entry = None
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self._stats["exact_hits"] += 1
+                    return entry.reply, entry.model
+
+            entry = self._load(key, namespace, now)
+            if entry is not None:
+                with self._lock:
+                    self._remember(key, entry)
+                    self._stats["exact_hits"] += 1
+                return entry.reply, entry.model
+
+        hit = self._near_duplicate([_namespace(backend, model) for backend, model in targets], normalized, now)
+        with self._lock:
+            self._stats["near_hits" if hit is not None else "misses"] += 1
+        return hit
+
+    def put(self, backend: str, model: str, prompt: str, reply: str) -> None:
+        namespace = _namespace(backend, model)
+        normalized = normalize_prompt(prompt)
+        key = _key(namespace, normalized)
+        context, request = _split_request(normalized)
+        vector = self._embed(request)
+        entry = _CacheEntry(
+            namespace=namespace,
+            reply=reply,
+            model=model,
+            expires_at=time.time() + self.ttl_sec,
+            vector=vector,
+            bucket=_key(namespace, context) if vector is not None else None,
+        )
+        with self._lock:
+            self._remember(key, entry)
+            self._stats["stores"] += 1
+        self._save(key, entry)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            entries = len(self._entries)
+        lookups = stats["exact_hits"] + stats["near_hits"] + stats["misses"]
+        hits = stats["exact_hits"] + stats["near_hits"]
+        return {
+            **stats,
+            "entries": entries,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "miss_rate": round(stats["misses"] / lookups, 4) if lookups else 0.0,
+            "persistent": self.sqlite_path is not None,
+            "near_duplicate": self.embedder is not None,
+        }
+
+    def _remember(self, key: str, entry: _CacheEntry) -> None:
+        # Caller holds the lock.
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = entry
+        if entry.bucket is not None:
+            self._buckets.setdefault(entry.bucket, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: str) -> None:
+        # Caller holds the lock.
+        entry = self._entries.pop(key)
+        if entry.bucket is None:
+            return
+        keys = self._buckets.get(entry.bucket)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._buckets[entry.bucket]
+
+    def _near_duplicate(self, namespaces: list[str], normalized: str, now: float) -> tuple[str, str] | None:
+        if self.embedder is None:
+            return None
+        context, request = _split_request(normalized)
+        vector = self._embed(request)
+        if vector is None:
+            return None
+
+        best_key, best_score = None, self.similarity
+        with self._lock:
+            for key in [key for namespace in namespaces for key in self._buckets.get(_key(namespace, context), ())]:
+                entry = self._entries[key]
+                if entry.expires_at <= now:
+                    continue
+                score = sum(a * b for a, b in zip(vector, entry.vector))
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            entry = self._entries[best_key]
+            return entry.reply, entry.model
+
+    def _embed(self, text: str) -> list[float] | None:
+        if self.embedder is None:
+            return None
+        vectors = self.embedder.embed([text])
+        if not vectors:
+            return None
+        norm = math.sqrt(sum(x * x for x in vectors[0])) or 1.0
+        return [x / norm for x in vectors[0]]
+
+    def _connect(self):
+        return sqlite3.connect(str(self.sqlite_path))
+
+    def _init_table(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_response_cache (
+                    key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    reply TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+
+    def _load(self, key: str, namespace: str, now: float) -> _CacheEntry | None:
+        if self.sqlite_path is None:
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT reply, model, expires_at FROM llm_response_cache WHERE key=? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        if row is None:
+            return None
+        return _CacheEntry(namespace=namespace, reply=row[0], model=row[1], expires_at=row[2])
+
+    def _save(self, key: str, entry: _CacheEntry) -> None:
+        if self.sqlite_path is None:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, namespace, reply, model, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, entry.namespace, entry.reply, entry.model, entry.expires_at),
+            )
+            conn.commit()
+
+
+def build_response_cache(settings: Settings) -> ResponseCache | None:
+    if not settings.llm_cache_enabled:
+        return None
+    return ResponseCache(
+        max_entries=settings.llm_cache_max_entries,
+        ttl_sec=settings.llm_cache_ttl_sec,
+        sqlite_path=settings.sqlite_path if settings.llm_cache_persist else None,
+        embedder=DefaultEmbeddingProvider() if settings.llm_cache_near_duplicate else None,
+        similarity=settings.llm_cache_similarity,
+    )
+
+
+def normalize_prompt(prompt: str) -> str:
+    return _WHITESPACE.sub(" ", prompt).strip().lower()
+
+
+def _split_request(normalized_prompt: str) -> tuple[str, str]:
+    # (context, request); a prompt without the marker is all request.
+    context, marker, request = normalized_prompt.rpartition(_REQUEST_MARKER)
+    return (context, request.strip()) if marker else ("", normalized_prompt)
+
+
+def _namespace(backend: str, model: str) -> str:
+    return f"{backend}:{model}:{_SYSTEM_PROMPT_HASH}"
+
+
+def _key(namespace: str, normalized_prompt: str) -> str:
+    return hashlib.sha256(f"{namespace}\n{normalized_prompt}".encode("utf-8")).hexdigest()
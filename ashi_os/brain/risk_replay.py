@@ -0,0 +1,205 @@
+import argparse
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+import json
+import os
+from pathlib import Path
+
+from ashi_os.brain.planning import RiskEvaluator, StrategicPlanner
+from ashi_os.core.policy import default_policy, destructive
+
+# Audit events that carry a scored message: event -> (source, text field). Chat messages go
+# through the destructive gate before risk scoring, agent objectives do not.
+REPLAY_EVENTS = {
+    "chat.completed": ("chat", "user_message"),
+    "chat.confirmation_required": ("chat", "user_message"),
+    "blocked.destructive": ("chat", "message"),
+    "agents.completed": ("agents", "objective"),
+    "agents.confirmation_required": ("agents", "objective"),
+}
+
+
+@dataclass(frozen=True)
+class ReplayRecord:
+    event: str
+    source: str
+    text: str
+    # Level recorded at the time; a destructive block is always high.
+    recorded: str | None
+
+
+@dataclass(frozen=True)
+class ReplayConfig:
+    high_score: int = 4
+    medium_score: int = 2
+    examples: int = 20
+
+
+def iter_records(lines: Iterable[str], skipped: Counter | None = None) -> Iterator[ReplayRecord]:
+    # One line at a time, so memory does not grow with the size of the log.
+    for line in lines:
+        try:
+            item = json.loads(line)
+            spec = REPLAY_EVENTS.get(item["event"])
+            payload = item["payload"]
+        except (ValueError, KeyError, TypeError):
+            if skipped is not None and line.strip():
+                skipped["malformed"] += 1
+            continue
+        if spec is None:
+            continue
+        source, field = spec
+        text = payload.get(field) if isinstance(payload, dict) else None
+        if not text:
+            if skipped is not None:
+                skipped["missing_text"] += 1
+            continue
+        recorded = "high" if item["event"] == "blocked.destructive" else payload.get("risk_level")
+        yield ReplayRecord(item["event"], source, str(text), recorded)
+
+
+def score_chunk(lines: list[str], config: ReplayConfig) -> dict:
+    # Runs in a worker process, parsing as well as scoring, so the parent only reads lines.
+    # Returns counters plus a few examples, so what comes back is small however large the
+    # chunk was. A message seen twice in a chunk (a gate and its confirmed replay) is scored once.
+    planner = StrategicPlanner()
+    evaluator = RiskEvaluator(high_score=config.high_score, medium_score=config.medium_score)
+    policy = default_policy()
+    result = _empty()
+    scored: dict[tuple[str, str], tuple[str, int, bool]] = {}
+    for record in iter_records(lines, result["skipped"]):
+        key = (record.source, record.text)
+        if key not in scored:
+            hits = policy.scan(record.text)
+            risk = evaluator.evaluate(record.text, planner.build_plan(record.text), hits)
+            blocked = record.source == "chat" and destructive(hits)
+            scored[key] = ("high" if blocked else risk.level, risk.score, blocked)
+        level, score, blocked = scored[key]
+        result["records"] += 1
+        result["destructive"] += int(blocked)
+        result["events"][record.event] += 1
+        result["levels"][level] += 1
+        result["scores"][score] += 1
+        if record.recorded is None:
+            continue
+        result["recorded_levels"][record.recorded] += 1
+        if record.recorded == level:
+            result["unchanged"] += 1
+            continue
+        result["changed"] += 1
+        result["transitions"][f"{record.recorded}->{level}"] += 1
+        if len(result["examples"]) < config.examples:
+            result["examples"].append(
+                {
+                    "event": record.event,
+                    "recorded": record.recorded,
+                    "replayed": level,
+                    "score": score,
+                    "text": record.text[:200],
+                }
+            )
+    return result
+
+
+def replay(
+    path: Path,
+    workers: int | None = None,
+    chunk_size: int = 2000,
+    config: ReplayConfig | None = None,
+) -> dict:
+    # Raw lines are scored in chunks on a process pool with at most two chunks per worker in
+    # flight, so reading never runs ahead of scoring by more than that and memory stays flat
+    # however long the log is. workers=0 scores in this process.
+    config = config or ReplayConfig()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    chunk_size = max(1, chunk_size)
+    total = _empty()
+    lines = 0
+
+    with path.open("r", encoding="utf-8", errors="replace") as handle:
+        for chunk, result in _score_chunks(iter(lambda: list(islice(handle, chunk_size)), []), workers, config):
+            lines += chunk
+            _merge(total, result, config.examples)
+
+    compared = total["changed"] + total["unchanged"]
+    return {
+        "path": str(path),
+        "lines": lines,
+        "skipped": dict(total["skipped"]),
+        "thresholds": {"high_score": config.high_score, "medium_score": config.medium_score},
+        "records": total["records"],
+        "events": dict(total["events"]),
+        "levels": dict(total["levels"]),
+        "recorded_levels": dict(total["recorded_levels"]),
+        "scores": {str(score): count for score, count in sorted(total["scores"].items())},
+        "destructive": total["destructive"],
+        "compared": compared,
+        "changed": total["changed"],
+        "change_rate": round(total["changed"] / compared, 4) if compared else 0.0,
+        "transitions": dict(total["transitions"].most_common()),
+        "examples": total["examples"],
+    }
+
+
+def _score_chunks(chunks: Iterator[list[str]], workers: int, config: ReplayConfig) -> Iterator[tuple[int, dict]]:
+    # Yields (line count, result) per chunk, in completion order.
+    if workers <= 0:
+        for chunk in chunks:
+            yield len(chunk), score_chunk(chunk, config)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: dict[Future, int] = {}
+        for chunk in chunks:
+            pending[pool.submit(score_chunk, chunk, config)] = len(chunk)
+            if len(pending) >= workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        for future in wait(pending).done:
+            yield pending[future], future.result()
+
+
+def _empty() -> dict:
+    return {
+        "records": 0,
+        "destructive": 0,
+        "skipped": Counter(),
+        "changed": 0,
+        "unchanged": 0,
+        "events": Counter(),
+        "levels": Counter(),
+        "recorded_levels": Counter(),
+        "scores": Counter(),
+        "transitions": Counter(),
+        "examples": [],
+    }
+
+
+def _merge(total: dict, part: dict, examples: int) -> None:
+    for key, value in part.items():
+        if key == "examples":
+            total[key].extend(value[: max(0, examples - len(total[key]))])
+        else:
+            total[key] += value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-score audited chat messages and agent objectives offline.")
+    parser.add_argument("path", nargs="?", default="data/logs/audit.jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes; 0 scores inline.")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--high-score", type=int, default=ReplayConfig.high_score)
+    parser.add_argument("--medium-score", type=int, default=ReplayConfig.medium_score)
+    parser.add_argument("--examples", type=int, default=ReplayConfig.examples)
+    args = parser.parse_args()
+
+    config = ReplayConfig(high_score=args.high_score, medium_score=args.medium_score, examples=args.examples)
+    results = replay(Path(args.path), workers=args.workers, chunk_size=args.chunk_size, config=config)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
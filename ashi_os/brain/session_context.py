@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import threading
+
+from ashi_os.brain.token_budget import estimate_tokens
+
+
+@dataclass(frozen=True)
+class SessionPrompt:
+    session_id: str
+    continuation: str
+    memory_fingerprint: str
+    turns: int
+    last_reply_digest: str = ""
+
+
+@dataclass
+class _SessionState:
+    model: str
+    context: list[int]
+    turns: int
+    memory_fingerprint: str
+    reply_digest: str
+
+
+def reply_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class OllamaContextStore:
+    # A stored context is only reused by the model that produced it, when it ends with exactly
+    # the reply the session recorded and was built with the same recalled memory. Anything else (a cache hit, a fallback or
+    # hedge-winner reply, new memories, a context that would overflow) forces a full prompt.
+    def __init__(self, max_sessions: int, max_tokens: int, reply_reserve_tokens: int) -> None:
+        self.max_sessions = max(1, max_sessions)
+        self.max_tokens = max_tokens
+        self.reply_reserve_tokens = reply_reserve_tokens
+        self._lock = threading.Lock()
+        self._sessions: OrderedDict[str, _SessionState] = OrderedDict()
+        self._stats = {"reused": 0, "resets": 0, "invalidated": 0}
+
+    def lookup(self, session: SessionPrompt, model: str) -> list[int] | None:
+        with self._lock:
+            state = self._sessions.get(session.session_id)
+            if state is None:
+                self._stats["resets"] += 1
+                return None
+            needed = len(state.context) + estimate_tokens(session.continuation) + self.reply_reserve_tokens
+            if (
+                state.model != model
+                or state.turns != session.turns
+                or state.reply_digest != session.last_reply_digest
+                or state.memory_fingerprint != session.memory_fingerprint
+                or needed > self.max_tokens
+            ):
+                del self._sessions[session.session_id]
+                self._stats["invalidated"] += 1
+                self._stats["resets"] += 1
+                return None
+            self._sessions.move_to_end(session.session_id)
+            self._stats["reused"] += 1
+            return list(state.context)
+
+    def store(self, session: SessionPrompt, model: str, context: list[int] | None, reply: str) -> None:
+        with self._lock:
+            if not context:
+                self._sessions.pop(session.session_id, None)
+                return
+            # The reply becomes the next user/assistant pair in history.
+            self._sessions[session.session_id] = _SessionState(
+                model=model,
+                context=list(context),
+                turns=session.turns + 2,
+                memory_fingerprint=session.memory_fingerprint,
+                reply_digest=reply_digest(reply),
+            )
+            self._sessions.move_to_end(session.session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def forget(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"enabled": True, "sessions": len(self._sessions), **self._stats}
@@ -0,0 +1,100 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+import threading
+
+
+@dataclass
+class _Entry:
+    held: bool = False
+    users: int = 0
+    # Sync waiters are threading.Events; async waiters are (loop, future) pairs.
+    waiters: deque = field(default_factory=deque)
+
+
+class SessionLocks:
+    # One FIFO lock per session in flight, shared by sync and async callers.
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+
+    @contextmanager
+    def hold(self, session_id: str) -> Iterator[None]:
+        entry, event = self._acquire(session_id, lambda: threading.Event())
+        if event is not None:
+            event.wait()
+        try:
+            yield
+        finally:
+            self._release(session_id, entry)
+
+    @asynccontextmanager
+    async def ahold(self, session_id: str) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        entry, waiter = self._acquire(session_id, lambda: (loop, loop.create_future()))
+        if waiter is not None:
+            try:
+                await waiter[1]
+            except asyncio.CancelledError:
+                with self._guard:
+                    queued = waiter in entry.waiters
+                    if queued:
+                        entry.waiters.remove(waiter)
+                        self._leave(session_id, entry)
+                if not queued:
+                    # The lock was already handed to us; pass it on.
+                    self._release(session_id, entry)
+                raise
+        try:
+            yield
+        finally:
+            self._release(session_id, entry)
+
+    def active(self) -> int:
+        with self._guard:
+            return len(self._entries)
+
+    def _acquire(self, session_id: str, make_waiter) -> tuple[_Entry, object | None]:
+        with self._guard:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                entry = _Entry()
+                self._entries[session_id] = entry
+            entry.users += 1
+            if not entry.held:
+                entry.held = True
+                return entry, None
+            waiter = make_waiter()
+            entry.waiters.append(waiter)
+            return entry, waiter
+
+    def _release(self, session_id: str, entry: _Entry) -> None:
+        with self._guard:
+            self._leave(session_id, entry)
+            if not entry.waiters:
+                entry.held = False
+                return
+            waiter = entry.waiters.popleft()
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+        else:
+            loop, future = waiter
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # The waiter's event loop is closed; nobody will take the lock there.
+                self._release(session_id, entry)
+
+    def _leave(self, session_id: str, entry: _Entry) -> None:
+        # Caller holds the guard.
+        entry.users -= 1
+        if entry.users == 0:
+            self._entries.pop(session_id, None)
+
+
+def _wake(future: asyncio.Future) -> None:
+    # A cancelled waiter found itself dequeued and passes the lock on by itself.
+    if not future.done():
+        future.set_result(None)
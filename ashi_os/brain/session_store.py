@@ -0,0 +1,240 @@
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+from ashi_os.core.config import Settings
+
+
+@dataclass
+class _HotSession:
+    turns: list[dict[str, str]]
+    # Sequence number of turns[0]; it only grows as turns are folded or capped away.
+    first_seq: int
+    summary: str
+    touched: float
+    # session_meta.version this copy reflects; None until it has been read from the database.
+    version: int | None = None
+    # Guards this session's turns and its database I/O; other sessions are not held up.
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class SessionStore:
+    # LRU hot tier with optional SQLite write-through.
+    def __init__(
+        self,
+        sqlite_path: Path | None = None,
+        max_sessions: int = 1024,
+        max_turns: int = 200,
+        idle_ttl_sec: float = 1800.0,
+    ) -> None:
+        self.sqlite_path = sqlite_path
+        self.max_sessions = max(1, max_sessions)
+        # Turns are stored in user/assistant pairs, so the cap is kept even.
+        self.max_turns = max(2, max_turns - max_turns % 2)
+        self.idle_ttl_sec = idle_ttl_sec
+        self._lock = threading.Lock()
+        self._hot: OrderedDict[str, _HotSession] = OrderedDict()
+        self._stats = {"loads": 0, "evicted": 0, "idle_evicted": 0, "capped_turns": 0}
+        self._local = threading.local()
+        if self.sqlite_path is not None:
+            self.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+            self._init_table()
+
+    def history(self, session_id: str) -> list[dict[str, str]]:
+        return self.snapshot(session_id)[1]
+
+    def snapshot(self, session_id: str) -> tuple[int, list[dict[str, str]]]:
+        state = self._session(session_id)
+        with state.lock:
+            self._refresh(session_id, state)
+            return state.first_seq, list(state.turns)
+
+    def summary(self, session_id: str) -> str:
+        state = self._session(session_id)
+        with state.lock:
+            self._refresh(session_id, state)
+            return state.summary
+
+    def extend(self, session_id: str, turns: list[dict[str, str]]) -> int:
+        state = self._session(session_id)
+        with state.lock:
+            self._refresh(session_id, state)
+            next_seq = state.first_seq + len(state.turns)
+            state.turns.extend(turns)
+            dropped = max(0, len(state.turns) - self.max_turns)
+            if dropped:
+                del state.turns[:dropped]
+                state.first_seq += dropped
+                self._count("capped_turns", dropped)
+            if self.sqlite_path is None:
+                return len(state.turns)
+            # Written under the session lock so a concurrent access never sees the hot copy
+            # ahead of the database and mistakes it for another worker's change.
+            rows = [(session_id, next_seq + i, turn["role"], turn["content"]) for i, turn in enumerate(turns)]
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO session_turns (session_id, seq, role, content) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._save_meta(conn, session_id, state, None)
+            return len(state.turns)
+
+    def fold(self, session_id: str, end_seq: int, summary: str) -> int:
+        # Replaces every turn before end_seq with the summary. Turns appended meanwhile stay.
+        state = self._session(session_id)
+        with state.lock:
+            self._refresh(session_id, state)
+            folded = max(0, min(end_seq, state.first_seq + len(state.turns)) - state.first_seq)
+            del state.turns[:folded]
+            state.first_seq += folded
+            state.summary = summary
+            if self.sqlite_path is not None:
+                with self._connect() as conn:
+                    self._save_meta(conn, session_id, state, summary)
+        return folded
+
+    def forget(self, session_id: str) -> None:
+        with self._lock:
+            state = self._hot.pop(session_id, None)
+        if self.sqlite_path is None:
+            return
+        with state.lock if state is not None else nullcontext(), self._connect() as conn:
+            conn.execute("DELETE FROM session_turns WHERE session_id=?", (session_id,))
+            conn.execute("DELETE FROM session_meta WHERE session_id=?", (session_id,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hot_sessions": len(self._hot),
+                "max_sessions": self.max_sessions,
+                "persistent": self.sqlite_path is not None,
+                **self._stats,
+            }
+
+    def _session(self, session_id: str) -> _HotSession:
+        # Finds or creates the hot entry under the store lock; no I/O happens here.
+        now = time.monotonic()
+        with self._lock:
+            state = self._hot.get(session_id)
+            if state is None:
+                # Nothing to load without a database, so a new entry is already current.
+                version = 0 if self.sqlite_path is None else None
+                state = _HotSession(turns=[], first_seq=0, summary="", touched=now, version=version)
+                self._hot[session_id] = state
+            state.touched = now
+            self._hot.move_to_end(session_id)
+            self._evict(now)
+        return state
+
+    def _evict(self, now: float) -> None:
+        # Caller holds the store lock. Least recently used first, so idle sessions are always
+        # at the front. A holder of an evicted entry still writes through to the database.
+        while len(self._hot) > self.max_sessions:
+            self._hot.popitem(last=False)
+            self._stats["evicted"] += 1
+        while self._hot:
+            oldest = next(iter(self._hot.values()))
+            if now - oldest.touched <= self.idle_ttl_sec:
+                break
+            self._hot.popitem(last=False)
+            self._stats["idle_evicted"] += 1
+
+    def _refresh(self, session_id: str, state: _HotSession) -> None:
+        # Caller holds the session lock. Reloads the entry if it was never read or another
+        # worker has written the session since.
+        if self.sqlite_path is None:
+            return
+        conn = self._connect()
+        rows = conn.execute("SELECT version FROM session_meta WHERE session_id=?", (session_id,)).fetchall()
+        version = rows[0][0] if rows else 0
+        if version == state.version:
+            return
+        meta = conn.execute(
+            "SELECT first_seq, summary, version FROM session_meta WHERE session_id=?", (session_id,)
+        ).fetchall()
+        first_seq, summary, version = meta[0] if meta else (0, "", 0)
+        rows = conn.execute(
+            "SELECT role, content FROM session_turns WHERE session_id=? AND seq >= ? ORDER BY seq",
+            (session_id, first_seq),
+        ).fetchall()
+        if meta:
+            self._count("loads", 1)
+        state.turns = [{"role": role, "content": content} for role, content in rows]
+        state.first_seq = first_seq
+        state.summary = summary
+        state.version = version
+
+    def _count(self, key: str, amount: int) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _save_meta(self, conn: sqlite3.Connection, session_id: str, state: _HotSession, summary: str | None) -> None:
+        # Another worker may have moved first_seq further already; it never goes back. The
+        # write lock is held until commit, so a version other than ours + 1 means another worker
+        # wrote in between and the hot copy is reloaded on its next access.
+        conn.execute(
+            """
+            INSERT INTO session_meta (session_id, first_seq, summary, updated_at, version) VALUES (?, ?, ?, ?, 1)
+            ON CONFLICT(session_id) DO UPDATE SET
+                first_seq = MAX(first_seq, excluded.first_seq),
+                summary = COALESCE(?, summary),
+                updated_at = excluded.updated_at,
+                version = version + 1
+            """,
+            (session_id, state.first_seq, summary or "", time.time(), summary),
+        )
+        conn.execute("DELETE FROM session_turns WHERE session_id=? AND seq < ?", (session_id, state.first_seq))
+        version = conn.execute("SELECT version FROM session_meta WHERE session_id=?", (session_id,)).fetchall()[0][0]
+        state.version = version if state.version is not None and version == state.version + 1 else None
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, reused across operations. Used as a context manager it
+        # commits, or rolls back on error, without closing.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.sqlite_path))
+            self._local.conn = conn
+        return conn
+
+    def _init_table(self) -> None:
+        with self._connect() as conn:
+            # WAL lets several uvicorn workers read while one writes.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS session_turns (
+                    session_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    PRIMARY KEY (session_id, seq)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS session_meta (
+                    session_id TEXT PRIMARY KEY,
+                    first_seq INTEGER NOT NULL,
+                    summary TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(session_meta)").fetchall()}
+            if "version" not in columns:
+                conn.execute("ALTER TABLE session_meta ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+
+def build_session_store(settings: Settings) -> SessionStore:
+    return SessionStore(
+        sqlite_path=settings.sqlite_path if settings.session_persist else None,
+        max_sessions=settings.session_hot_max,
+        max_turns=settings.session_max_turns,
+        idle_ttl_sec=settings.session_idle_ttl_sec,
+    )
@@ -0,0 +1,107 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+
+from ashi_os.brain.llm_router import LLMRouter, RouteSignals
+from ashi_os.brain.session_store import SessionStore
+from ashi_os.brain.token_budget import TokenCounter
+from ashi_os.core.write_behind import WriteBehindQueue
+from ashi_os.logging.audit_log import AuditLogger
+
+_INSTRUCTION = (
+    "Update the running summary of this conversation with the new turns. Keep facts, names, decisions, "
+    "open tasks and user preferences; drop greetings and filler. Reply with the summary only, as short bullet points."
+)
+
+
+class SessionSummarizer:
+    # Folds the oldest turns of a long session into a running summary on a background worker,
+    # after the reply has gone out. The session store swaps the folded turns for the summary
+    # in one step, so a turn is never in neither place.
+    def __init__(
+        self,
+        router: LLMRouter,
+        audit: AuditLogger | WriteBehindQueue,
+        keep_turns: int,
+        trigger_turns: int,
+        max_tokens: int,
+        counter: TokenCounter | None = None,
+    ) -> None:
+        self.router = router
+        self.audit = audit
+        self.keep_turns = max(2, keep_turns)
+        self.trigger_turns = max(self.keep_turns + 2, trigger_turns)
+        self.max_tokens = max(32, max_tokens)
+        self.counter = counter or TokenCounter("estimate")
+        self._lock = threading.Lock()
+        self._pending: dict[str, Future] = {}
+        self._pool: ThreadPoolExecutor | None = None
+        self._stats = {"runs": 0, "failures": 0, "folded_turns": 0}
+
+    def maybe_schedule(self, session_id: str, sessions: SessionStore, turns: int) -> Future | None:
+        with self._lock:
+            if session_id in self._pending or turns < self.trigger_turns:
+                return None
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summarizer")
+            future = self._pool.submit(self._fold, session_id, sessions)
+            self._pending[session_id] = future
+            return future
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": True,
+                "pending": len(self._pending),
+                **self._stats,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            pool = self._pool
+            self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _fold(self, session_id: str, sessions: SessionStore) -> None:
+        try:
+            first_seq, history = sessions.snapshot(session_id)
+            # Only whole user/assistant pairs are folded.
+            count = (len(history) - self.keep_turns) // 2 * 2
+            if count <= 0:
+                return
+            turns = history[:count]
+            previous = sessions.summary(session_id)
+            prompt = "\n".join(
+                [
+                    "[CONVERSATION_SUMMARY]",
+                    previous or "- none",
+                    "[NEW_TURNS]",
+                    *[f"{item['role']}: {item['content']}" for item in turns],
+                    "[INSTRUCTION]",
+                    _INSTRUCTION,
+                ]
+            )
+            signals = RouteSignals(plan_steps=1, risk_level="low", prompt_tokens=self.counter.count(prompt))
+            reply, provider, model = self.router.generate(prompt, signals=signals)
+            summary = reply.strip()
+            if provider == "none" or not summary:
+                # No model answered: keep the raw turns rather than lose them.
+                with self._lock:
+                    self._stats["failures"] += 1
+                return
+            if self.counter.count(summary) > self.max_tokens:
+                summary = self.counter.truncate(summary, self.max_tokens)
+            folded = sessions.fold(session_id, first_seq + count, summary)
+            with self._lock:
+                self._stats["runs"] += 1
+                self._stats["folded_turns"] += folded
+            self.audit.write(
+                "chat.summarized",
+                {"session_id": session_id, "folded_turns": folded, "provider": provider, "model": model},
+            )
+        except Exception:
+            with self._lock:
+                self._stats["failures"] += 1
+        finally:
+            with self._lock:
+                self._pending.pop(session_id, None)
@@ -0,0 +1,76 @@
+import math
+import re
+import threading
+from typing import Any
+
+# Estimator calibrated against cl100k-style BPE on mixed English/code text: short words are
+# one token, longer ones split roughly every four characters, punctuation stands alone.
+_PIECES = re.compile(r"\w+|[^\w\s]")
+_TRUNCATION_MARK = " …[truncated]… "
+
+_encoding_lock = threading.Lock()
+_encoding: Any = None
+_encoding_loaded = False
+
+
+def _tiktoken_encoding() -> Any:
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _PIECES.findall(text))
+
+
+class TokenCounter:
+    def __init__(self, mode: str = "auto") -> None:
+        mode = mode.strip().lower()
+        self._encoding = _tiktoken_encoding() if mode in {"auto", "tiktoken"} else None
+        self.name = "tiktoken" if self._encoding is not None else "estimate"
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return estimate_tokens(text)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        # Keeps the head and tail of the text, which is where objectives and the actual
+        # request sit; the middle is the cheapest part to lose.
+        if self.count(text) <= max_tokens:
+            return text
+        if max_tokens <= self.count(_TRUNCATION_MARK):
+            return self._prefix(text, max_tokens)
+        low, high = 0, len(text) // 2
+        while low < high:
+            keep = (low + high + 1) // 2
+            if self.count(self._splice(text, keep)) <= max_tokens:
+                low = keep
+            else:
+                high = keep - 1
+        return self._splice(text, low) if low else self._prefix(text, max_tokens)
+
+    def _prefix(self, text: str, max_tokens: int) -> str:
+        low, high = 0, len(text)
+        while low < high:
+            keep = (low + high + 1) // 2
+            if self.count(text[:keep]) <= max_tokens:
+                low = keep
+            else:
+                high = keep - 1
+        return text[:low]
+
+    @staticmethod
+    def _splice(text: str, keep: int) -> str:
+        return text[:keep] + _TRUNCATION_MARK + text[len(text) - keep :]
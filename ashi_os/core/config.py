@@ -31,6 +31,50 @@ class Settings:
     mic_chunk_seconds: float
     mic_channels: int
     mic_device_index: int | None
+    ollama_host: str = ""
+    llm_pool_size: int = 8
+    llm_keepalive_sec: float = 60.0
+    llm_timeout_sec: float = 120.0
+    llm_breaker_failures: int = 3
+    llm_breaker_cooldown_sec: float = 30.0
+    llm_hedge_mode: str = "off"
+    llm_hedge_delay_ms: float = 1500.0
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 512
+    llm_cache_ttl_sec: float = 600.0
+    llm_cache_persist: bool = False
+    llm_cache_near_duplicate: bool = False
+    llm_cache_similarity: float = 0.97
+    llm_coalesce_enabled: bool = True
+    chat_batch_concurrency: int = 8
+    context_tokenizer: str = "auto"
+    context_reply_reserve_tokens: int = 1024
+    ollama_keep_alive: str = "30m"
+    ollama_warmup: bool = True
+    openai_base_url: str = ""
+    ollama_context_reuse: bool = True
+    ollama_context_sessions: int = 256
+    ollama_fast_model: str = ""
+    openai_fast_model: str = ""
+    llm_fast_max_steps: int = 1
+    llm_fast_max_prompt_tokens: int = 1500
+    chat_fast_path: bool = True
+    chat_summarize: bool = True
+    chat_summary_keep_turns: int = 8
+    chat_summary_trigger_turns: int = 16
+    chat_summary_max_tokens: int = 400
+    session_persist: bool = True
+    session_hot_max: int = 1024
+    session_max_turns: int = 200
+    session_idle_ttl_sec: float = 1800.0
+    write_behind_enabled: bool = True
+    write_behind_max_batch: int = 64
+    write_behind_max_pending: int = 10000
+    confirmation_persist: bool = True
+    confirmation_ttl_sec: float = 600.0
+    confirmation_max_pending: int = 10000
+    memory_batch_size: int = 32
+    memory_flush_interval_sec: float = 0.5
 
 
 def get_settings() -> Settings:
@@ -68,4 +112,48 @@ def get_settings() -> Settings:
         mic_chunk_seconds=float(os.getenv("MIC_CHUNK_SECONDS", "2.0")),
         mic_channels=int(os.getenv("MIC_CHANNELS", "1")),
         mic_device_index=int(os.getenv("MIC_DEVICE_INDEX")) if os.getenv("MIC_DEVICE_INDEX") else None,
+        ollama_host=os.getenv("OLLAMA_HOST", "").strip(),
+        llm_pool_size=int(os.getenv("LLM_POOL_SIZE", "8")),
+        llm_keepalive_sec=float(os.getenv("LLM_KEEPALIVE_SEC", "60")),
+        llm_timeout_sec=float(os.getenv("LLM_TIMEOUT_SEC", "120")),
+        llm_breaker_failures=int(os.getenv("LLM_BREAKER_FAILURES", "3")),
+        llm_breaker_cooldown_sec=float(os.getenv("LLM_BREAKER_COOLDOWN_SEC", "30")),
+        llm_hedge_mode=os.getenv("LLM_HEDGE_MODE", "off").strip().lower() or "off",
+        llm_hedge_delay_ms=float(os.getenv("LLM_HEDGE_DELAY_MS", "1500")),
+        llm_cache_enabled=os.getenv("LLM_CACHE_ENABLED", "true").strip().lower() == "true",
+        llm_cache_max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+        llm_cache_ttl_sec=float(os.getenv("LLM_CACHE_TTL_SEC", "600")),
+        llm_cache_persist=os.getenv("LLM_CACHE_PERSIST", "false").strip().lower() == "true",
+        llm_cache_near_duplicate=os.getenv("LLM_CACHE_NEAR_DUPLICATE", "false").strip().lower() == "true",
+        llm_cache_similarity=float(os.getenv("LLM_CACHE_SIMILARITY", "0.97")),
+        llm_coalesce_enabled=os.getenv("LLM_COALESCE_ENABLED", "true").strip().lower() == "true",
+        chat_batch_concurrency=int(os.getenv("CHAT_BATCH_CONCURRENCY", "8")),
+        context_tokenizer=os.getenv("CONTEXT_TOKENIZER", "auto"),
+        context_reply_reserve_tokens=int(os.getenv("CONTEXT_REPLY_RESERVE_TOKENS", "1024")),
+        ollama_keep_alive=os.getenv("OLLAMA_KEEP_ALIVE", "30m"),
+        ollama_warmup=os.getenv("OLLAMA_WARMUP", "true").strip().lower() == "true",
+        openai_base_url=os.getenv("OPENAI_BASE_URL", ""),
+        ollama_context_reuse=os.getenv("OLLAMA_CONTEXT_REUSE", "true").strip().lower() == "true",
+        ollama_context_sessions=int(os.getenv("OLLAMA_CONTEXT_SESSIONS", "256")),
+        ollama_fast_model=os.getenv("OLLAMA_FAST_MODEL", ""),
+        openai_fast_model=os.getenv("OPENAI_FAST_MODEL", ""),
+        llm_fast_max_steps=int(os.getenv("LLM_FAST_MAX_STEPS", "1")),
+        llm_fast_max_prompt_tokens=int(os.getenv("LLM_FAST_MAX_PROMPT_TOKENS", "1500")),
+        chat_fast_path=os.getenv("CHAT_FAST_PATH", "true").strip().lower() == "true",
+        chat_summarize=os.getenv("CHAT_SUMMARIZE", "true").strip().lower() == "true",
+        chat_summary_keep_turns=int(os.getenv("CHAT_SUMMARY_KEEP_TURNS", "8")),
+        chat_summary_trigger_turns=int(os.getenv("CHAT_SUMMARY_TRIGGER_TURNS", "16")),
+        chat_summary_max_tokens=int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "400")),
+        session_persist=os.getenv("SESSION_PERSIST", "true").strip().lower() == "true",
+        session_hot_max=int(os.getenv("SESSION_HOT_MAX", "1024")),
+        session_max_turns=int(os.getenv("SESSION_MAX_TURNS", "200")),
+        session_idle_ttl_sec=float(os.getenv("SESSION_IDLE_TTL_SEC", "1800")),
+        write_behind_enabled=os.getenv("WRITE_BEHIND_ENABLED", "true").strip().lower() == "true",
+        write_behind_max_batch=int(os.getenv("WRITE_BEHIND_MAX_BATCH", "64")),
+        write_behind_max_pending=int(os.getenv("WRITE_BEHIND_MAX_PENDING", "10000")),
+        confirmation_persist=os.getenv("CONFIRMATION_PERSIST", "true").strip().lower() == "true",
+        confirmation_ttl_sec=float(os.getenv("CONFIRMATION_TTL_SEC", "600")),
+        confirmation_max_pending=int(os.getenv("CONFIRMATION_MAX_PENDING", "10000")),
+        memory_batch_size=int(os.getenv("MEMORY_BATCH_SIZE", "32")),
+        memory_flush_interval_sec=float(os.getenv("MEMORY_FLUSH_INTERVAL_SEC", "0.5")),
     )
@@ -6,6 +6,11 @@ class ChatRequest(BaseModel):
     user_message: str = Field(min_length=1)
 
 
+class ChatBatchRequest(BaseModel):
+    items: list[ChatRequest] = Field(min_length=1)
+    concurrency: int | None = Field(default=None, ge=1, le=256)
+
+
 class ChatResponse(BaseModel):
     session_id: str
     reply: str
@@ -23,6 +28,10 @@ class MemoryAddRequest(BaseModel):
     metadata: dict = Field(default_factory=dict)
 
 
+class MemoryAddBatchRequest(BaseModel):
+    items: list[MemoryAddRequest] = Field(min_length=1, max_length=1000)
+
+
 class MemorySearchRequest(BaseModel):
     session_id: str = Field(min_length=1)
     query: str = Field(min_length=1)
@@ -0,0 +1,108 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+
+HIGH_RISK_TERMS = frozenset(
+    {
+        "delete",
+        "rm -rf",
+        "shutdown",
+        "reboot",
+        "drop table",
+        "format disk",
+        "erase",
+        "credentials",
+        "password",
+        "api key",
+        "bank",
+        "transfer",
+        "payment",
+    }
+)
+MEDIUM_RISK_TERMS = frozenset(
+    {
+        "install",
+        "sudo",
+        "email",
+        "send mail",
+        "automation",
+        "schedule",
+        "run command",
+        "execute",
+        "open site",
+        "signup",
+        "create key",
+    }
+)
+DESTRUCTIVE_TERMS = frozenset({"rm -rf", "shutdown", "reboot", "mkfs", "dd if="})
+BLOCKED_TOKENS = frozenset({"rm", "shutdown", "reboot", "mkfs", "dd", "sudo"})
+
+# Categories, in the order hits are reported.
+RISK_HIGH = "risk.high"
+RISK_MEDIUM = "risk.medium"
+DESTRUCTIVE = "destructive"
+BLOCKED_TOKEN = "blocked_token"
+_CATEGORY_ORDER = {RISK_HIGH: 0, RISK_MEDIUM: 1, DESTRUCTIVE: 2, BLOCKED_TOKEN: 3}
+
+
+@dataclass(frozen=True)
+class PolicyRule:
+    term: str
+    category: str
+    weight: int
+    # Token rules match a whole shell token exactly (case-sensitive); the rest match a
+    # case-insensitive substring anywhere in the text.
+    token: bool = False
+
+
+@dataclass(frozen=True)
+class PolicyHit:
+    term: str
+    category: str
+    weight: int
+
+
+class PolicyEngine:
+    # Each distinct term is searched for once per scan, however many rules share it.
+    def __init__(self, rules: Iterable[PolicyRule]) -> None:
+        self.rules = tuple(rules)
+        ordered = sorted(
+            self.rules,
+            key=lambda rule: (_CATEGORY_ORDER.get(rule.category, len(_CATEGORY_ORDER)), rule.category, rule.term),
+        )
+        self._table = tuple(
+            (rule.term.lower(), PolicyHit(rule.term, rule.category, rule.weight)) for rule in ordered if not rule.token
+        )
+        self._terms = tuple(dict.fromkeys(term for term, _ in self._table))
+        self._tokens = tuple((rule.term, PolicyHit(rule.term, rule.category, rule.weight)) for rule in ordered if rule.token)
+
+    def scan(self, text: str) -> list[PolicyHit]:
+        # Distinct hits: a term seen several times is reported once.
+        lower = text.lower()
+        present = {term for term in self._terms if term in lower}
+        if not present:
+            return []
+        return [hit for term, hit in self._table if term in present]
+
+    def scan_tokens(self, tokens: Iterable[str]) -> list[PolicyHit]:
+        # Token rules match whole shell tokens exactly, as the code runner splits them.
+        present = set(tokens)
+        return [hit for term, hit in self._tokens if term in present]
+
+
+def destructive(hits: Iterable[PolicyHit]) -> bool:
+    return any(hit.category == DESTRUCTIVE for hit in hits)
+
+
+def default_rules() -> list[PolicyRule]:
+    rules = [PolicyRule(term, RISK_HIGH, 3) for term in HIGH_RISK_TERMS]
+    rules += [PolicyRule(term, RISK_MEDIUM, 1) for term in MEDIUM_RISK_TERMS]
+    rules += [PolicyRule(term, DESTRUCTIVE, 10) for term in DESTRUCTIVE_TERMS]
+    rules += [PolicyRule(term, BLOCKED_TOKEN, 10, token=True) for term in BLOCKED_TOKENS]
+    return rules
+
+
+@lru_cache(maxsize=1)
+def default_policy() -> PolicyEngine:
+    # Compiled once per process and shared by the chat, agent and tool paths.
+    return PolicyEngine(default_rules())
@@ -1,5 +1,7 @@
 import re
 
+from ashi_os.core.policy import PolicyEngine, default_policy, destructive
+
 
 _SECRET_PATTERNS = [
     re.compile(r"sk-[A-Za-z0-9_-]{10,}"),
@@ -15,7 +17,5 @@ def redact_secrets(text: str) -> str:
     return redacted
 
 
-def is_destructive_command(text: str) -> bool:
-    lower = text.lower()
-    checks = ["rm -rf", "shutdown", "reboot", "mkfs", "dd if="]
-    return any(token in lower for token in checks)
+def is_destructive_command(text: str, policy: PolicyEngine | None = None) -> bool:
+    return destructive((policy or default_policy()).scan(text))
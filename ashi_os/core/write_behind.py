@@ -0,0 +1,164 @@
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import threading
+import time
+from typing import Any
+import uuid
+
+from ashi_os.core.config import Settings
+from ashi_os.logging.audit_log import AuditLogger
+from ashi_os.logging.logger import get_logger
+from ashi_os.logging.metrics import WRITE_BEHIND_BATCHES, WRITE_BEHIND_LAG
+from ashi_os.memory.memory_service import MemoryService
+
+log = get_logger("ashi.write_behind")
+# Attempts per audit event once the batched append has failed, with a growing pause between them.
+MAX_WRITE_ATTEMPTS = 3
+RETRY_BACKOFF_SEC = 0.05
+
+
+@dataclass(frozen=True)
+class _Item:
+    kind: str
+    args: tuple
+    enqueued_at: float
+
+
+class WriteBehindQueue:
+    # Stands in for AuditLogger and MemoryService, writing from one background worker.
+    def __init__(
+        self,
+        audit: AuditLogger,
+        memory: MemoryService,
+        max_batch: int = 64,
+        max_pending: int = 10000,
+    ) -> None:
+        self.audit = audit
+        self.memory = memory
+        self.max_batch = max(1, max_batch)
+        self.max_pending = max(1, max_pending)
+        self._cond = threading.Condition()
+        self._items: deque[_Item] = deque()
+        self._inflight = 0
+        self._closed = False
+        self._worker: threading.Thread | None = None
+        self._stats = {"processed": 0, "failed": 0, "retried": 0, "inline": 0, "batches": 0, "max_lag_sec": 0.0}
+
+    def write(self, event: str, payload: dict[str, Any]) -> None:
+        # Payload is copied so later mutation by the caller cannot change what is logged.
+        if not self._submit("audit", (event, dict(payload), datetime.now(timezone.utc))):
+            self.audit.write(event, payload)
+
+    def add_memory(self, session_id: str, text: str, metadata: dict[str, Any] | None = None) -> str:
+        # The id is fixed now so callers can report it before the insert lands.
+        memory_id = str(uuid.uuid4())
+        if not self._submit("memory", (session_id, text, metadata, memory_id)):
+            self.memory.add_memory(session_id, text, metadata, memory_id=memory_id)
+        return memory_id
+
+    def flush(self, timeout: float | None = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._items and not self._inflight, timeout)
+
+    def close(self, timeout: float | None = 10.0) -> bool:
+        drained = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            worker = self._worker
+            self._cond.notify_all()
+        if worker is not None:
+            worker.join(timeout)
+        return drained
+
+    def stats(self) -> dict:
+        with self._cond:
+            oldest = self._items[0].enqueued_at if self._items else None
+            return {
+                "depth": len(self._items) + self._inflight,
+                "lag_sec": round(time.monotonic() - oldest, 4) if oldest is not None else 0.0,
+                **self._stats,
+            }
+
+    def _submit(self, kind: str, args: tuple) -> bool:
+        with self._cond:
+            if self._closed or len(self._items) >= self.max_pending:
+                self._stats["inline"] += 1
+                return False
+            self._items.append(_Item(kind, args, time.monotonic()))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._worker.start()
+            self._cond.notify_all()
+            return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._items or self._closed)
+                if not self._items:
+                    return
+                batch = [self._items.popleft() for _ in range(min(self.max_batch, len(self._items)))]
+                self._inflight = len(batch)
+            failed = self._apply(batch)
+            lag = time.monotonic() - batch[0].enqueued_at
+            WRITE_BEHIND_LAG.observe(lag)
+            WRITE_BEHIND_BATCHES.inc()
+            with self._cond:
+                self._inflight = 0
+                self._stats["processed"] += len(batch) - failed
+                self._stats["failed"] += failed
+                self._stats["batches"] += 1
+                self._stats["max_lag_sec"] = round(max(self._stats["max_lag_sec"], lag), 4)
+                self._cond.notify_all()
+
+    def _apply(self, batch: list[_Item]) -> int:
+        failed = 0
+        events = [item.args for item in batch if item.kind == "audit"]
+        if events:
+            try:
+                self.audit.write_many([(event, payload) for event, payload, _ in events], [ts for _, _, ts in events])
+            except Exception as exc:
+                log.warning("write_behind.audit_retry", events=len(events), error=str(exc))
+                failed += self._write_each(events)
+        # Memory inserts of a batch go to the store together, to be embedded in one call.
+        memories = [
+            {"session_id": session_id, "text": text, "metadata": metadata, "id": memory_id}
+            for session_id, text, metadata, memory_id in (item.args for item in batch if item.kind == "memory")
+        ]
+        if memories:
+            try:
+                self.memory.add_many(memories)
+            except Exception as exc:
+                log.error("write_behind.memory_failed", memories=len(memories), error=str(exc))
+                failed += len(memories)
+        return failed
+
+    def _write_each(self, events: list[tuple]) -> int:
+        # Falls back to one append per event, keeping the original timestamps and order.
+        failed = 0
+        for event, payload, ts in events:
+            for attempt in range(1, MAX_WRITE_ATTEMPTS + 1):
+                try:
+                    self.audit.write_many([(event, payload)], [ts])
+                    break
+                except Exception as exc:
+                    if attempt == MAX_WRITE_ATTEMPTS:
+                        log.error("write_behind.audit_dropped", audit_event=event, attempts=attempt, error=str(exc))
+                        failed += 1
+                        break
+                    time.sleep(RETRY_BACKOFF_SEC * attempt)
+            with self._cond:
+                self._stats["retried"] += 1
+        return failed
+
+
+def build_write_behind(settings: Settings, audit: AuditLogger, memory: MemoryService) -> WriteBehindQueue | None:
+    if not settings.write_behind_enabled:
+        return None
+    return WriteBehindQueue(
+        audit=audit,
+        memory=memory,
+        max_batch=settings.write_behind_max_batch,
+        max_pending=settings.write_behind_max_pending,
+    )
@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Any
 
 from ashi_os.core.security import redact_secrets
+from ashi_os.logging.metrics import AUDIT_WRITE_LATENCY
 
 
 class AuditLogger:
@@ -12,10 +13,27 @@ class AuditLogger:
         self.path = log_dir / "audit.jsonl"
 
     def write(self, event: str, payload: dict[str, Any]) -> None:
+        with AUDIT_WRITE_LATENCY.time():
+            self._write(event, payload)
+
+    def write_many(self, events: list[tuple[str, dict[str, Any]]], timestamps: list[datetime] | None = None) -> None:
+        # One open and one append for the whole batch. Deferred writers pass the time each
+        # event happened, so "ts" does not drift with queueing lag.
+        with AUDIT_WRITE_LATENCY.time():
+            stamps = timestamps or [None] * len(events)
+            lines = "".join(self._line(event, payload, ts) for (event, payload), ts in zip(events, stamps))
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(lines)
+
+    def _write(self, event: str, payload: dict[str, Any]) -> None:
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(self._line(event, payload))
+
+    @staticmethod
+    def _line(event: str, payload: dict[str, Any], ts: datetime | None = None) -> str:
         item = {
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": (ts or datetime.now(timezone.utc)).isoformat(),
             "event": event,
             "payload": {k: redact_secrets(str(v)) for k, v in payload.items()},
         }
-        with self.path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(item, ensure_ascii=True) + "\n")
+        return json.dumps(item, ensure_ascii=True) + "\n"
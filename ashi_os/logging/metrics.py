@@ -0,0 +1,215 @@
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(self.labels, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(_label_key(self.labels, labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_render_labels(self.labels, key)} {_number(value)}" for key, value in items]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # Per label set: [per-bucket counts..., +Inf count], sum.
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(self.labels, labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(_label_key(self.labels, labels))
+            return sum(series[0]) if series else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._series.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f"{self.name}_bucket{_render_labels((*self.labels, 'le'), (*key, le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_render_labels(self.labels, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_render_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class StageTimer:
+    # Records when each stage of one request started and how long it ran, relative to the
+    # request's start, so stages that overlap show up with overlapping offsets.
+    def __init__(self, pipeline: str) -> None:
+        self.pipeline = pipeline
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stages: dict[str, dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            PIPELINE_STAGE_LATENCY.observe(ended - started, pipeline=self.pipeline, stage=name)
+            with self._lock:
+                self._stages[name] = {
+                    "start_ms": round((started - self._started) * 1000, 3),
+                    "ms": round((ended - started) * 1000, 3),
+                }
+
+    def run(self, name: str, fn, *args, **kwargs):
+        with self.stage(name):
+            return fn(*args, **kwargs)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            stages = dict(self._stages)
+        return {**stages, "total_ms": round((time.perf_counter() - self._started) * 1000, 3)}
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+def _label_key(names: tuple[str, ...], labels: dict[str, str]) -> tuple[str, ...]:
+    return tuple(str(labels.get(name, "")) for name in names)
+
+
+def _render_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_REQUESTS = REGISTRY.counter(
+    "ashi_llm_requests_total", "LLM calls by provider, model and outcome.", ("provider", "model", "outcome")
+)
+LLM_LATENCY = REGISTRY.histogram(
+    "ashi_llm_request_seconds", "LLM call latency in seconds.", ("provider", "model", "outcome")
+)
+LLM_TIER_LATENCY = REGISTRY.histogram(
+    "ashi_llm_tier_seconds", "End-to-end LLM request latency by model tier.", ("tier",)
+)
+FAST_PATH_REPLIES = REGISTRY.counter(
+    "ashi_fast_path_replies_total", "Chat turns answered by the fast path, by intent.", ("intent",)
+)
+MEMORY_LATENCY = REGISTRY.histogram("ashi_memory_seconds", "Memory store latency in seconds.", ("operation",))
+TOOL_EXECUTIONS = REGISTRY.counter(
+    "ashi_tool_executions_total", "Tool executions by tool, action and outcome.", ("tool", "action", "outcome")
+)
+TOOL_LATENCY = REGISTRY.histogram("ashi_tool_seconds", "Tool execution latency in seconds.", ("tool", "action"))
+AUDIT_WRITE_LATENCY = REGISTRY.histogram(
+    "ashi_audit_write_seconds",
+    "Audit log append latency in seconds.",
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+SCHEDULER_RUNS = REGISTRY.histogram("ashi_scheduler_run_seconds", "Scheduler run_due_jobs latency in seconds.")
+SCHEDULER_JOBS = REGISTRY.counter("ashi_scheduler_jobs_total", "Scheduled jobs processed by outcome.", ("outcome",))
+PIPELINE_STAGE_LATENCY = REGISTRY.histogram(
+    "ashi_pipeline_stage_seconds", "Chat and agent pipeline stage latency in seconds.", ("pipeline", "stage")
+)
+WRITE_BEHIND_LAG = REGISTRY.histogram(
+    "ashi_write_behind_lag_seconds", "Time from enqueue to write for the oldest item of each write-behind batch."
+)
+WRITE_BEHIND_BATCHES = REGISTRY.counter("ashi_write_behind_batches_total", "Write-behind batches applied.")
+VOICE_STAGE_LATENCY = REGISTRY.histogram(
+    "ashi_voice_stage_seconds", "Voice pipeline stage latency in seconds.", ("stage",)
+)
@@ -4,7 +4,22 @@ from typing import Protocol
 class EmbeddingProvider(Protocol):
     def name(self) -> str: ...
 
+    def embed(self, texts: list[str]) -> list[list[float]]: ...
+
 
 class DefaultEmbeddingProvider:
+    def __init__(self) -> None:
+        self._fn = None
+
     def name(self) -> str:
         return "chroma_default"
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        try:
+            if self._fn is None:
+                from chromadb.utils import embedding_functions
+
+                self._fn = embedding_functions.DefaultEmbeddingFunction()
+            return [[float(x) for x in vector] for vector in self._fn(texts)]
+        except Exception:
+            return []
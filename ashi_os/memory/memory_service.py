@@ -3,6 +3,7 @@ import uuid
 from typing import Any
 
 from ashi_os.core.config import Settings
+from ashi_os.logging.metrics import MEMORY_LATENCY
 from ashi_os.memory.vector_store import VectorStore
 
 
@@ -11,20 +12,48 @@ class MemoryService:
         self.settings = settings
         self.store = VectorStore(settings)
 
-    def add_memory(self, session_id: str, text: str, metadata: dict[str, Any] | None = None) -> str:
-        memory_id = str(uuid.uuid4())
-        payload = {
-            "session_id": session_id,
-            "created_at": int(time.time()),
-        }
-        if metadata:
-            payload.update(metadata)
-        self.store.add(memory_id, text, payload)
-        return memory_id
+    def add_memory(
+        self,
+        session_id: str,
+        text: str,
+        metadata: dict[str, Any] | None = None,
+        memory_id: str | None = None,
+    ) -> str:
+        return self.add_many([{"session_id": session_id, "text": text, "metadata": metadata, "id": memory_id}])[0]
+
+    def add_many(self, items: list[dict[str, Any]]) -> list[str]:
+        # Each item has session_id and text, and optionally metadata and id. The whole list
+        # goes to the store's buffer at once, so it is embedded and written as one batch.
+        created_at = int(time.time())
+        ids: list[str] = []
+        batch: list[tuple[str, str, dict[str, Any]]] = []
+        for item in items:
+            memory_id = item.get("id") or str(uuid.uuid4())
+            payload = {
+                "session_id": item["session_id"],
+                "created_at": created_at,
+            }
+            if item.get("metadata"):
+                payload.update(item["metadata"])
+            ids.append(memory_id)
+            batch.append((memory_id, item["text"], payload))
+        with MEMORY_LATENCY.time(operation="add"):
+            self.store.add_many(batch)
+        return ids
+
+    def flush(self) -> int:
+        return self.store.flush()
+
+    def close(self) -> None:
+        self.store.close()
+
+    def stats(self) -> dict:
+        return self.store.stats()
 
     def search(self, session_id: str, query: str, top_k: int | None = None) -> list[dict[str, Any]]:
         limit = top_k if top_k is not None else self.settings.memory_top_k
-        hits = self.store.query(query, limit)
+        with MEMORY_LATENCY.time(operation="search"):
+            hits = self.store.query(query, limit)
         filtered = []
         for hit in hits:
             if hit.get("metadata", {}).get("session_id") == session_id:
@@ -1,36 +1,155 @@
+import json
+import threading
 from typing import Any
 
 from ashi_os.core.config import Settings
+from ashi_os.logging.logger import get_logger
+from ashi_os.logging.metrics import MEMORY_LATENCY
+
+log = get_logger("ashi.memory")
+
+# A document that keeps failing on its own is dropped (and logged) after this many flushes.
+MAX_FLUSH_ATTEMPTS = 3
 
 
 class VectorStore:
+    # Adds are buffered and written as one collection.add per batch.
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
+        self.max_batch = max(1, settings.memory_batch_size)
+        self.flush_interval_sec = settings.memory_flush_interval_sec
         self._client = None
         self._collection = None
         self._ready = False
+        self._init_lock = threading.Lock()
+        self._buffer_lock = threading.Lock()
+        # Held across collection.add so batches land in the order they were buffered.
+        self._flush_lock = threading.Lock()
+        # (doc_id, text, metadata, attempts)
+        self._buffer: list[tuple[str, str, dict[str, Any], int]] = []
+        self._timer: threading.Timer | None = None
+        self._stats = {"flushes": 0, "flushed": 0, "retried": 0, "failed": 0, "last_error": ""}
 
     def _init_client(self) -> None:
         if self._ready:
             return
-        try:
-            import chromadb
+        # Recall runs on worker threads; two concurrent first calls must not both open the store.
+        with self._init_lock:
+            if self._ready:
+                return
+            try:
+                import chromadb
 
-            self._client = chromadb.PersistentClient(path=str(self.settings.chroma_dir))
-            self._collection = self._client.get_or_create_collection(name="ashi_memory")
-            self._ready = True
-        except Exception:
-            self._client = None
-            self._collection = None
-            self._ready = True
+                self._client = chromadb.PersistentClient(path=str(self.settings.chroma_dir))
+                self._collection = self._client.get_or_create_collection(name="ashi_memory")
+                self._ready = True
+            except Exception:
+                self._client = None
+                self._collection = None
+                self._ready = True
 
     def add(self, doc_id: str, text: str, metadata: dict[str, Any]) -> None:
-        self._init_client()
-        if self._collection is None:
+        self.add_many([(doc_id, text, metadata)])
+
+    def add_many(self, items: list[tuple[str, str, dict[str, Any]]]) -> None:
+        if not items:
             return
-        self._collection.add(documents=[text], metadatas=[metadata], ids=[doc_id])
+        clean = [(doc_id, text, sanitize_metadata(metadata), 0) for doc_id, text, metadata in items]
+        with self._buffer_lock:
+            self._buffer.extend(clean)
+            full = len(self._buffer) >= self.max_batch
+            if not full:
+                self._schedule()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        # Returns how many documents were persisted. Nothing is lost on failure: documents that
+        # fail on their own go back to the front of the buffer, until MAX_FLUSH_ATTEMPTS.
+        with self._flush_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not batch:
+                return 0
+            self._init_client()
+            if self._collection is None:
+                return 0
+            try:
+                self._write(batch)
+                written, retry = len(batch), []
+            except Exception as exc:
+                log.warning("memory.flush_retry", documents=len(batch), error=str(exc))
+                written, retry = self._write_each(batch)
+            with self._buffer_lock:
+                self._stats["flushes"] += 1
+                self._stats["flushed"] += written
+                if retry:
+                    self._buffer[:0] = retry
+                    self._stats["retried"] += len(retry)
+                    self._schedule()
+            return written
+
+    def close(self) -> None:
+        self._flush_quietly()
+        with self._buffer_lock:
+            left = len(self._buffer)
+        if left:
+            log.error("memory.unflushed_on_close", documents=left, error=self._stats["last_error"])
+
+    def stats(self) -> dict:
+        with self._buffer_lock:
+            return {"buffered": len(self._buffer), "max_batch": self.max_batch, **self._stats}
+
+    def _write(self, batch: list[tuple[str, str, dict[str, Any], int]]) -> None:
+        with MEMORY_LATENCY.time(operation="flush"):
+            self._collection.add(
+                ids=[doc_id for doc_id, _, _, _ in batch],
+                documents=[text for _, text, _, _ in batch],
+                metadatas=[metadata for _, _, metadata, _ in batch],
+            )
+
+    def _write_each(self, batch: list[tuple[str, str, dict[str, Any], int]]) -> tuple[int, list]:
+        # The batch failed as a whole: find the documents that fail on their own, so the
+        # others are not held back with them.
+        written = 0
+        retry: list[tuple[str, str, dict[str, Any], int]] = []
+        for doc_id, text, metadata, attempts in batch:
+            try:
+                self._write([(doc_id, text, metadata, attempts)])
+                written += 1
+            except Exception as exc:
+                with self._buffer_lock:
+                    self._stats["last_error"] = str(exc)
+                if attempts + 1 < MAX_FLUSH_ATTEMPTS:
+                    retry.append((doc_id, text, metadata, attempts + 1))
+                    continue
+                with self._buffer_lock:
+                    self._stats["failed"] += 1
+                log.error("memory.add_dropped", memory_id=doc_id, attempts=attempts + 1, error=str(exc))
+        return written, retry
+
+    def _schedule(self) -> None:
+        # Caller holds the buffer lock.
+        if self._timer is None and self._buffer:
+            self._timer = threading.Timer(self.flush_interval_sec, self._flush_quietly)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_quietly(self) -> None:
+        # Timer, query and shutdown flushes have no caller to report to, so failures are logged
+        # and kept in stats() rather than raised.
+        try:
+            self.flush()
+        except Exception as exc:
+            with self._buffer_lock:
+                self._stats["last_error"] = str(exc)
+            log.error("memory.flush_failed", error=str(exc))
 
     def query(self, query_text: str, top_k: int) -> list[dict[str, Any]]:
+        self._flush_quietly()
         self._init_client()
         if self._collection is None:
             return []
@@ -48,3 +167,18 @@ class VectorStore:
                 }
             )
         return hits
+
+
+def sanitize_metadata(metadata: dict[str, Any] | None) -> dict[str, Any]:
+    # Chroma accepts str, int, float and bool values under str keys. None values are dropped
+    # and anything else (nested dicts, lists, objects) is stored as its JSON text.
+    clean: dict[str, Any] = {}
+    for key, value in (metadata or {}).items():
+        key = str(key)
+        if value is None or key.startswith("chroma:"):
+            continue
+        if isinstance(value, (str, int, float, bool)):
+            clean[key] = value
+        else:
+            clean[key] = json.dumps(value, ensure_ascii=True, sort_keys=True, default=str)
+    return clean
@@ -0,0 +1,38 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from ashi_os.core.config import Settings
+
+
+@pytest.fixture
+def make_settings(tmp_path: Path):
+    # Settings with every path under tmp_path; keyword overrides replace individual fields.
+    def _make(**overrides) -> Settings:
+        settings = Settings(
+            env="test",
+            default_llm="ollama",
+            fallback_llm="openai",
+            ollama_model="model",
+            openai_model="model",
+            openai_api_key="",
+            chroma_dir=tmp_path / "chroma",
+            sqlite_path=tmp_path / "state.db",
+            log_dir=tmp_path / "logs",
+            max_context_tokens=8000,
+            memory_top_k=3,
+            memory_on_chat=False,
+            wake_phrase="hey aashi",
+            default_tts_voice="Samantha",
+            voice_inbox_dir=tmp_path / "voice" / "inbox",
+            voice_processed_dir=tmp_path / "voice" / "processed",
+            voice_poll_interval_sec=1.0,
+            mic_sample_rate=16000,
+            mic_chunk_seconds=2.0,
+            mic_channels=1,
+            mic_device_index=None,
+        )
+        return replace(settings, **overrides)
+
+    return _make
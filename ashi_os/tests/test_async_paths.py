@@ -0,0 +1,228 @@
+import asyncio
+from pathlib import Path
+
+from ashi_os.agents.coordinator import AgentCoordinator
+from ashi_os.agents.execution_agent import ExecutionAgent
+from ashi_os.agents.memory_agent import MemoryAgent
+from ashi_os.agents.research_agent import ResearchAgent
+from ashi_os.agents.supervisor_agent import SupervisorAgent
+from ashi_os.agents.validation_agent import ValidationAgent
+from ashi_os.brain.confirmation import ConfirmationManager
+from ashi_os.brain.context_manager import ContextManager
+from ashi_os.brain.llm_router import LLMRouter
+from ashi_os.brain.orchestrator import Orchestrator
+from ashi_os.brain.planning import RiskEvaluator, StrategicPlanner
+from ashi_os.brain.single_flight import AsyncSingleFlight
+from ashi_os.logging.audit_log import AuditLogger
+from ashi_os.tools.executor import ToolExecutor
+
+
+class StubMemory:
+    def __init__(self) -> None:
+        self.added: list[str] = []
+
+    def add_memory(self, session_id: str, text: str, metadata: dict | None = None) -> str:
+        self.added.append(text)
+        return f"mem-{len(self.added)}"
+
+    def search(self, session_id: str, query: str, top_k: int | None = None) -> list[dict]:
+        return [{"id": "m1", "text": "remembered fact", "metadata": {"session_id": session_id}}]
+
+
+class AsyncStubRouter:
+    def generate(self, prompt: str, **kwargs) -> tuple[str, str, str]:
+        return ("sync-reply", "stub", "stub-model")
+
+    async def agenerate(self, prompt: str, **kwargs) -> tuple[str, str, str]:
+        await asyncio.sleep(0)
+        return ("async-reply", "stub", "stub-model")
+
+
+class TrackingAsyncRouter:
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+        self.seen: list[str] = []
+
+    async def agenerate(self, prompt: str, **kwargs) -> tuple[str, str, str]:
+        request = prompt.rsplit("\n", 1)[-1]
+        if request == "boom":
+            raise RuntimeError("model exploded")
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        self.seen.append(request)
+        return (f"re: {request}", "stub", "stub-model")
+
+
+class SlowAsyncOllama:
+    def __init__(self) -> None:
+        self.cancelled = False
+
+    async def chat(self, **kwargs):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"message": {"content": "from-ollama"}}
+
+
+class QuickAsyncResponses:
+    async def create(self, **kwargs):
+        return type("Response", (), {"output_text": "from-openai"})()
+
+
+class AsyncPool:
+    def __init__(self) -> None:
+        self.ollama_client = SlowAsyncOllama()
+        self.openai_client = type("AsyncOpenAI", (), {"responses": QuickAsyncResponses()})()
+
+    def async_ollama(self):
+        return self.ollama_client
+
+    def async_openai(self):
+        return self.openai_client
+
+
+def test_agenerate_hedge_cancels_slow_primary(make_settings) -> None:
+    settings = make_settings(openai_api_key="test-key", llm_hedge_mode="all", llm_hedge_delay_ms=50)
+    pool = AsyncPool()
+    router = LLMRouter(settings, clients=pool)
+
+    async def _run():
+        reply = await router.agenerate("hello")
+        await asyncio.sleep(0)
+        return reply
+
+    assert asyncio.run(_run()) == ("from-openai", "fallback", "model")
+    assert pool.ollama_client.cancelled is True
+    assert router.status()["hedging"]["won"] == 1
+    router.close()
+
+
+def test_orchestrator_achat_gates_then_awaits_router(make_settings) -> None:
+    settings = make_settings()
+    memory = StubMemory()
+    orchestrator = Orchestrator(
+        router=AsyncStubRouter(),
+        context_manager=ContextManager(settings, memory),
+        memory=memory,
+        audit=AuditLogger(settings.log_dir),
+        memory_on_chat=False,
+    )
+
+    blocked = asyncio.run(orchestrator.achat("s-async", "delete project files"))
+    assert blocked["confirmation_required"] is True
+
+    approved = asyncio.run(orchestrator.achat("s-async", f"confirm {blocked['confirmation_token']}"))
+    assert approved["reply"] == "async-reply"
+    assert len(orchestrator.session_history("s-async")) == 2
+
+
+def test_coordinator_arun_offloads_stages(tmp_path: Path, make_settings) -> None:
+    settings = make_settings()
+    memory = StubMemory()
+    audit = AuditLogger(settings.log_dir)
+    coordinator = AgentCoordinator(
+        research=ResearchAgent(memory=memory, top_k=3),
+        execution=ExecutionAgent(tool_executor=ToolExecutor(tmp_path, settings.sqlite_path, audit)),
+        validation=ValidationAgent(),
+        memory_agent=MemoryAgent(memory=memory),
+        supervisor=SupervisorAgent(),
+        planner=StrategicPlanner(),
+        risk_evaluator=RiskEvaluator(),
+        confirmation=ConfirmationManager(),
+        audit=audit,
+    )
+
+    result = asyncio.run(
+        coordinator.arun(session_id="agent-async", objective="write file notes.txt::ready", auto_execute=True)
+    )
+
+    assert result["confirmation_required"] is False
+    assert result["research"]["facts"] == ["remembered fact"]
+    assert result["validation"]["success_count"] == 1
+    assert result["memory"]["memory_id"] == "mem-1"
+    assert (tmp_path / "notes.txt").read_text(encoding="utf-8") == "ready"
+
+
+def test_achat_batch_orders_per_session_and_isolates_failures(make_settings) -> None:
+    settings = make_settings()
+    memory = StubMemory()
+    router = TrackingAsyncRouter()
+    orchestrator = Orchestrator(
+        router=router,
+        context_manager=ContextManager(settings, memory),
+        memory=memory,
+        audit=AuditLogger(settings.log_dir),
+        memory_on_chat=False,
+    )
+    items = [(f"s{i % 4}", f"message {i}") for i in range(12)]
+    items.insert(5, ("s1", "boom"))
+
+    async def _collect() -> list[dict]:
+        return [item async for item in orchestrator.achat_batch(items, concurrency=2)]
+
+    results = asyncio.run(_collect())
+
+    assert sorted(item["index"] for item in results) == list(range(len(items)))
+    failed = [item for item in results if not item["ok"]]
+    assert [item["index"] for item in failed] == [5]
+    assert "model exploded" in failed[0]["error"]
+    assert router.peak <= 2
+    for session in ["s0", "s1", "s2", "s3"]:
+        expected = [msg for sid, msg in items if sid == session and msg != "boom"]
+        assert [msg for msg in router.seen if msg in expected] == expected
+        history = [turn["content"] for turn in orchestrator.session_history(session) if turn["role"] == "user"]
+        assert history == expected
+
+
+def test_async_single_flight_survives_leader_cancellation() -> None:
+    flights = AsyncSingleFlight()
+    calls: list[str] = []
+
+    async def _upstream() -> str:
+        calls.append("call")
+        await asyncio.sleep(0.05)
+        return "reply"
+
+    async def _run():
+        leader = asyncio.create_task(flights.do("k", _upstream))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("k", _upstream))
+        await asyncio.sleep(0)
+        leader.cancel()
+        result = await follower
+        return leader.cancelled(), result
+
+    assert asyncio.run(_run()) == (True, "reply")
+    assert calls == ["call"]
+    assert flights.stats() == {"leaders": 1, "coalesced": 1, "in_flight": 0}
+
+
+def test_async_single_flight_cancels_upstream_once_nobody_waits() -> None:
+    flights = AsyncSingleFlight()
+
+    async def _run():
+        started = asyncio.Event()
+        stopped = asyncio.Event()
+
+        async def _upstream() -> str:
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+            return "late"
+
+        waiter = asyncio.create_task(flights.do("k", _upstream))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.wait_for(stopped.wait(), timeout=1)
+        return await flights.do("k", lambda: asyncio.sleep(0, result="fresh"))
+
+    assert asyncio.run(_run()) == "fresh"
+    assert flights.stats()["leaders"] == 2
@@ -0,0 +1,99 @@
+import asyncio
+from dataclasses import replace
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from ashi_os.bench.load import percentile, run_benchmark, summarize
+from ashi_os.bench.mock_llm import MockLLMConfig, MockLLMServer, create_mock_app
+from ashi_os.brain.llm_router import LLMRouter
+
+
+def test_mock_server_is_deterministic_and_injects_failures() -> None:
+    client = TestClient(create_mock_app(MockLLMConfig(latency_ms=0, tokens_per_sec=0, reply_tokens=4)))
+    body = {"model": "m", "stream": False, "messages": [{"role": "user", "content": "hi"}]}
+
+    first = client.post("/api/chat", json=body).json()["message"]["content"]
+    assert client.post("/api/chat", json=body).json()["message"]["content"] == first
+    assert len(first.split()) == 4
+    assert client.get("/api/tags").json()["models"][0]["name"] == "mock-model"
+
+    failing = TestClient(create_mock_app(MockLLMConfig(latency_ms=0, failure_rate=1.0)))
+    assert failing.post("/api/chat", json=body).status_code == 503
+    assert failing.get("/mock/stats").json() == {"requests": 1, "failures": 1}
+
+
+def test_router_talks_to_mock_server_over_both_protocols(make_settings) -> None:
+    with MockLLMServer(MockLLMConfig(latency_ms=0, tokens_per_sec=0, reply_tokens=3)) as server:
+        ollama_settings = make_settings(
+            ollama_model="mock-model",
+            openai_model="mock-model",
+            llm_cache_enabled=False,
+            ollama_host=server.url,
+        )
+        router = LLMRouter(ollama_settings)
+        reply, provider, _ = router.generate("hello")
+        streamed = "".join(chunk for chunk, _, _ in router.generate_stream("hello"))
+        router.close()
+
+        openai_settings = replace(
+            ollama_settings,
+            default_llm="openai",
+            openai_api_key="mock-key",
+            openai_base_url=f"{server.url}/v1",
+        )
+        openai_router = LLMRouter(openai_settings)
+        openai_reply, openai_provider, _ = openai_router.generate("hello")
+        openai_streamed = "".join(chunk for chunk, _, _ in openai_router.generate_stream("hello"))
+        openai_router.close()
+
+    assert provider == "ollama" and reply.startswith("mock-")
+    assert streamed == reply
+    assert openai_provider == "openai" and openai_reply == reply
+    assert openai_streamed == reply
+
+
+def test_summary_reports_percentiles_and_throughput() -> None:
+    samples = [i / 1000 for i in range(1, 101)]
+    assert percentile(samples, 0.5) == 0.05
+    assert percentile(samples, 0.99) == 0.099
+    summary = summarize(samples, errors=2, wall_sec=2.0)
+    assert summary["requests"] == 102
+    assert summary["throughput_rps"] == 51.0
+    assert summary["p95_ms"] == 95.0
+
+
+def test_benchmark_runs_chat_and_tools_in_process(tmp_path: Path, monkeypatch) -> None:
+    from ashi_os.api import app as app_module
+
+    built = []
+    create_app = app_module.create_app
+    monkeypatch.setattr(app_module, "create_app", lambda: built.append(create_app()) or built[-1])
+    results = asyncio.run(
+        run_benchmark(
+            ["chat", "tool_execute"],
+            levels=[1, 4],
+            requests=8,
+            mock=MockLLMConfig(latency_ms=1, tokens_per_sec=0, reply_tokens=2),
+            workdir=tmp_path,
+        )
+    )
+
+    for scenario in ["chat", "tool_execute"]:
+        for level in ["1", "4"]:
+            row = results["scenarios"][scenario][level]
+            assert row["requests"] == 8
+            assert row["errors"] == 0
+            assert row["p50_ms"] is not None
+
+    # The shutdown hooks ran: the write-behind worker has drained and exited.
+    worker = built[0].state.write_behind._worker
+    assert worker is not None and not worker.is_alive()
+    audit = (tmp_path / "logs" / "audit.jsonl").read_text(encoding="utf-8")
+    assert audit.count('"chat.completed"') == 16
+
+
+def test_importing_create_app_does_not_build_the_module_app() -> None:
+    from ashi_os.api import app as app_module
+
+    assert "app" not in vars(app_module)
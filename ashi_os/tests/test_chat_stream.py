@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ashi_os.api.routes_chat import router as chat_router
+from ashi_os.brain.context_manager import ContextManager
+from ashi_os.brain.orchestrator import Orchestrator
+from ashi_os.core.config import Settings
+from ashi_os.logging.audit_log import AuditLogger
+from ashi_os.memory.memory_service import MemoryService
+
+
+class StreamingStubRouter:
+    def generate(self, prompt: str, **kwargs) -> tuple[str, str, str]:
+        return ("stub-reply", "stub", "stub-model")
+
+    def generate_stream(self, prompt: str, **kwargs):
+        for chunk in ["stub", "-", "reply"]:
+            yield chunk, "stub", "stub-model"
+
+
+def make_orchestrator(tmp_path: Path) -> Orchestrator:
+    settings = Settings(
+        env="test",
+        default_llm="ollama",
+        fallback_llm="openai",
+        ollama_model="model",
+        openai_model="model",
+        openai_api_key="",
+        chroma_dir=tmp_path / "chroma",
+        sqlite_path=tmp_path / "state.db",
+        log_dir=tmp_path / "logs",
+        max_context_tokens=8000,
+        memory_top_k=3,
+        memory_on_chat=False,
+        wake_phrase="hey aashi",
+        default_tts_voice="Samantha",
+        voice_inbox_dir=tmp_path / "voice" / "inbox",
+        voice_processed_dir=tmp_path / "voice" / "processed",
+        voice_poll_interval_sec=1.0,
+        mic_sample_rate=16000,
+        mic_chunk_seconds=2.0,
+        mic_channels=1,
+        mic_device_index=None,
+    )
+    memory = MemoryService(settings)
+    return Orchestrator(
+        router=StreamingStubRouter(),
+        context_manager=ContextManager(settings, memory),
+        memory=memory,
+        audit=AuditLogger(settings.log_dir),
+        memory_on_chat=False,
+    )
+
+
+def test_chat_stream_emits_tokens_then_metadata(tmp_path: Path) -> None:
+    orchestrator = make_orchestrator(tmp_path)
+    events = list(orchestrator.chat_stream("s-stream", "summarize the weather"))
+
+    assert [e["data"]["text"] for e in events if e["event"] == "token"] == ["stub", "-", "reply"]
+    done = events[-1]
+    assert done["event"] == "done"
+    assert done["data"]["reply"] == "stub-reply"
+    assert done["data"]["plan"]["objective"] == "summarize the weather"
+    assert len(orchestrator.session_history("s-stream")) == 2
+
+
+def test_chat_stream_gated_request_sends_no_tokens(tmp_path: Path) -> None:
+    orchestrator = make_orchestrator(tmp_path)
+    events = list(orchestrator.chat_stream("s-stream-gate", "delete project files"))
+
+    assert [e["event"] for e in events] == ["done"]
+    assert events[0]["data"]["confirmation_required"] is True
+    assert events[0]["data"]["confirmation_token"]
+
+
+def test_chat_stream_route_serves_sse(tmp_path: Path) -> None:
+    app = FastAPI()
+    app.state.orchestrator = make_orchestrator(tmp_path)
+    app.include_router(chat_router)
+
+    response = TestClient(app).post("/chat/stream", json={"session_id": "s-sse", "user_message": "hello there"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    frames = [frame for frame in response.text.split("\n\n") if frame]
+    assert frames[0].startswith("event: token")
+    last_event, last_data = frames[-1].split("\n", 1)
+    assert last_event == "event: done"
+    payload = json.loads(last_data[len("data: ") :])
+    assert payload["session_id"] == "s-sse"
+    assert payload["reply"] == "stub-reply"
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import pytest
+
+from ashi_os.brain import confirmation as confirmation_module
+from ashi_os.brain.confirmation import ConfirmationManager
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(confirmation_module.time, "time", fake)
+    return fake
+
+
+def test_pending_confirmation_expires_after_ttl(clock: FakeClock) -> None:
+    manager = ConfirmationManager(ttl_sec=60)
+    token = manager.create("s1", "delete project files")
+    clock.now += 59
+    assert manager.pending_token("s1") == token
+    clock.now += 2
+    assert manager.consume_if_valid("s1", f"confirm {token}") == (False, "")
+    assert manager.stats()["expired"] == 1
+    assert manager.stats()["pending"] == 0
+
+
+def test_pending_confirmations_are_bounded_and_heap_stays_compact(clock: FakeClock) -> None:
+    manager = ConfirmationManager(ttl_sec=60, max_pending=3)
+    for index in range(5):
+        manager.create(f"s{index}", f"delete {index}")
+        clock.now += 1
+    assert [manager.has_pending(f"s{index}") for index in range(5)] == [False, False, True, True, True]
+    assert manager.stats()["evicted"] == 2
+
+    for _ in range(500):
+        manager.create("s4", "delete again")
+    assert len(manager._expiry) <= 2 * 3 + 64
+
+
+def test_scopes_keep_chat_and_agent_tokens_apart() -> None:
+    manager = ConfirmationManager()
+    chat_token = manager.create("s1", "delete chat files")
+    assert manager.pending_token("s1", scope="agents") is None
+    assert manager.consume_token("s1", chat_token, scope="agents") == (False, "")
+    agent_token = manager.create("s1", "delete agent files", scope="agents")
+    assert manager.consume_token("s1", agent_token, scope="agents") == (True, "delete agent files")
+    assert manager.consume_if_valid("s1", f"confirm {chat_token}") == (True, "delete chat files")
+
+
+def test_sqlite_confirmations_survive_restart_and_redeem_once(tmp_path: Path) -> None:
+    path = tmp_path / "state.db"
+    first = ConfirmationManager(sqlite_path=path, ttl_sec=60)
+    token = first.create("s1", "delete project files")
+
+    # A second worker, or the same one after a restart, sees the pending confirmation.
+    second = ConfirmationManager(sqlite_path=path, ttl_sec=60)
+    assert second.pending_token("s1") == token
+    assert second.consume_if_valid("s1", f"confirm {token}") == (True, "delete project files")
+    assert first.consume_if_valid("s1", f"confirm {token}") == (False, "")
+    assert first.stats()["pending"] == 0
+
+
+def test_sqlite_confirmations_expire_and_stay_bounded(tmp_path: Path, clock: FakeClock) -> None:
+    manager = ConfirmationManager(sqlite_path=tmp_path / "state.db", ttl_sec=60, max_pending=2)
+    stale = manager.create("s1", "delete old")
+    clock.now += 61
+    assert manager.consume_token("s1", stale) == (False, "")
+    assert manager.stats()["expired"] == 1
+
+    for index in range(4):
+        manager.create(f"n{index}", f"delete {index}")
+        clock.now += 1
+    assert manager.stats()["pending"] == 2
+    assert manager.pending_token("n0") is None
+    assert manager.pending_token("n3") is not None
+
+
+def test_sqlite_confirmations_count_rows_only_when_over_the_cap(tmp_path: Path, clock: FakeClock) -> None:
+    manager = ConfirmationManager(sqlite_path=tmp_path / "state.db", ttl_sec=60, max_pending=3)
+    statements: list[str] = []
+    manager._connect().set_trace_callback(statements.append)
+
+    for index in range(3):
+        manager.create(f"s{index}", f"delete {index}")
+        clock.now += 1
+    assert not any("COUNT(" in statement for statement in statements)
+
+    manager.create("s3", "delete 3")
+    assert sum("COUNT(" in statement for statement in statements) == 1
+    assert manager.pending_token("s0") is None
+    assert manager.stats()["evicted"] == 1 and manager.stats()["pending"] == 3
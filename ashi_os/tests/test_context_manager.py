@@ -1,36 +1,57 @@
-from pathlib import Path
-
 from ashi_os.brain.context_manager import ContextManager
-from ashi_os.core.config import Settings
+from ashi_os.brain.token_budget import TokenCounter
 from ashi_os.memory.memory_service import MemoryService
 
 
-def test_context_manager_builds_prompt() -> None:
-    settings = Settings(
-        env="test",
-        default_llm="ollama",
-        fallback_llm="openai",
-        ollama_model="model",
-        openai_model="model",
-        openai_api_key="",
-        chroma_dir=Path("./data/chroma"),
-        sqlite_path=Path("./data/state.db"),
-        log_dir=Path("./data/logs"),
-        max_context_tokens=8000,
-        memory_top_k=3,
-        memory_on_chat=False,
-        wake_phrase="hey aashi",
-        default_tts_voice="Samantha",
-        voice_inbox_dir=Path("./data/voice/inbox"),
-        voice_processed_dir=Path("./data/voice/processed"),
-        voice_poll_interval_sec=1.0,
-        mic_sample_rate=16000,
-        mic_chunk_seconds=2.0,
-        mic_channels=1,
-        mic_device_index=None,
-    )
+def test_context_manager_builds_prompt(make_settings) -> None:
+    settings = make_settings()
     memory = MemoryService(settings)
     context = ContextManager(settings, memory)
     out = context.build("s1", "plan next task", [{"role": "user", "content": "hello"}])
     assert "[USER_REQUEST]" in out
     assert "plan next task" in out
+
+
+class ManyMemories:
+    def search(self, session_id: str, query: str, top_k: int | None = None) -> list[dict]:
+        return [{"text": f"remembered fact number {i} " + "detail " * 40} for i in range(top_k or 3)]
+
+
+def test_context_pack_drops_memory_before_recent_chat(make_settings) -> None:
+    settings = make_settings(max_context_tokens=500, memory_on_chat=True, context_reply_reserve_tokens=100)
+    context = ContextManager(settings, ManyMemories(), counter=TokenCounter("estimate"))
+    history = [{"role": "user", "content": f"turn {i}"} for i in range(12)]
+
+    pack = context.pack("s1", "summarise my week", history)
+
+    assert pack.tokens <= pack.budget
+    assert "summarise my week" in pack.text
+    assert "user: turn 11" in pack.text
+    assert "user: turn 3" not in pack.text
+    assert "number 2" not in pack.text
+    assert pack.truncated == ["memory"]
+
+
+def test_context_pack_truncates_oversized_request_to_fit(make_settings) -> None:
+    settings = make_settings(max_context_tokens=400, context_reply_reserve_tokens=100)
+    context = ContextManager(settings, ManyMemories(), counter=TokenCounter("estimate"))
+    request = "START " + "filler words " * 500 + "END"
+
+    pack = context.pack("s1", request, [{"role": "user", "content": "hello"}])
+
+    assert pack.tokens <= pack.budget
+    assert "START" in pack.text and "END" in pack.text
+    assert "request" in pack.truncated
+    assert "recent_chat" in pack.truncated
+
+
+def test_context_pack_places_summary_before_full_recent_chat(make_settings) -> None:
+    settings = make_settings(context_reply_reserve_tokens=100)
+    context = ContextManager(settings, ManyMemories(), counter=TokenCounter("estimate"))
+    history = [{"role": "user", "content": f"turn {i}"} for i in range(12)]
+
+    pack = context.pack("s1", "what did we decide", history, summary="- user prefers tea")
+
+    assert "[CONVERSATION_SUMMARY]\n- user prefers tea\n[RECENT_CHAT]" in pack.text
+    assert "user: turn 0" in pack.text
+    assert pack.truncated == []
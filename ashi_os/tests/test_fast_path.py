@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from ashi_os.brain.context_manager import ContextManager
+from ashi_os.brain.fast_path import FastPathResponder
+from ashi_os.brain.orchestrator import Orchestrator
+from ashi_os.core.config import Settings
+from ashi_os.logging.audit_log import AuditLogger
+from ashi_os.tools.executor import ToolExecutor
+
+
+class StubMemory:
+    def add_memory(self, session_id: str, text: str, metadata: dict | None = None) -> str:
+        return "mem-1"
+
+    def search(self, session_id: str, query: str, top_k: int | None = None) -> list[dict]:
+        return []
+
+
+class CountingRouter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, prompt: str, **kwargs) -> tuple[str, str, str]:
+        self.calls += 1
+        return ("llm-reply", "stub", "stub-model")
+
+
+def make_orchestrator(tmp_path: Path, settings: Settings, router: CountingRouter) -> Orchestrator:
+    memory = StubMemory()
+    audit = AuditLogger(settings.log_dir)
+    return Orchestrator(
+        router=router,
+        context_manager=ContextManager(settings, memory),
+        memory=memory,
+        audit=audit,
+        memory_on_chat=False,
+        fast_path=FastPathResponder(ToolExecutor(tmp_path, settings.sqlite_path, audit)),
+    )
+
+
+def test_fast_path_matches_only_whole_simple_requests(tmp_path: Path) -> None:
+    responder = FastPathResponder(ToolExecutor(tmp_path, tmp_path / "state.db", AuditLogger(tmp_path / "logs")))
+
+    assert responder.match("What time is it?").name == "time"
+    assert responder.match("list files in Docs/Notes").params == {"path": "Docs/Notes"}
+    assert responder.match("list files then delete them") is None
+    assert responder.match("remind me what time the meeting is") is None
+    assert FastPathResponder().match("show tools") is None
+
+
+def test_fast_path_replies_without_calling_router(tmp_path: Path, make_settings) -> None:
+    (tmp_path / "notes.txt").write_text("x", encoding="utf-8")
+    router = CountingRouter()
+    orchestrator = make_orchestrator(tmp_path, make_settings(), router)
+
+    timed = orchestrator.chat("s-fast", "what time is it")
+    listed = orchestrator.chat("s-fast", "list files")
+
+    assert timed["provider"] == "fast_path"
+    assert timed["reply"].startswith("Current time is")
+    assert "- notes.txt" in listed["reply"]
+    assert router.calls == 0
+    assert len(orchestrator.session_history("s-fast")) == 4
+
+
+def test_non_matching_turns_still_reach_router(tmp_path: Path, make_settings) -> None:
+    router = CountingRouter()
+    orchestrator = make_orchestrator(tmp_path, make_settings(), router)
+
+    result = orchestrator.chat("s-slow", "summarize what time zones India uses")
+
+    assert result["reply"] == "llm-reply"
+    assert router.calls == 1
@@ -1,35 +1,297 @@
-from pathlib import Path
-
-from ashi_os.brain.llm_router import LLMRouter
-from ashi_os.core.config import Settings
-
-
-def test_router_returns_fallback_message_when_no_backends() -> None:
-    settings = Settings(
-        env="test",
-        default_llm="openai",
-        fallback_llm="ollama",
-        ollama_model="none",
-        openai_model="none",
-        openai_api_key="",
-        chroma_dir=Path("./data/chroma"),
-        sqlite_path=Path("./data/state.db"),
-        log_dir=Path("./data/logs"),
-        max_context_tokens=8000,
-        memory_top_k=8,
-        memory_on_chat=False,
-        wake_phrase="hey aashi",
-        default_tts_voice="Samantha",
-        voice_inbox_dir=Path("./data/voice/inbox"),
-        voice_processed_dir=Path("./data/voice/processed"),
-        voice_poll_interval_sec=1.0,
-        mic_sample_rate=16000,
-        mic_chunk_seconds=2.0,
-        mic_channels=1,
-        mic_device_index=None,
-    )
-    router = LLMRouter(settings)
+import threading
+from types import SimpleNamespace
+import time
+
+from ashi_os.brain.llm_clients import LLMClientPool
+from ashi_os.brain.llm_router import LLMRouter, RouteSignals
+from ashi_os.brain.provider_health import ProviderHealth
+
+
+def test_router_returns_fallback_message_when_no_backends(make_settings) -> None:
+    router = LLMRouter(make_settings(default_llm="openai", fallback_llm="ollama"))
     reply, provider, model = router.generate("hello")
     assert provider in {"none", "fallback", "ollama", "openai"}
     assert isinstance(reply, str)
     assert isinstance(model, str)
+
+
+def test_client_pool_reuses_clients_across_calls(make_settings) -> None:
+    pool = LLMClientPool(make_settings())
+    router = LLMRouter(pool.settings, clients=pool)
+    first = pool.ollama()
+    router.generate("hello")
+    assert pool.ollama() is first
+    assert pool.openai() is None
+    pool.close()
+    assert pool.ollama() is not first
+    pool.close()
+
+
+class FailingOllama:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def chat(self, **kwargs):
+        self.calls += 1
+        raise ConnectionError("connection refused")
+
+
+class FakePool:
+    def __init__(self) -> None:
+        self.ollama_client = FailingOllama()
+
+    def ollama(self):
+        return self.ollama_client
+
+    def openai(self):
+        return None
+
+
+def test_circuit_opens_and_skips_failing_provider(make_settings) -> None:
+    settings = make_settings(default_llm="ollama", llm_breaker_failures=2, llm_breaker_cooldown_sec=60)
+    pool = FakePool()
+    router = LLMRouter(settings, clients=pool)
+
+    for _ in range(5):
+        _, provider, _ = router.generate("hello")
+        assert provider == "none"
+
+    assert pool.ollama_client.calls == 2
+    health = router.status()["health"]["ollama"]
+    assert health["state"] == "open"
+    assert "connection refused" in health["last_error"]
+    router.close()
+
+
+def test_probe_closes_open_circuit() -> None:
+    health = ProviderHealth(failure_threshold=1, cooldown_sec=0.02, probe=lambda provider: True)
+    health.record_failure("ollama", 0.1, "down")
+    assert health.allow("ollama") is False
+
+    deadline = time.monotonic() + 2.0
+    while not health.allow("ollama") and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert health.snapshot()["ollama"]["state"] == "closed"
+    health.stop()
+
+
+class SlowOllama:
+    def __init__(self, delay_sec: float) -> None:
+        self.delay_sec = delay_sec
+        self.calls = 0
+
+    def chat(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay_sec)
+        return {"message": {"content": "from-ollama"}}
+
+
+class QuickOpenAI:
+    def __init__(self) -> None:
+        self.responses = SimpleNamespace(create=lambda **kwargs: SimpleNamespace(output_text="from-openai"))
+
+
+class HedgePool:
+    def __init__(self, ollama_delay_sec: float) -> None:
+        self.ollama_client = SlowOllama(ollama_delay_sec)
+        self.openai_client = QuickOpenAI()
+
+    def ollama(self):
+        return self.ollama_client
+
+    def openai(self):
+        return self.openai_client
+
+
+def test_hedge_fires_secondary_when_primary_is_slow(make_settings) -> None:
+    settings = make_settings(
+        default_llm="ollama",
+        openai_api_key="test-key",
+        llm_hedge_mode="all",
+        llm_hedge_delay_ms=50,
+    )
+    router = LLMRouter(settings, clients=HedgePool(ollama_delay_sec=0.5))
+
+    reply, provider, _ = router.generate("hello")
+
+    assert reply == "from-openai"
+    assert provider == "fallback"
+    assert router.status()["hedging"] == {"mode": "all", "requests": 1, "fired": 1, "won": 1}
+    router.close()
+
+
+def test_hedge_voice_mode_only_applies_when_requested(make_settings) -> None:
+    settings = make_settings(
+        default_llm="ollama",
+        openai_api_key="test-key",
+        llm_hedge_mode="voice",
+        llm_hedge_delay_ms=500,
+    )
+    router = LLMRouter(settings, clients=HedgePool(ollama_delay_sec=0.0))
+
+    assert router.generate("hello")[0] == "from-ollama"
+    assert router.generate("hello", hedge=True)[0] == "from-ollama"
+    assert router.status()["hedging"]["requests"] == 1
+    assert router.status()["hedging"]["fired"] == 0
+    router.close()
+
+
+def test_concurrent_identical_prompts_share_one_upstream_call(make_settings) -> None:
+    settings = make_settings(default_llm="ollama")
+    pool = HedgePool(ollama_delay_sec=0.3)
+    router = LLMRouter(settings, clients=pool)
+    results = []
+
+    def _ask() -> None:
+        results.append(router.generate("same prompt"))
+
+    threads = [threading.Thread(target=_ask) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pool.ollama_client.calls == 1
+    assert results == [("from-ollama", "ollama", "model")] * 6
+    coalescing = router.status()["coalescing"]
+    assert coalescing["leaders"] == 1
+    assert coalescing["coalesced"] == 5
+    assert coalescing["in_flight"] == 0
+
+
+class LoadingOllama:
+    def __init__(self) -> None:
+        self.loaded = threading.Event()
+        self.release = threading.Event()
+        self.calls: list[tuple[str, dict]] = []
+
+    def generate(self, **kwargs):
+        self.calls.append(("generate", kwargs))
+        self.release.wait(2.0)
+        self.loaded.set()
+        return {"response": "", "done": True}
+
+    def chat(self, **kwargs):
+        self.calls.append(("chat", kwargs))
+        return {"message": {"content": "warm"}}
+
+
+class WarmupPool:
+    def __init__(self) -> None:
+        self.ollama_client = LoadingOllama()
+
+    def ollama(self):
+        return self.ollama_client
+
+    def openai(self):
+        return None
+
+
+def test_warmup_preloads_model_and_flips_ready(make_settings) -> None:
+    settings = make_settings(default_llm="ollama", ollama_model="llama3", ollama_keep_alive="600")
+    pool = WarmupPool()
+    router = LLMRouter(settings, clients=pool)
+
+    thread = router.start_warmup()
+    assert router.warmup_status()["ready"] is False
+    pool.ollama_client.release.set()
+    thread.join(2.0)
+
+    status = router.warmup_status()
+    assert status["ready"] is True
+    assert status["state"] == "ready"
+    assert pool.ollama_client.calls[0] == ("generate", {"model": "llama3", "prompt": "", "keep_alive": 600.0})
+
+    router.generate("hello")
+    assert pool.ollama_client.calls[1][1]["keep_alive"] == 600.0
+    router.close()
+
+
+def test_warmup_skipped_without_ollama_or_when_disabled(make_settings) -> None:
+    settings = make_settings(default_llm="openai", fallback_llm="none")
+    assert LLMRouter(settings, clients=WarmupPool()).start_warmup() is None
+
+    disabled = make_settings(ollama_warmup=False)
+    router = LLMRouter(disabled, clients=WarmupPool())
+    router.start_warmup()
+    assert router.warmup_status() == {
+        "ready": True,
+        "degraded": False,
+        "state": "skipped",
+        "duration_sec": None,
+        "error": None,
+    }
+
+
+class UnreachableOllama:
+    def generate(self, **kwargs):
+        raise ConnectionError("connection refused")
+
+
+def test_failed_warmup_is_degraded_not_ready(make_settings) -> None:
+    pool = WarmupPool()
+    pool.ollama_client = UnreachableOllama()
+    router = LLMRouter(make_settings(default_llm="ollama"), clients=pool)
+
+    router.start_warmup().join(2.0)
+
+    status = router.warmup_status()
+    assert status["state"] == "failed"
+    assert status["ready"] is False
+    assert status["degraded"] is True
+    assert "connection refused" in status["error"]
+    router.close()
+
+
+class ModelRecordingOllama:
+    def __init__(self) -> None:
+        self.models: list[str] = []
+
+    def chat(self, **kwargs):
+        self.models.append(kwargs["model"])
+        return {"message": {"content": f"from {kwargs['model']}"}}
+
+
+class ModelRecordingPool:
+    def __init__(self) -> None:
+        self.ollama_client = ModelRecordingOllama()
+
+    def ollama(self):
+        return self.ollama_client
+
+    def openai(self):
+        return None
+
+
+def test_router_sends_simple_low_risk_turns_to_fast_tier(make_settings) -> None:
+    settings = make_settings(
+        default_llm="ollama",
+        ollama_model="big",
+        ollama_fast_model="small",
+        llm_fast_max_steps=1,
+        llm_fast_max_prompt_tokens=200,
+        llm_coalesce_enabled=False,
+    )
+    pool = ModelRecordingPool()
+    router = LLMRouter(settings, clients=pool)
+
+    assert router.generate("time?", signals=RouteSignals(1, "low", 50)) == ("from small", "ollama", "small")
+    router.generate("plan", signals=RouteSignals(3, "low", 50))
+    router.generate("install", signals=RouteSignals(1, "medium", 50))
+    router.generate("long", signals=RouteSignals(1, "low", 900))
+    router.generate("unrouted")
+
+    assert pool.ollama_client.models == ["small", "big", "big", "big", "big"]
+    tiers = router.status()["tiers"]
+    assert tiers["enabled"] is True
+    assert tiers["fast"]["requests"] == 1
+    assert tiers["large"]["requests"] == 4
+    assert tiers["fast"]["models"]["ollama"] == "small"
+    router.close()
+
+
+def test_router_without_fast_model_always_uses_large_tier(make_settings) -> None:
+    router = LLMRouter(make_settings(default_llm="ollama"), clients=ModelRecordingPool())
+    assert router.select_tier(RouteSignals(1, "low", 10)) == "large"
+    assert router.status()["tiers"]["enabled"] is False
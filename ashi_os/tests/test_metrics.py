@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ashi_os.api.routes_admin import router as admin_router
+from ashi_os.logging.audit_log import AuditLogger
+from ashi_os.logging.metrics import TOOL_EXECUTIONS, MetricsRegistry
+from ashi_os.tools.executor import ToolExecutor
+
+
+def test_histogram_renders_cumulative_prometheus_buckets() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Demo latency.", ("stage",), buckets=(0.1, 1.0))
+    calls = registry.counter("demo_total", "Demo calls.", ("outcome",))
+    latency.observe(0.05, stage="stt")
+    latency.observe(0.5, stage="stt")
+    latency.observe(2.0, stage="stt")
+    calls.inc(outcome='bad"quote')
+
+    text = registry.render()
+
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{stage="stt",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="stt",le="1"} 2' in text
+    assert 'demo_seconds_bucket{stage="stt",le="+Inf"} 3' in text
+    assert 'demo_seconds_sum{stage="stt"} 2.55' in text
+    assert 'demo_seconds_count{stage="stt"} 3' in text
+    assert 'demo_total{outcome="bad\\"quote"} 1' in text
+    assert registry.histogram("demo_seconds", "ignored") is latency
+
+
+def test_tool_metrics_collapse_unknown_labels_and_serve_endpoint(tmp_path: Path) -> None:
+    executor = ToolExecutor(tmp_path, tmp_path / "state.db", AuditLogger(tmp_path / "logs"))
+    before = TOOL_EXECUTIONS.value(tool="filesystem", action="list", outcome="success")
+    unknown_before = TOOL_EXECUTIONS.value(tool="unknown", action="unknown", outcome="failure")
+
+    executor.execute("s1", "filesystem", "list", {"path": "."})
+    executor.execute("s1", "made-up-tool", "anything", {})
+
+    assert TOOL_EXECUTIONS.value(tool="filesystem", action="list", outcome="success") == before + 1
+    assert TOOL_EXECUTIONS.value(tool="unknown", action="unknown", outcome="failure") == unknown_before + 1
+
+    app = FastAPI()
+    app.include_router(admin_router)
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'ashi_tool_seconds_count{tool="filesystem",action="list"}' in response.text
+    assert "ashi_audit_write_seconds_count" in response.text
+
+
+class WarmRouter:
+    def warmup_status(self) -> dict:
+        return {"ready": True, "degraded": False, "state": "ready", "duration_sec": 0.1, "error": None}
+
+
+class CountingStats:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def stats(self) -> dict:
+        self.calls += 1
+        return {"pending": 0}
+
+
+def test_health_reports_warmup_only_and_status_has_the_counters() -> None:
+    app = FastAPI()
+    app.include_router(admin_router)
+    app.state.router = WarmRouter()
+    app.state.write_behind = CountingStats()
+    app.state.confirmation = CountingStats()
+    app.state.memory = CountingStats()
+    client = TestClient(app)
+
+    health = client.get("/health").json()
+    assert set(health) == {"status", "ready", "degraded", "warmup"}
+    assert app.state.confirmation.calls == app.state.memory.calls == app.state.write_behind.calls == 0
+
+    status = client.get("/status").json()
+    assert status["confirmations"] == {"pending": 0}
+    assert {"write_behind", "plan_cache", "memory"} <= set(status)
+    assert app.state.confirmation.calls == 1
@@ -0,0 +1,151 @@
+import threading
+
+from ashi_os.agents.coordinator import AgentCoordinator
+from ashi_os.agents.execution_agent import ExecutionAgent
+from ashi_os.agents.memory_agent import MemoryAgent
+from ashi_os.agents.research_agent import ResearchAgent
+from ashi_os.agents.supervisor_agent import SupervisorAgent
+from ashi_os.agents.validation_agent import ValidationAgent
+from ashi_os.brain.confirmation import ConfirmationManager
+from ashi_os.brain.context_manager import ContextManager
+from ashi_os.brain.orchestrator import Orchestrator
+from ashi_os.brain.planning import RiskEvaluator, StrategicPlanner
+from ashi_os.core.config import Settings
+
+
+class BlockingMemory:
+    # search() meets the other stage at a barrier, or waits for a release, so overlap is
+    # proven by the calls completing rather than by timing them.
+    def __init__(self, barrier: threading.Barrier | None = None, release: threading.Event | None = None) -> None:
+        self.barrier = barrier
+        self.release = release
+        self.searched = 0
+        self.added: list[str] = []
+
+    def add_memory(self, session_id: str, text: str, metadata: dict | None = None) -> str:
+        self.added.append(text)
+        return f"mem-{len(self.added)}"
+
+    def search(self, session_id: str, query: str, top_k: int | None = None) -> list[dict]:
+        if self.barrier is not None:
+            self.barrier.wait()
+        if self.release is not None:
+            self.release.wait(5)
+        self.searched += 1
+        return [{"id": "m1", "text": "remembered fact", "metadata": {"session_id": session_id}}]
+
+
+class BarrierPlanner(StrategicPlanner):
+    def __init__(self, barrier: threading.Barrier) -> None:
+        self.barrier = barrier
+
+    def build_plan(self, user_message: str):
+        # Only returns once recall is running at the same time.
+        self.barrier.wait()
+        return super().build_plan(user_message)
+
+
+class BarrierTools:
+    def __init__(self, barrier: threading.Barrier) -> None:
+        self.barrier = barrier
+
+    def execute(self, session_id: str, tool: str, action: str, params: dict, confirm: bool = False) -> dict:
+        self.barrier.wait()
+        return {"ok": True}
+
+
+class RecordingAudit:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, dict]] = []
+
+    def write(self, event: str, payload: dict) -> None:
+        self.events.append((event, payload))
+
+
+class StubRouter:
+    def generate(self, prompt: str, **kwargs) -> tuple[str, str, str]:
+        return ("reply", "stub", "stub-model")
+
+
+def make_orchestrator(settings: Settings, memory: BlockingMemory, audit: RecordingAudit) -> Orchestrator:
+    return Orchestrator(
+        router=StubRouter(),
+        context_manager=ContextManager(settings, memory),
+        memory=memory,
+        audit=audit,
+        memory_on_chat=settings.memory_on_chat,
+    )
+
+
+def test_chat_recall_overlaps_planning(make_settings) -> None:
+    # Planning and recall each wait for the other at the barrier, so the turn only completes
+    # if they run concurrently; a serial pipeline breaks the barrier instead.
+    barrier = threading.Barrier(2, timeout=5)
+    audit = RecordingAudit()
+    orchestrator = make_orchestrator(make_settings(memory_on_chat=True), BlockingMemory(barrier=barrier), audit)
+    orchestrator.planner = BarrierPlanner(barrier)
+
+    result = orchestrator.chat("s-overlap", "summarize my notes")
+
+    assert result["reply"] == "reply"
+    stages = dict(audit.events)["chat.completed"]["stages"]
+    assert stages["memory"]["start_ms"] < stages["plan"]["start_ms"] + stages["plan"]["ms"]
+    assert {"plan", "risk", "recall_wait", "pack", "llm"} <= set(stages)
+    orchestrator.close()
+
+
+def test_gated_chat_does_not_wait_for_recall(make_settings) -> None:
+    release = threading.Event()
+    memory = BlockingMemory(release=release)
+    orchestrator = make_orchestrator(make_settings(memory_on_chat=True), memory, RecordingAudit())
+
+    result = orchestrator.chat("s-gated", "delete project files")
+
+    assert result["confirmation_required"] is True
+    # Recall is still blocked, so the gated reply did not wait for it.
+    assert memory.searched == 0
+    release.set()
+    orchestrator.close()
+
+
+def test_recall_follows_orchestrator_flag_and_pool_size(make_settings) -> None:
+    settings = make_settings(memory_on_chat=True, llm_pool_size=12)
+    memory = BlockingMemory()
+    orchestrator = Orchestrator(
+        router=StubRouter(),
+        context_manager=ContextManager(settings, memory),
+        memory=memory,
+        audit=RecordingAudit(),
+        memory_on_chat=False,
+    )
+    assert orchestrator._recall_pool._max_workers == 12
+
+    orchestrator.chat("s-off", "summarize my notes")
+
+    assert memory.searched == 0 and memory.added == []
+    orchestrator.close()
+
+
+def test_agent_research_overlaps_execution() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    memory = BlockingMemory(barrier=barrier)
+    audit = RecordingAudit()
+    coordinator = AgentCoordinator(
+        research=ResearchAgent(memory=memory, top_k=3),
+        execution=ExecutionAgent(tool_executor=BarrierTools(barrier)),
+        validation=ValidationAgent(),
+        memory_agent=MemoryAgent(memory=memory),
+        supervisor=SupervisorAgent(),
+        planner=StrategicPlanner(),
+        risk_evaluator=RiskEvaluator(),
+        confirmation=ConfirmationManager(),
+        audit=audit,
+    )
+
+    result = coordinator.run(session_id="agent-overlap", objective="list files", auto_execute=True)
+
+    assert result["research"]["facts"] == ["remembered fact"]
+    assert result["validation"]["success_count"] == 1
+    stages = dict(audit.events)["agents.completed"]["stages"]
+    assert stages["research"]["start_ms"] < stages["execute"]["start_ms"] + stages["execute"]["ms"]
+    coordinator.close()
@@ -1,44 +1,19 @@
-from pathlib import Path
+import dataclasses
+
+import pytest
 
 from ashi_os.brain.orchestrator import Orchestrator
 from ashi_os.brain.planning import RiskEvaluator, StrategicPlanner
 from ashi_os.brain.context_manager import ContextManager
-from ashi_os.core.config import Settings
 from ashi_os.logging.audit_log import AuditLogger
 from ashi_os.memory.memory_service import MemoryService
 
 
 class StubRouter:
-    def generate(self, prompt: str) -> tuple[str, str, str]:
+    def generate(self, prompt: str, **kwargs) -> tuple[str, str, str]:
         return ("stub-reply", "stub", "stub-model")
 
 
-def make_settings() -> Settings:
-    return Settings(
-        env="test",
-        default_llm="ollama",
-        fallback_llm="openai",
-        ollama_model="model",
-        openai_model="model",
-        openai_api_key="",
-        chroma_dir=Path("./data/chroma"),
-        sqlite_path=Path("./data/state.db"),
-        log_dir=Path("./data/logs"),
-        max_context_tokens=8000,
-        memory_top_k=3,
-        memory_on_chat=False,
-        wake_phrase="hey aashi",
-        default_tts_voice="Samantha",
-        voice_inbox_dir=Path("./data/voice/inbox"),
-        voice_processed_dir=Path("./data/voice/processed"),
-        voice_poll_interval_sec=1.0,
-        mic_sample_rate=16000,
-        mic_chunk_seconds=2.0,
-        mic_channels=1,
-        mic_device_index=None,
-    )
-
-
 def test_planner_decomposes_multistep_request() -> None:
     planner = StrategicPlanner()
     plan = planner.build_plan("open browser and search weather then summarize")
@@ -53,7 +28,7 @@ def test_risk_evaluator_high_requires_confirmation() -> None:
     assert risk.confirmation_required is True
 
 
-def test_orchestrator_confirmation_roundtrip() -> None:
+def test_orchestrator_confirmation_roundtrip(make_settings) -> None:
     settings = make_settings()
     memory = MemoryService(settings)
     context = ContextManager(settings, memory)
@@ -61,7 +36,7 @@ def test_orchestrator_confirmation_roundtrip() -> None:
         router=StubRouter(),
         context_manager=context,
         memory=memory,
-        audit=AuditLogger(Path("./data/logs")),
+        audit=AuditLogger(settings.log_dir),
         memory_on_chat=False,
     )
 
@@ -73,3 +48,22 @@ def test_orchestrator_confirmation_roundtrip() -> None:
     approved = orchestrator.chat("s-confirm", f"confirm {token}")
     assert approved["confirmation_required"] is False
     assert approved["reply"] == "stub-reply"
+
+
+def test_planner_caches_immutable_plans() -> None:
+    planner = StrategicPlanner()
+    first = planner.build_plan("  list files then read file notes.txt  ")
+    again = StrategicPlanner().build_plan("list files then read file notes.txt")
+    assert again is first
+    assert [step["task"] for step in first.as_dict()["steps"]] == ["list files", "read file notes.txt"]
+    # Callers get their own payload, so mutating one cannot leak into the shared plan.
+    payload = again.as_dict()
+    payload["steps"][0]["task"] = "delete everything"
+    payload["steps"].clear()
+    assert first.as_dict()["steps"][0]["task"] == "list files"
+    assert isinstance(first.steps, tuple)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.objective = "other"
+
+    long_objective = "read file a.txt and " * 300
+    assert planner.build_plan(long_objective) is not planner.build_plan(long_objective)
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+from ashi_os.bench.policy import automaton_scanner, legacy_scan, make_text, run_benchmark, single_pass_scanner
+from ashi_os.brain.planning import RiskEvaluator, StrategicPlanner
+from ashi_os.core.policy import (
+    BLOCKED_TOKEN,
+    DESTRUCTIVE,
+    RISK_HIGH,
+    RISK_MEDIUM,
+    PolicyEngine,
+    PolicyRule,
+    default_policy,
+)
+from ashi_os.core.security import is_destructive_command
+from ashi_os.logging.audit_log import AuditLogger
+from ashi_os.tools.executor import ToolExecutor
+
+
+def test_scan_reports_every_category_once_in_order() -> None:
+    hits = default_policy().scan("RM -RF the build, then rm -rf again and send mail about the transferase")
+    assert [(hit.category, hit.term) for hit in hits] == [
+        (RISK_HIGH, "erase"),
+        (RISK_HIGH, "rm -rf"),
+        (RISK_HIGH, "transfer"),
+        (RISK_MEDIUM, "send mail"),
+        (DESTRUCTIVE, "rm -rf"),
+    ]
+    assert [hit.weight for hit in hits] == [3, 3, 3, 1, 10]
+    assert default_policy().scan("summarize the weekly report") == []
+
+
+def test_scan_matches_legacy_checks() -> None:
+    policy = default_policy()
+    for seed in range(20):
+        text = make_text(400, seed, ("shutdown", "dd if=/dev/zero", "API Key", "signup"))
+        assert {hit.term for hit in policy.scan(text)} == set(legacy_scan(text))
+
+
+def test_scan_tokens_matches_whole_tokens_only() -> None:
+    policy = PolicyEngine([PolicyRule("rm", BLOCKED_TOKEN, 10, token=True), PolicyRule("delete", RISK_HIGH, 3)])
+    assert [hit.term for hit in policy.scan_tokens(["echo", "rm"])] == ["rm"]
+    assert policy.scan_tokens(["echo", "rmdir", "RM"]) == []
+    assert policy.scan("rm it") == []
+
+
+def test_risk_evaluator_reuses_precomputed_hits() -> None:
+    evaluator = RiskEvaluator()
+    plan = StrategicPlanner().build_plan("check balance")
+    hits = default_policy().scan("transfer funds from the bank")
+    risk = evaluator.evaluate("unrelated text", plan, hits)
+    assert risk.level == "high"
+    assert risk.score == 6
+    assert risk.reasons[:2] == ["High-risk indicator: 'bank'", "High-risk indicator: 'transfer'"]
+
+
+def test_destructive_checks_share_the_engine(tmp_path: Path) -> None:
+    policy = PolicyEngine([PolicyRule("wipe", DESTRUCTIVE, 10), PolicyRule("wipe", BLOCKED_TOKEN, 10, token=True)])
+    assert is_destructive_command("please WIPE it", policy) is True
+    assert is_destructive_command("rm -rf /", policy) is False
+
+    executor = ToolExecutor(tmp_path, tmp_path / "state.db", AuditLogger(tmp_path / "logs"), policy=policy)
+    gated = executor.execute("s1", "code", "run", {"command": "echo wipe"})
+    assert gated["risk"] == "elevated"
+    blocked = executor.execute("s1", "code", "run", {"command": "echo wipe"}, confirm=True)
+    assert blocked["message"] == "Command blocked by safety policy."
+
+
+def test_policy_benchmark_variants_agree() -> None:
+    results = run_benchmark([64, 2048], repeat=1, seed=3)
+    for row in results["sizes"].values():
+        assert row["agree"] is True
+        assert row["engine"]["us_per_call"] > 0
+
+
+def test_single_pass_scanners_find_overlapping_terms() -> None:
+    policy = default_policy()
+    scanners = (single_pass_scanner(), automaton_scanner())
+    for text in ("deletexecute", "automationdrop tablemaildrop tablereboot", "send mailrm -rfdd if=", "nothing here"):
+        expected = {hit.term for hit in policy.scan(text)}
+        assert all(set(scan(text)) == expected for scan in scanners)
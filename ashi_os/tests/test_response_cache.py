@@ -0,0 +1,123 @@
+from pathlib import Path
+import time
+
+from ashi_os.brain.llm_router import LLMRouter
+from ashi_os.brain.response_cache import ResponseCache
+
+
+class CountingOllama:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def chat(self, **kwargs):
+        self.calls += 1
+        return {"message": {"content": f"reply-{self.calls}"}}
+
+
+class OllamaOnlyPool:
+    def __init__(self) -> None:
+        self.client = CountingOllama()
+
+    def ollama(self):
+        return self.client
+
+    def openai(self):
+        return None
+
+
+class KeywordEmbedder:
+    def __init__(self) -> None:
+        self.seen: list[str] = []
+
+    def name(self) -> str:
+        return "keywords"
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.seen.extend(texts)
+        vocab = ["weather", "today", "time", "file"]
+        return [[float(word in text) for word in vocab] for text in texts]
+
+
+def test_cache_exact_hit_ignores_case_and_whitespace() -> None:
+    cache = ResponseCache(max_entries=4, ttl_sec=60)
+    cache.put("ollama", "m", "What  is the weather?", "sunny")
+
+    assert cache.get([("ollama", "m")], "what is the WEATHER?") == ("sunny", "m")
+    assert cache.get([("openai", "m")], "what is the weather?") is None
+    stats = cache.stats()
+    assert stats["exact_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cache_expires_and_evicts_least_recently_used() -> None:
+    cache = ResponseCache(max_entries=2, ttl_sec=0.05)
+    cache.put("ollama", "m", "a", "1")
+    cache.put("ollama", "m", "b", "2")
+    cache.get([("ollama", "m")], "a")
+    cache.put("ollama", "m", "c", "3")
+
+    assert cache.get([("ollama", "m")], "b") is None
+    assert cache.get([("ollama", "m")], "a") == ("1", "m")
+    time.sleep(0.06)
+    assert cache.get([("ollama", "m")], "a") is None
+
+
+def test_cache_persists_to_sqlite(tmp_path: Path) -> None:
+    ResponseCache(max_entries=4, ttl_sec=60, sqlite_path=tmp_path / "state.db").put("ollama", "m", "hi", "hello")
+
+    reloaded = ResponseCache(max_entries=4, ttl_sec=60, sqlite_path=tmp_path / "state.db")
+    assert reloaded.get([("ollama", "m")], "hi") == ("hello", "m")
+
+
+def test_cache_near_duplicate_tier() -> None:
+    cache = ResponseCache(max_entries=4, ttl_sec=60, embedder=KeywordEmbedder(), similarity=0.99)
+    cache.put("ollama", "m", "weather today please", "sunny")
+
+    assert cache.get([("ollama", "m")], "what is the weather today") == ("sunny", "m")
+    assert cache.get([("ollama", "m")], "list file") is None
+    assert cache.stats()["near_hits"] == 1
+
+
+def templated(memory: str, request: str) -> str:
+    return f"[RECENT_CHAT]\n- none\n[MEMORY]\n{memory}\n[USER_REQUEST]\n{request}"
+
+
+def test_cache_near_duplicate_embeds_request_within_same_context() -> None:
+    embedder = KeywordEmbedder()
+    cache = ResponseCache(max_entries=4, ttl_sec=60, embedder=embedder, similarity=0.99)
+    cache.put("ollama", "m", templated("likes tea", "weather today please"), "sunny")
+
+    assert embedder.seen == ["weather today please"]
+    assert cache.get([("ollama", "m")], templated("likes tea", "what is the weather today")) == ("sunny", "m")
+    # Same request, different memory: the reply may depend on it, so no near hit.
+    assert cache.get([("ollama", "m")], templated("likes coffee", "weather today please")) is None
+    assert cache.stats()["near_hits"] == 1 and cache.stats()["misses"] == 1
+
+    for i in range(10):
+        cache.put("ollama", "m", templated(f"fact {i}", "weather today"), "sunny")
+    assert len(cache._buckets) == 4
+    assert sum(len(keys) for keys in cache._buckets.values()) == 4
+
+
+def test_router_serves_repeat_prompt_from_cache(make_settings) -> None:
+    pool = OllamaOnlyPool()
+    router = LLMRouter(make_settings(), clients=pool)
+
+    first = router.generate("hello", cache=True)
+    second = router.generate("hello", cache=True)
+    uncached = router.generate("hello")
+
+    assert first == ("reply-1", "ollama", "model")
+    assert second == ("reply-1", "cache", "model")
+    assert uncached[0] == "reply-2"
+    assert pool.client.calls == 2
+    assert router.status()["cache"]["misses"] == 1
+
+
+def test_router_does_not_cache_missing_backend(make_settings) -> None:
+    settings = make_settings(default_llm="none")
+    router = LLMRouter(settings, clients=OllamaOnlyPool())
+
+    router.generate("hello", cache=True)
+    assert router.status()["cache"]["stores"] == 0
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from ashi_os.brain.risk_replay import ReplayConfig, replay
+from ashi_os.logging.audit_log import AuditLogger
+
+
+def write_log(tmp_path: Path) -> Path:
+    audit = AuditLogger(tmp_path / "logs")
+    audit.write("chat.completed", {"session_id": "s1", "user_message": "summarize my notes", "risk_level": "low"})
+    audit.write("chat.completed", {"session_id": "s1", "user_message": "install it and email bob", "risk_level": "low"})
+    audit.write(
+        "chat.confirmation_required",
+        {"session_id": "s1", "user_message": "transfer funds to the bank", "token": "t1", "risk_level": "high"},
+    )
+    audit.write("blocked.destructive", {"session_id": "s1", "message": "please mkfs /dev/sda", "token": "t2"})
+    audit.write("agents.completed", {"session_id": "s2", "objective": "run command ls", "risk_level": "low"})
+    audit.write("tool.executed", {"session_id": "s2", "tool": "code", "action": "run", "params": {}, "ok": True})
+    with audit.path.open("a", encoding="utf-8") as handle:
+        handle.write("{not json\n")
+        handle.write('{"event": "chat.completed", "payload": {"risk_level": "low"}}\n')
+    return audit.path
+
+
+def test_replay_aggregates_levels_and_diffs(tmp_path: Path) -> None:
+    path = write_log(tmp_path)
+    result = replay(path, workers=0, chunk_size=2)
+
+    assert result["lines"] == 8
+    assert result["records"] == 5
+    assert result["skipped"] == {"malformed": 1, "missing_text": 1}
+    assert result["levels"] == {"low": 2, "medium": 1, "high": 2}
+    assert result["destructive"] == 1
+    assert result["compared"] == 5
+    assert result["transitions"] == {"low->medium": 1}
+    assert result["examples"][0]["text"] == "install it and email bob"
+
+
+def test_replay_thresholds_and_process_pool_agree(tmp_path: Path) -> None:
+    path = write_log(tmp_path)
+    config = ReplayConfig(high_score=2, medium_score=1, examples=1)
+    inline = replay(path, workers=0, chunk_size=3, config=config)
+    pooled = replay(path, workers=2, chunk_size=3, config=config)
+
+    assert inline["levels"] == {"low": 1, "medium": 1, "high": 3}
+    assert inline["transitions"] == {"low->high": 1, "low->medium": 1}
+    assert len(inline["examples"]) == 1
+    for key in ("lines", "records", "levels", "transitions", "skipped", "changed"):
+        assert pooled[key] == inline[key]
@@ -0,0 +1,181 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ashi_os.api.routes_chat import router as chat_router
+from ashi_os.brain.confirmation import ConfirmationManager
+from ashi_os.brain.context_manager import ContextManager
+from ashi_os.brain.orchestrator import Orchestrator
+from ashi_os.brain.session_locks import SessionLocks
+from ashi_os.brain.session_store import SessionStore
+from ashi_os.logging.audit_log import AuditLogger
+
+
+class StubMemory:
+    def add_memory(self, session_id: str, text: str, metadata: dict | None = None) -> str:
+        return "mem-1"
+
+    def search(self, session_id: str, query: str, top_k: int | None = None) -> list[dict]:
+        return []
+
+
+class OverlapRouter:
+    # Counts turns in flight per session and overall while a reply is being "generated".
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.active: dict[str, int] = {}
+        self.session_peak = 0
+        self.global_active = 0
+        self.global_peak = 0
+
+    def _enter(self, prompt: str) -> str:
+        request = prompt.rsplit("\n", 1)[-1]
+        session_id = request.split(":", 1)[0]
+        with self._lock:
+            self.active[session_id] = self.active.get(session_id, 0) + 1
+            self.session_peak = max(self.session_peak, self.active[session_id])
+            self.global_active += 1
+            self.global_peak = max(self.global_peak, self.global_active)
+        return request
+
+    def _leave(self, request: str) -> None:
+        with self._lock:
+            self.active[request.split(":", 1)[0]] -= 1
+            self.global_active -= 1
+
+    def generate(self, prompt: str, **kwargs) -> tuple[str, str, str]:
+        request = self._enter(prompt)
+        time.sleep(0.002)
+        self._leave(request)
+        return (f"re {request}", "stub", "stub-model")
+
+    async def agenerate(self, prompt: str, **kwargs) -> tuple[str, str, str]:
+        request = self._enter(prompt)
+        await asyncio.sleep(0.002)
+        self._leave(request)
+        return (f"re {request}", "stub", "stub-model")
+
+    def generate_stream(self, prompt: str, **kwargs):
+        request = self._enter(prompt)
+        try:
+            for chunk in ("re ", request):
+                time.sleep(0.001)
+                yield chunk, "stub", "stub-model"
+        finally:
+            self._leave(request)
+
+
+def test_many_threads_keep_each_session_ordered_and_sessions_parallel(make_settings) -> None:
+    settings = make_settings()
+    memory = StubMemory()
+    router = OverlapRouter()
+    orchestrator = Orchestrator(
+        router=router,
+        context_manager=ContextManager(settings, memory),
+        memory=memory,
+        audit=AuditLogger(settings.log_dir),
+        memory_on_chat=False,
+        sessions=SessionStore(settings.sqlite_path),
+    )
+    app = FastAPI()
+    app.state.orchestrator = orchestrator
+    app.include_router(chat_router)
+
+    sessions = [f"s{i}" for i in range(8)]
+    per_session = 12
+
+    def _send(session_id: str, i: int) -> None:
+        message = f"{session_id}: message {i}"
+        if i % 3 == 0:
+            body = client.post("/chat/stream", json={"session_id": session_id, "user_message": message}).text
+            assert "event: done" in body
+        elif i % 3 == 1:
+            response = client.post("/chat", json={"session_id": session_id, "user_message": message})
+            assert response.status_code == 200
+        else:
+            orchestrator.chat(session_id, message)
+
+    with TestClient(app) as client, ThreadPoolExecutor(max_workers=32) as pool:
+        futures = [pool.submit(_send, sid, i) for i in range(per_session) for sid in sessions]
+        for future in futures:
+            future.result()
+
+    assert router.session_peak == 1
+    assert router.global_peak > 1
+    assert orchestrator.locks.active() == 0
+    for session_id in sessions:
+        history = orchestrator.session_history(session_id)
+        assert len(history) == 2 * per_session
+        # Every user turn is immediately followed by its own reply.
+        for user, assistant in zip(history[::2], history[1::2]):
+            assert user["role"] == "user" and assistant["role"] == "assistant"
+            assert assistant["content"] == f"re {user['content']}"
+
+
+def test_confirmation_token_is_redeemed_once_under_contention() -> None:
+    confirmation = ConfirmationManager()
+    token = confirmation.create("s1", "delete project files")
+    barrier = threading.Barrier(16)
+
+    def _redeem(_: int) -> tuple[bool, str]:
+        barrier.wait()
+        return confirmation.consume_if_valid("s1", f"confirm {token}")
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(_redeem, range(16)))
+
+    assert results.count((True, "delete project files")) == 1
+    assert results.count((False, "")) == 15
+
+
+def test_async_waiter_cancelled_before_lock_does_not_leak() -> None:
+    locks = SessionLocks()
+
+    async def _run() -> None:
+        async with locks.ahold("s1"):
+            waiter = asyncio.create_task(_hold_briefly())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+        await asyncio.sleep(0.05)
+
+    async def _hold_briefly() -> None:
+        async with locks.ahold("s1"):
+            pass
+
+    asyncio.run(_run())
+    assert locks.active() == 0
+    with locks.hold("s1"):
+        pass
+
+
+def test_unread_stream_does_not_hold_the_session(tmp_path: Path, make_settings) -> None:
+    orchestrator = Orchestrator(
+        router=OverlapRouter(),
+        context_manager=ContextManager(make_settings(), StubMemory()),
+        memory=StubMemory(),
+        audit=AuditLogger(tmp_path / "logs"),
+        memory_on_chat=False,
+    )
+    stream = orchestrator.chat_stream("s1", "first")
+    assert next(stream)["event"] == "token"
+
+    # The client stops reading; the next turn of the session still runs.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        reply = pool.submit(orchestrator.chat, "s1", "second").result(timeout=5)
+    assert reply["reply"] == "re second"
+    assert [event["event"] for event in stream][-1] == "done"
+    history = [turn["content"] for turn in orchestrator.session_history("s1")]
+    assert history == ["first", "re first", "second", "re second"]
+
+
+def test_app_shares_session_locks_between_chat_and_agents(make_settings, monkeypatch) -> None:
+    from ashi_os.api import app as app_module
+
+    monkeypatch.setattr(app_module, "get_settings", lambda: make_settings())
+    app = app_module.create_app()
+    assert app.state.agent_coordinator.locks is app.state.orchestrator.locks
@@ -0,0 +1,108 @@
+from ashi_os.brain.context_manager import ContextManager
+from ashi_os.brain.llm_router import LLMRouter
+from ashi_os.brain.orchestrator import Orchestrator
+from ashi_os.core.config import Settings
+from ashi_os.logging.audit_log import AuditLogger
+
+
+class SwitchableMemory:
+    def __init__(self) -> None:
+        self.facts = ["likes tea"]
+
+    def add_memory(self, session_id: str, text: str, metadata: dict | None = None) -> str:
+        return "mem-1"
+
+    def search(self, session_id: str, query: str, top_k: int | None = None) -> list[dict]:
+        return [{"text": fact} for fact in self.facts]
+
+
+class ContextOllama:
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+
+    def generate(self, **kwargs):
+        self.requests.append(kwargs)
+        context = list(kwargs.get("context") or []) + [len(self.requests)]
+        return {"response": f"reply {len(self.requests)}", "context": context, "done": True}
+
+
+class ContextPool:
+    def __init__(self) -> None:
+        self.client = ContextOllama()
+
+    def ollama(self):
+        return self.client
+
+    def openai(self):
+        return None
+
+
+def make_orchestrator(settings: Settings, memory: SwitchableMemory, pool: ContextPool) -> tuple[Orchestrator, LLMRouter]:
+    router = LLMRouter(settings, clients=pool)
+    orchestrator = Orchestrator(
+        router=router,
+        context_manager=ContextManager(settings, memory),
+        memory=memory,
+        audit=AuditLogger(settings.log_dir),
+        memory_on_chat=settings.memory_on_chat,
+    )
+    return orchestrator, router
+
+
+def test_prompt_layout_puts_stable_blocks_first(make_settings) -> None:
+    context = ContextManager(make_settings(memory_on_chat=True, llm_cache_enabled=False), SwitchableMemory())
+    history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+
+    first = context.pack("s1", "what now", history[:0]).text
+    second = context.pack("s1", "and then", history).text
+
+    order = [second.index(block) for block in ["[EXECUTION_PLAN]", "[RISK_POLICY]", "[RECENT_CHAT]", "[MEMORY]", "[USER_REQUEST]"]]
+    assert order == sorted(order)
+    shared = first[: first.index("[RECENT_CHAT]")]
+    assert second.startswith(shared)
+
+
+def test_router_reuses_session_context_until_memory_changes(make_settings) -> None:
+    settings = make_settings(memory_on_chat=True, llm_cache_enabled=False)
+    memory = SwitchableMemory()
+    pool = ContextPool()
+    orchestrator, router = make_orchestrator(settings, memory, pool)
+
+    orchestrator.chat("s1", "first question")
+    orchestrator.chat("s1", "second question")
+    memory.facts = ["likes coffee"]
+    orchestrator.chat("s1", "third question")
+
+    first, second, third = pool.client.requests
+    assert "system" in first and "context" not in first
+    assert second["context"] == [1]
+    assert "system" not in second
+    assert second["prompt"].startswith("[USER_REQUEST]")
+    assert "second question" in second["prompt"] and "[RECENT_CHAT]" not in second["prompt"]
+    assert "context" not in third and "likes coffee" in third["prompt"]
+    stats = router.status()["session_context"]
+    assert stats["reused"] == 1
+    assert stats["invalidated"] == 1
+
+
+def test_session_context_resets_when_history_diverges(make_settings) -> None:
+    settings = make_settings(memory_on_chat=True, llm_cache_enabled=False)
+    pool = ContextPool()
+    orchestrator, _ = make_orchestrator(settings, SwitchableMemory(), pool)
+
+    orchestrator.chat("s1", "first question")
+    # Simulate a reply that came from somewhere else (cache hit, fallback provider).
+    orchestrator.sessions.forget("s1")
+    orchestrator.sessions.extend(
+        "s1",
+        [{"role": "user", "content": "first question"}, {"role": "assistant", "content": "reply from openai"}],
+    )
+    orchestrator.chat("s1", "second question")
+
+    assert "context" not in pool.client.requests[1]
+
+
+def test_session_context_disabled_uses_chat_api(make_settings) -> None:
+    settings = make_settings(memory_on_chat=True, llm_cache_enabled=False, ollama_context_reuse=False)
+    router = LLMRouter(settings, clients=ContextPool())
+    assert router.status()["session_context"] == {"enabled": False}
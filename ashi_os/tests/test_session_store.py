@@ -0,0 +1,90 @@
+from pathlib import Path
+import threading
+import time
+
+from ashi_os.brain.session_store import SessionStore
+
+
+def pair(i: int) -> list[dict[str, str]]:
+    return [{"role": "user", "content": f"question {i}"}, {"role": "assistant", "content": f"answer {i}"}]
+
+
+def test_session_store_hot_tier_stays_bounded_with_many_sessions() -> None:
+    store = SessionStore(max_sessions=1000)
+
+    for i in range(100_000):
+        store.extend(f"s{i}", pair(i))
+
+    stats = store.stats()
+    assert stats["hot_sessions"] == 1000
+    assert stats["evicted"] == 99_000
+    assert store.history("s99999")[1]["content"] == "answer 99999"
+
+
+def test_session_store_reloads_evicted_sessions_from_sqlite(tmp_path: Path) -> None:
+    store = SessionStore(tmp_path / "state.db", max_sessions=10)
+    for i in range(200):
+        store.extend(f"s{i}", pair(i))
+
+    assert store.stats()["hot_sessions"] == 10
+    assert store.history("s0") == pair(0)
+    assert store.stats()["loads"] == 1
+
+    restarted = SessionStore(tmp_path / "state.db", max_sessions=10)
+    assert restarted.history("s150") == pair(150)
+
+
+def test_session_store_caps_turns_and_keeps_fold_summary(tmp_path: Path) -> None:
+    store = SessionStore(tmp_path / "state.db", max_turns=4)
+    for i in range(3):
+        store.extend("s1", pair(i))
+    assert store.history("s1") == pair(1) + pair(2)
+
+    first_seq, _ = store.snapshot("s1")
+    assert store.fold("s1", first_seq + 2, "- asked two questions") == 2
+    store.extend("s1", pair(3))
+
+    restarted = SessionStore(tmp_path / "state.db", max_turns=4)
+    assert restarted.history("s1") == pair(2) + pair(3)
+    assert restarted.summary("s1") == "- asked two questions"
+
+
+def test_session_store_evicts_idle_sessions() -> None:
+    store = SessionStore(idle_ttl_sec=0.05)
+    store.extend("idle", pair(0))
+    time.sleep(0.1)
+    store.extend("active", pair(1))
+
+    assert store.stats()["idle_evicted"] == 1
+    assert store.history("idle") == []
+
+
+def test_session_store_sees_turns_written_by_another_worker(tmp_path: Path) -> None:
+    worker_a = SessionStore(tmp_path / "state.db")
+    worker_b = SessionStore(tmp_path / "state.db")
+
+    worker_a.extend("shared", pair(0))
+    assert worker_b.history("shared") == pair(0)
+    worker_b.extend("shared", pair(1))
+    assert worker_a.history("shared") == pair(0) + pair(1)
+
+
+def test_session_store_io_does_not_hold_other_sessions(tmp_path: Path) -> None:
+    store = SessionStore(tmp_path / "state.db")
+    store.extend("busy", pair(0))
+    done = threading.Event()
+
+    def _other() -> None:
+        store.extend("other", pair(1))
+        store.history("other")
+        done.set()
+
+    # A turn in flight on one session holds only that session's lock.
+    with store._session("busy").lock:
+        worker = threading.Thread(target=_other)
+        worker.start()
+        assert done.wait(timeout=5)
+    worker.join()
+    assert store._connect() is store._connect()
+    assert store.history("busy") == pair(0)
+    assert store.stats()["loads"] == 0
@@ -0,0 +1,99 @@
+import threading
+
+from ashi_os.brain.context_manager import ContextManager
+from ashi_os.brain.orchestrator import Orchestrator
+from ashi_os.brain.summarizer import SessionSummarizer
+from ashi_os.core.config import Settings
+from ashi_os.logging.audit_log import AuditLogger
+
+
+class StubMemory:
+    def add_memory(self, session_id: str, text: str, metadata: dict | None = None) -> str:
+        return "mem-1"
+
+    def search(self, session_id: str, query: str, top_k: int | None = None) -> list[dict]:
+        return []
+
+
+class SummaryRouter:
+    def __init__(self, provider: str = "stub") -> None:
+        self.provider = provider
+        self.prompts: list[str] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def generate(self, prompt: str, **kwargs) -> tuple[str, str, str]:
+        self.prompts.append(prompt)
+        if "[NEW_TURNS]" in prompt:
+            self.release.wait(5)
+            return ("- talked about tea", self.provider, "stub-model")
+        return ("ok", "stub", "stub-model")
+
+
+def make_orchestrator(settings: Settings, router: SummaryRouter) -> Orchestrator:
+    memory = StubMemory()
+    audit = AuditLogger(settings.log_dir)
+    summarizer = SessionSummarizer(router=router, audit=audit, keep_turns=2, trigger_turns=6, max_tokens=100)
+    return Orchestrator(
+        router=router,
+        context_manager=ContextManager(settings, memory),
+        memory=memory,
+        audit=audit,
+        memory_on_chat=False,
+        summarizer=summarizer,
+    )
+
+
+def test_summarizer_folds_old_turns_after_reply(make_settings) -> None:
+    router = SummaryRouter()
+    router.release.clear()
+    orchestrator = make_orchestrator(make_settings(), router)
+
+    for i in range(3):
+        orchestrator.chat("s-sum", f"message {i}")
+    # The reply came back while the summary is still being written.
+    assert len(orchestrator.session_history("s-sum")) == 6
+    router.release.set()
+    orchestrator.summarizer._pending["s-sum"].result(timeout=5)
+
+    assert orchestrator.sessions.summary("s-sum") == "- talked about tea"
+    assert [item["content"] for item in orchestrator.session_history("s-sum")] == ["message 2", "ok"]
+
+    orchestrator.chat("s-sum", "what did we talk about")
+    prompt = router.prompts[-1]
+    assert "[CONVERSATION_SUMMARY]\n- talked about tea" in prompt
+    assert "message 0" not in prompt and "user: message 2" in prompt
+    orchestrator.summarizer.close()
+
+
+def test_summarizer_fold_keeps_turns_appended_while_summarizing(make_settings) -> None:
+    router = SummaryRouter()
+    router.release.clear()
+    orchestrator = make_orchestrator(make_settings(), router)
+
+    for i in range(3):
+        orchestrator.chat("s-race", f"message {i}")
+    # This turn lands after the summarizer took its snapshot; the fold must not trim it.
+    orchestrator.chat("s-race", "message 3")
+    router.release.set()
+    orchestrator.summarizer._pending["s-race"].result(timeout=5)
+
+    contents = [item["content"] for item in orchestrator.session_history("s-race")]
+    assert contents == ["message 2", "ok", "message 3", "ok"]
+    orchestrator.summarizer.close()
+
+
+def test_summarizer_keeps_history_when_no_model_answers(make_settings) -> None:
+    router = SummaryRouter(provider="none")
+    orchestrator = make_orchestrator(make_settings(), router)
+
+    for i in range(3):
+        orchestrator.chat("s-down", f"message {i}")
+    future = orchestrator.summarizer._pending.get("s-down")
+    if future is not None:
+        future.result(timeout=5)
+
+    assert orchestrator.sessions.summary("s-down") == ""
+    assert len(orchestrator.session_history("s-down")) == 6
+    assert orchestrator.summarizer.stats()["failures"] == 1
+    orchestrator.summarizer.close()
@@ -0,0 +1,149 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from ashi_os.core.config import Settings
+from ashi_os.memory.memory_service import MemoryService
+
+
+class RecordingCollection:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self.docs: dict[str, tuple[str, dict]] = {}
+        self.lock = threading.Lock()
+
+    def add(self, ids: list[str], documents: list[str], metadatas: list[dict]) -> None:
+        with self.lock:
+            self.calls.append(list(documents))
+            for doc_id, text, metadata in zip(ids, documents, metadatas):
+                self.docs[doc_id] = (text, metadata)
+
+    def query(self, query_texts: list[str], n_results: int) -> dict:
+        with self.lock:
+            items = list(self.docs.items())[:n_results]
+        return {
+            "ids": [[doc_id for doc_id, _ in items]],
+            "documents": [[text for _, (text, _) in items]],
+            "metadatas": [[metadata for _, (_, metadata) in items]],
+        }
+
+
+def make_memory(settings: Settings) -> tuple[MemoryService, RecordingCollection]:
+    memory = MemoryService(settings)
+    collection = RecordingCollection()
+    memory.store._collection = collection
+    memory.store._ready = True
+    return memory, collection
+
+
+def test_adds_are_grouped_by_size_and_flushed_before_search(make_settings) -> None:
+    memory, collection = make_memory(make_settings(memory_batch_size=4, memory_flush_interval_sec=30.0))
+    for i in range(5):
+        memory.add_memory("s1", f"fact {i}")
+    assert collection.calls == [["fact 0", "fact 1", "fact 2", "fact 3"]]
+    assert memory.stats()["buffered"] == 1
+
+    hits = memory.search("s1", "fact", 10)
+    assert collection.calls[-1] == ["fact 4"]
+    assert len(hits) == 5
+    memory.close()
+
+
+def test_buffer_flushes_after_interval_and_on_close(make_settings) -> None:
+    memory, collection = make_memory(make_settings(memory_batch_size=100, memory_flush_interval_sec=0.05))
+    memory.add_memory("s1", "timed")
+    deadline = time.monotonic() + 2
+    while not collection.calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert collection.calls == [["timed"]]
+
+    slow, slow_collection = make_memory(make_settings(memory_batch_size=100, memory_flush_interval_sec=30))
+    slow.add_memory("s1", "on shutdown")
+    slow.close()
+    assert slow_collection.calls == [["on shutdown"]]
+
+
+def test_add_many_writes_one_batch(make_settings) -> None:
+    memory, collection = make_memory(make_settings(memory_batch_size=2, memory_flush_interval_sec=30.0))
+    ids = memory.add_many(
+        [
+            {"session_id": "s1", "text": "a", "metadata": {"tag": "x"}},
+            {"session_id": "s2", "text": "b", "id": "fixed-id"},
+            {"session_id": "s1", "text": "c"},
+        ]
+    )
+    assert ids[1] == "fixed-id" and len(set(ids)) == 3
+    assert collection.calls == [["a", "b", "c"]]
+    assert collection.docs[ids[0]][1]["tag"] == "x"
+    assert collection.docs["fixed-id"][1]["session_id"] == "s2"
+
+
+def test_memory_add_batch_route(make_settings, monkeypatch) -> None:
+    from ashi_os.api import app as app_module
+
+    monkeypatch.setattr(app_module, "get_settings", lambda: make_settings(memory_batch_size=4, memory_flush_interval_sec=30.0))
+    app = app_module.create_app()
+    memory, collection = make_memory(make_settings(memory_batch_size=4, memory_flush_interval_sec=30.0))
+    app.state.memory = memory
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/memory/add-batch",
+            json={"items": [{"session_id": "s1", "text": "one"}, {"session_id": "s1", "text": "two"}]},
+        )
+        assert response.status_code == 200
+        ids = response.json()["ids"]
+        assert len(ids) == 2
+        assert client.post("/memory/add-batch", json={"items": []}).status_code == 422
+        assert client.get("/status").json()["memory"]["buffered"] == 2
+    assert collection.calls == [["one", "two"]]
+
+
+class FlakyCollection(RecordingCollection):
+    # Rejects any batch containing a "poison" document, as Chroma does for invalid input.
+    def add(self, ids: list[str], documents: list[str], metadatas: list[dict]) -> None:
+        if any("poison" in text for text in documents):
+            raise ValueError("rejected document")
+        super().add(ids, documents, metadatas)
+
+
+def test_nested_metadata_is_sanitized_before_buffering(make_settings) -> None:
+    from chromadb.api.types import validate_metadata
+
+    memory, collection = make_memory(make_settings(memory_batch_size=2, memory_flush_interval_sec=30.0))
+    ids = memory.add_many(
+        [
+            {"session_id": "s1", "text": "good", "metadata": {"tag": "x"}},
+            {"session_id": "s2", "text": "nested", "metadata": {"source": {"kind": "web"}, "tags": ["a"], "none": None}},
+        ]
+    )
+    assert collection.calls == [["good", "nested"]]
+    stored = collection.docs[ids[1]][1]
+    assert stored["source"] == '{"kind": "web"}' and stored["tags"] == '["a"]' and "none" not in stored
+    validate_metadata(stored)
+
+
+def test_failed_batch_keeps_good_documents_and_surfaces_bad_ones(make_settings) -> None:
+    memory = MemoryService(make_settings(memory_batch_size=3, memory_flush_interval_sec=30.0))
+    collection = FlakyCollection()
+    memory.store._collection = collection
+    memory.store._ready = True
+
+    memory.add_many(
+        [
+            {"session_id": "s1", "text": "first"},
+            {"session_id": "s1", "text": "poison"},
+            {"session_id": "s2", "text": "other session"},
+        ]
+    )
+    assert sorted(text for text, _ in collection.docs.values()) == ["first", "other session"]
+    stats = memory.stats()
+    assert stats["buffered"] == 1 and stats["retried"] == 1 and stats["failed"] == 0
+
+    for _ in range(2):
+        memory.flush()
+    stats = memory.stats()
+    assert stats["buffered"] == 0 and stats["failed"] == 1
+    assert stats["last_error"] == "rejected document"
+    memory.close()
@@ -0,0 +1,134 @@
+import json
+from pathlib import Path
+import threading
+import time
+
+from ashi_os.brain.context_manager import ContextManager
+from ashi_os.brain.orchestrator import Orchestrator
+from ashi_os.core import write_behind
+from ashi_os.core.write_behind import WriteBehindQueue
+from ashi_os.logging.audit_log import AuditLogger
+
+
+class SlowMemory:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.gate = threading.Event()
+        self.gate.set()
+        self.added: list[tuple[str, str]] = []
+
+    def add_memory(self, session_id: str, text: str, metadata: dict | None = None, memory_id: str | None = None) -> str:
+        self.gate.wait(5)
+        time.sleep(self.delay)
+        self.added.append((memory_id, text))
+        return memory_id
+
+    def add_many(self, items: list[dict]) -> list[str]:
+        self.gate.wait(5)
+        time.sleep(self.delay)
+        self.added.extend((item["id"], item["text"]) for item in items)
+        return [item["id"] for item in items]
+
+    def search(self, session_id: str, query: str, top_k: int | None = None) -> list[dict]:
+        return []
+
+
+class StubRouter:
+    def generate(self, prompt: str, **kwargs) -> tuple[str, str, str]:
+        return ("reply", "stub", "stub-model")
+
+
+def read_audit(audit: AuditLogger) -> list[dict]:
+    return [json.loads(line) for line in audit.path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_write_behind_batches_in_order_and_flushes_on_close(tmp_path: Path) -> None:
+    audit = AuditLogger(tmp_path / "logs")
+    memory = SlowMemory()
+    memory.gate.clear()
+    queue = WriteBehindQueue(audit=audit, memory=memory, max_batch=64)
+
+    memory_id = queue.add_memory("s1", "likes tea")
+    for i in range(5):
+        queue.write("test.event", {"i": i})
+    assert queue.stats()["depth"] == 6
+    assert not audit.path.exists()
+
+    memory.gate.set()
+    assert queue.close(timeout=5) is True
+
+    events = read_audit(audit)
+    assert [event["payload"]["i"] for event in events] == ["0", "1", "2", "3", "4"]
+    assert memory.added == [(memory_id, "likes tea")]
+    stats = queue.stats()
+    assert stats["depth"] == 0 and stats["processed"] == 6 and stats["failed"] == 0
+
+
+def test_write_behind_writes_inline_when_full(tmp_path: Path) -> None:
+    audit = AuditLogger(tmp_path / "logs")
+    memory = SlowMemory()
+    memory.gate.clear()
+    queue = WriteBehindQueue(audit=audit, memory=memory, max_pending=1)
+
+    queue.add_memory("s1", "first")
+    time.sleep(0.05)
+    queue.add_memory("s1", "second")
+    queue.write("overflow.event", {"n": 1})
+
+    assert queue.stats()["inline"] == 1
+    assert read_audit(audit)[0]["event"] == "overflow.event"
+    memory.gate.set()
+    queue.close(timeout=5)
+    assert [text for _, text in memory.added] == ["first", "second"]
+
+
+def test_chat_reply_does_not_wait_for_persistence(make_settings) -> None:
+    settings = make_settings(memory_on_chat=True)
+    memory = SlowMemory(delay=0.3)
+    audit = AuditLogger(settings.log_dir)
+    queue = WriteBehindQueue(audit=audit, memory=memory)
+    orchestrator = Orchestrator(
+        router=StubRouter(),
+        context_manager=ContextManager(settings, memory),
+        memory=queue,
+        audit=queue,
+        memory_on_chat=True,
+    )
+
+    started = time.perf_counter()
+    result = orchestrator.chat("s-fast", "remember that I like green tea")
+    elapsed = time.perf_counter() - started
+
+    assert result["reply"] == "reply"
+    assert elapsed < 0.2
+    assert queue.flush(timeout=5) is True
+    assert [text for _, text in memory.added] == ["remember that I like green tea"]
+    assert read_audit(audit)[-1]["event"] == "chat.completed"
+    orchestrator.close()
+    queue.close()
+
+
+class FlakyAudit(AuditLogger):
+    # Rejects any append that contains a "bad" event, so the batched write always fails.
+    def write_many(self, events, timestamps=None) -> None:
+        if any(event == "bad" for event, _ in events):
+            raise OSError("disk said no")
+        super().write_many(events, timestamps)
+
+
+def test_write_behind_keeps_good_audit_events_when_batch_fails(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(write_behind, "RETRY_BACKOFF_SEC", 0.0)
+    audit = FlakyAudit(tmp_path / "logs")
+    memory = SlowMemory()
+    memory.gate.clear()
+    queue = WriteBehindQueue(audit=audit, memory=memory)
+
+    queue.add_memory("s1", "hold the worker")
+    for event in ["first", "bad", "last"]:
+        queue.write(event, {"n": 1})
+    memory.gate.set()
+    assert queue.close(timeout=5) is True
+
+    assert [item["event"] for item in read_audit(audit)] == ["first", "last"]
+    stats = queue.stats()
+    assert stats["failed"] == 1 and stats["retried"] == 3 and stats["processed"] == 3
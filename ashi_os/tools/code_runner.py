@@ -2,6 +2,8 @@ from pathlib import Path
 import shlex
 import subprocess
 
+from ashi_os.core.policy import BLOCKED_TOKENS, PolicyEngine, default_policy
+
 
 class CodeRunnerModule:
     ALLOWED_PREFIXES = {
@@ -16,10 +18,11 @@ class CodeRunnerModule:
         "echo",
     }
 
-    BLOCKED_TOKENS = {"rm", "shutdown", "reboot", "mkfs", "dd", "sudo"}
+    BLOCKED_TOKENS = BLOCKED_TOKENS
 
-    def __init__(self, workspace_root: Path) -> None:
+    def __init__(self, workspace_root: Path, policy: PolicyEngine | None = None) -> None:
         self.workspace_root = workspace_root
+        self.policy = policy or default_policy()
 
     def run(self, command: str, timeout_sec: int = 30) -> dict:
         command = command.strip()
@@ -30,7 +33,7 @@ class CodeRunnerModule:
         if not parts:
             return {"ok": False, "message": "Invalid command."}
 
-        if any(token in self.BLOCKED_TOKENS for token in parts):
+        if self.policy.scan_tokens(parts):
             return {"ok": False, "message": "Command blocked by safety policy."}
 
         if parts[0] not in self.ALLOWED_PREFIXES:
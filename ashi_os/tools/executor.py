@@ -1,8 +1,12 @@
 from datetime import UTC, datetime
 from pathlib import Path
+import time
 
+from ashi_os.core.policy import PolicyEngine, default_policy
 from ashi_os.core.security import is_destructive_command
+from ashi_os.core.write_behind import WriteBehindQueue
 from ashi_os.logging.audit_log import AuditLogger
+from ashi_os.logging.metrics import SCHEDULER_JOBS, SCHEDULER_RUNS, TOOL_EXECUTIONS, TOOL_LATENCY
 from ashi_os.tools.browser import BrowserModule
 from ashi_os.tools.code_runner import CodeRunnerModule
 from ashi_os.tools.email_module import EmailModule
@@ -12,13 +16,20 @@ from ashi_os.tools.system_control import SystemControlModule
 
 
 class ToolExecutor:
-    def __init__(self, workspace_root: Path, sqlite_path: Path, audit: AuditLogger) -> None:
+    def __init__(
+        self,
+        workspace_root: Path,
+        sqlite_path: Path,
+        audit: AuditLogger | WriteBehindQueue,
+        policy: PolicyEngine | None = None,
+    ) -> None:
         self.workspace_root = workspace_root
         self.audit = audit
+        self.policy = policy or default_policy()
         self.files = FileSystemModule(workspace_root)
         self.system = SystemControlModule()
         self.browser = BrowserModule()
-        self.code = CodeRunnerModule(workspace_root)
+        self.code = CodeRunnerModule(workspace_root, self.policy)
         self.email = EmailModule(workspace_root / "data" / "email_queue.json")
         self.scheduler = SchedulerStore(sqlite_path)
 
@@ -37,15 +48,17 @@ class ToolExecutor:
             return {"ok": False, "message": "Deletion requires confirm=true.", "risk": "elevated"}
         if tool == "code" and action == "run":
             command = str(params.get("command", ""))
-            if is_destructive_command(command) and not confirm:
+            if is_destructive_command(command, self.policy) and not confirm:
                 return {"ok": False, "message": "Risk level elevated. Confirmation required.", "risk": "elevated"}
 
+        started = time.perf_counter()
         try:
             result = self._execute_inner(session_id=session_id, tool=tool, action=action, params=params, confirm=confirm)
         except PermissionError as exc:
             result = {"ok": False, "message": str(exc)}
         except Exception as exc:  # pragma: no cover
             result = {"ok": False, "message": f"Unhandled tool failure: {exc}"}
+        self._observe(tool, action, bool(result.get("ok")), time.perf_counter() - started)
 
         self.audit.write(
             "tool.executed",
@@ -60,6 +73,10 @@ class ToolExecutor:
         return result
 
     def run_due_jobs(self) -> dict:
+        with SCHEDULER_RUNS.time():
+            return self._run_due_jobs()
+
+    def _run_due_jobs(self) -> dict:
         jobs = self.scheduler.due_jobs()
         ran = []
         failed = []
@@ -75,13 +92,23 @@ class ToolExecutor:
             )
             if result.get("ok"):
                 self.scheduler.mark_job(job["id"], "done")
+                SCHEDULER_JOBS.inc(outcome="done")
                 ran.append({"id": job["id"], "result": result})
             else:
                 self.scheduler.mark_job(job["id"], "failed")
+                SCHEDULER_JOBS.inc(outcome="failed")
                 failed.append({"id": job["id"], "result": result})
 
         return {"ok": True, "processed": len(jobs), "ran": ran, "failed": failed}
 
+    def _observe(self, tool: str, action: str, ok: bool, elapsed: float) -> None:
+        # Tool and action come from callers; anything outside the catalog shares one
+        # label so a bad client cannot blow up metric cardinality.
+        if action not in self.catalog().get(tool, []):
+            tool, action = "unknown", "unknown"
+        TOOL_EXECUTIONS.inc(tool=tool, action=action, outcome="success" if ok else "failure")
+        TOOL_LATENCY.observe(elapsed, tool=tool, action=action)
+
     def _execute_inner(self, session_id: str, tool: str, action: str, params: dict, confirm: bool) -> dict:
         if tool == "system":
             if action == "open_app":
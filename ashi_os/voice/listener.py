@@ -1,5 +1,6 @@
 from pathlib import Path
 
+from ashi_os.logging.metrics import VOICE_STAGE_LATENCY
 from ashi_os.voice.stt import SpeechToTextService
 from ashi_os.voice.tts import TextToSpeechService
 from ashi_os.voice.wake_word import detect_wake_phrase
@@ -19,7 +20,8 @@ class VoiceCommandPipeline:
         self.default_voice = default_voice
 
     def run_file(self, session_id: str, file_path: Path, orchestrator, speak_reply: bool) -> dict:
-        ok, transcript = self.stt.transcribe_file(file_path)
+        with VOICE_STAGE_LATENCY.time(stage="stt"):
+            ok, transcript = self.stt.transcribe_file(file_path)
         if not ok:
             return {
                 "ok": False,
@@ -29,7 +31,8 @@ class VoiceCommandPipeline:
                 "reply": transcript,
             }
 
-        wake, command = detect_wake_phrase(transcript, self.wake_phrase)
+        with VOICE_STAGE_LATENCY.time(stage="wake_word"):
+            wake, command = detect_wake_phrase(transcript, self.wake_phrase)
         if not wake:
             return {
                 "ok": False,
@@ -48,9 +51,12 @@ class VoiceCommandPipeline:
                 "reply": "Wake phrase heard. Waiting for command.",
             }
 
-        reply, provider, model = orchestrator.chat(session_id=session_id, user_message=command)
+        with VOICE_STAGE_LATENCY.time(stage="chat"):
+            result = orchestrator.chat(session_id=session_id, user_message=command, hedge=True)
+        reply = result["reply"]
         if speak_reply:
-            self.tts.speak(reply, self.default_voice)
+            with VOICE_STAGE_LATENCY.time(stage="tts"):
+                self.tts.speak(reply, self.default_voice)
 
         return {
             "ok": True,
@@ -58,6 +64,6 @@ class VoiceCommandPipeline:
             "transcript": transcript,
             "command": command,
             "reply": reply,
-            "provider": provider,
-            "model": model,
+            "provider": result["provider"],
+            "model": result["model"],
         }
@@ -1,9 +1,12 @@
 from pathlib import Path
 
+from ashi_os.brain.llm_clients import LLMClientPool
+
 
 class SpeechToTextService:
-    def __init__(self, openai_api_key: str) -> None:
+    def __init__(self, openai_api_key: str, clients: LLMClientPool | None = None) -> None:
         self.openai_api_key = openai_api_key
+        self.clients = clients
 
     def transcribe_file(self, file_path: Path) -> tuple[bool, str]:
         if not file_path.exists() or not file_path.is_file():
@@ -12,9 +15,12 @@ class SpeechToTextService:
             return False, "OPENAI_API_KEY missing for speech-to-text."
 
         try:
-            from openai import OpenAI
+            if self.clients is not None:
+                client = self.clients.openai()
+            else:
+                from openai import OpenAI
 
-            client = OpenAI(api_key=self.openai_api_key)
+                client = OpenAI(api_key=self.openai_api_key)
             with file_path.open("rb") as audio_file:
                 result = client.audio.transcriptions.create(
                     model="gpt-4o-mini-transcribe",